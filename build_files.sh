@@ -7,14 +7,19 @@ echo "🎮 Construyendo DaveGames para Vercel..."
 echo "📦 Instalando dependencias..."
 pip install -r requirements.txt
 
-# Recopilar archivos estáticos
+# Recopilar archivos estáticos: incremental por contenido, compresión en
+# paralelo y escritura directa en el directorio que publica Vercel
 echo "📁 Recopilando archivos estáticos..."
-python manage.py collectstatic --noinput --clear
+STATIC_ROOT=staticfiles_build python manage.py build_static --noinput
 
-# Crear directorio para archivos estáticos
-mkdir -p staticfiles_build
+# Precompilar bytecode: el cold start no compila .py a .pyc
+echo "⚡ Precompilando bytecode..."
+python -m compileall -q -j 0 davegames_project games
 
-# Copiar archivos estáticos
-cp -r staticfiles/* staticfiles_build/
+# Calentar la cache compartida (solo con CACHE_BACKEND compartido y acceso a la BD)
+if [ -n "$WARMUP_ON_BUILD" ]; then
+    echo "🔥 Calentando caches..."
+    python manage.py warm_cache
+fi
 
 echo "✅ Construcción completada!"
\ No newline at end of file
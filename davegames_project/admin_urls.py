@@ -0,0 +1,19 @@
+"""
+URLconf del admin cargado bajo demanda
+urls.py lo referencia por nombre, así que django.contrib.admin y los
+admin.py de las apps solo se importan con la primera petición a /admin/
+(o al primer reverse de una URL admin:). Con FAST_START el admin usa
+SimpleAdminConfig y el autodiscover ocurre aquí.
+"""
+
+from django.contrib import admin
+
+admin.autodiscover()
+
+#panel Admin
+
+admin.site.site_header = "DaveGames Admin"
+admin.site.site_title = "DaveGames Admin Portal"
+admin.site.index_title = "Welcome to the DaveGames Admin Portal"
+
+urlpatterns, app_name, _namespace = admin.site.urls
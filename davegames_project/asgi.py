@@ -13,4 +13,11 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'davegames_project.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from games.hints import EarlyHintsMiddleware  # noqa: E402  (requiere apps cargadas)
+from games.warmup import warm_up_on_boot  # noqa: E402
+
+application = EarlyHintsMiddleware(django_application)
+
+warm_up_on_boot()
@@ -1,218 +1,16 @@
 """
 Django settings for davegames_project project.
 
-Generated by 'django-admin startproject' using Django 4.2.23.
+Los valores se resuelven en davegames_project/settings_loader.py (base, SSL
+según DEBUG, perfil del proveedor de DEPLOY_PROVIDER y variables de entorno).
+Para ver la diferencia efectiva por proveedor:
+
+    python manage.py settings_diff
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/topics/settings/
-
-For the full list of settings and their values, see
-https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
-from pathlib import Path
-import os
-from decouple import config
-
-# Importar dj_database_url solo si está disponible
-try:
-    import dj_database_url
-except ImportError:
-    dj_database_url = None
-
-# Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-# Importar configuraciones SSL
-try:
-    from ssl_settings import get_ssl_settings
-except ImportError:
-    get_ssl_settings = None
-
-
-# Quick-start development settings - unsuitable for production
-# See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
-
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = config(
-    "SECRET_KEY",
-    default="django-insecure-0a_3q1v324_w-_&=3e)*(+naru#+uk+1w9t++=6$m*+_k17fzi",
-)
-
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = config("DEBUG", default=True, cast=bool)
-
-# Hosts permitidos
-ALLOWED_HOSTS = config(
-    "ALLOWED_HOSTS",
-    default="localhost,127.0.0.1",
-    cast=lambda v: [s.strip() for s in v.split(",")],
-)
-
-
-# Application definition
-
-INSTALLED_APPS = [
-    "django.contrib.admin",
-    "django.contrib.auth",
-    "django.contrib.contenttypes",
-    "django.contrib.sessions",
-    "django.contrib.messages",
-    "django.contrib.staticfiles",
-    "games",
-]
-
-MIDDLEWARE = [
-    "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",  # Para servir archivos estáticos
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
-]
-
-ROOT_URLCONF = "davegames_project.urls"
-
-TEMPLATES = [
-    {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
-        "APP_DIRS": True,
-        "OPTIONS": {
-            "context_processors": [
-                "django.template.context_processors.debug",
-                "django.template.context_processors.request",
-                "django.contrib.auth.context_processors.auth",
-                "django.contrib.messages.context_processors.messages",
-            ],
-        },
-    },
-]
-
-WSGI_APPLICATION = "davegames_project.wsgi.application"
-
-
-# Database
-# https://docs.djangoproject.com/en/4.2/ref/settings/#databases
-
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.sqlite3',
-#         'NAME': BASE_DIR / 'db.sqlite3',
-#     }
-# }
-
-# Database configuration
-DATABASE_URL = config("DATABASE_URL", default=None)
-
-if DATABASE_URL and dj_database_url:
-    # Usar base de datos de producción (Vercel, Heroku, etc.)
-    DATABASES = {"default": dj_database_url.parse(DATABASE_URL)}
-else:
-    # Base de datos local
-    DATABASES = {
-        "default": {
-            "ENGINE": "django.db.backends.postgresql",
-            "NAME": config("DB_NAME", default="davegames_db"),
-            "USER": config("DB_USER", default="postgres"),
-            "PASSWORD": config("DB_PASSWORD", default="sa654321"),
-            "HOST": config("DB_HOST", default="localhost"),
-            "PORT": config("DB_PORT", default="5432"),
-        }
-    }
-
-
-# Password validation
-# https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
-
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
-    },
-    {
-        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
-    },
-    {
-        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
-    },
-    {
-        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
-    },
-]
-
-
-# Internationalization
-# https://docs.djangoproject.com/en/4.2/topics/i18n/
-
-LANGUAGE_CODE = "en-us"
-
-TIME_ZONE = "UTC"
-
-USE_I18N = True
-
-USE_TZ = True
-
-
-# Static files (CSS, JavaScript, Images)
-# https://docs.djangoproject.com/en/4.2/howto/static-files/
-
-STATIC_URL = "/static/"
-STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
-
-# Media files
-MEDIA_URL = "/media/"
-MEDIA_ROOT = os.path.join(BASE_DIR, "media")
-
-# WhiteNoise configuration para servir archivos estáticos
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
-
-# Default primary key field type
-# https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
-
-DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
-
-# ============================================================================
-# CONFIGURACIÓN SSL/HTTPS
-# ============================================================================
-
-# Aplicar configuraciones SSL según el entorno
-if get_ssl_settings:
-    ssl_config = get_ssl_settings(debug=DEBUG)
-    for key, value in ssl_config.items():
-        globals()[key] = value
-
-# Configuración adicional para producción
-if not DEBUG:
-    # Hosts permitidos (actualizar con tu dominio)
-    ALLOWED_HOSTS = [
-        "localhost",
-        "127.0.0.1",
-        "tu-dominio.com",
-        "www.tu-dominio.com",
-        # Agregar más dominios según sea necesario
-    ]
-
-    # Configuración de archivos estáticos para producción
-    STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
+from davegames_project.settings_loader import load
 
-    # Logging para producción
-    LOGGING = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "handlers": {
-            "file": {
-                "level": "INFO",
-                "class": "logging.FileHandler",
-                "filename": os.path.join(BASE_DIR, "django.log"),
-            },
-        },
-        "loggers": {
-            "django": {
-                "handlers": ["file"],
-                "level": "INFO",
-                "propagate": True,
-            },
-        },
-    }
+globals().update(load())
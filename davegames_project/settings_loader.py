@@ -0,0 +1,729 @@
+"""
+Resolución única de settings por capas
+Sustituye a los módulos de settings duplicados (settings.py, vercel_settings.py,
+ssl_settings.py y deployment_configs.py; vercel_settings.py queda como shim
+obsoleto). Las capas se aplican en orden:
+
+1. BASE: valores por defecto del proyecto.
+2. SSL de desarrollo o de producción según DEBUG (y PRODUCTION si DEBUG=False).
+3. Perfil del proveedor (PROFILES): solo lo que cambia en esa plataforma.
+4. Variables de entorno (o .env) declaradas en ENV, validadas y tipadas.
+5. Derivados: DATABASES, CACHES, LOGGING y ajustes de FAST_START.
+
+resolve() se cachea por (proveedor, entorno) y devuelve un mapeo congelado;
+load() lo descongela para el módulo de settings que Django importa. El
+proveedor sale de DEPLOY_PROVIDER (por defecto "development"; "auto" lo
+detecta por variables de la plataforma). El comando settings_diff muestra la
+diferencia efectiva de cada proveedor.
+"""
+
+import functools
+import os
+import tempfile
+from pathlib import Path
+from types import MappingProxyType
+
+from django.core.exceptions import ImproperlyConfigured
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+INSECURE_SECRET_KEY = "django-insecure-0a_3q1v324_w-_&=3e)*(+naru#+uk+1w9t++=6$m*+_k17fzi"
+
+WHITENOISE_MIDDLEWARE = "whitenoise.middleware.WhiteNoiseMiddleware"
+
+# Claves de entrada que alimentan los derivados y no llegan a Django
+INPUT_ONLY = {
+    "DATABASE_URL", "DATABASE_REPLICA_URLS", "DB_NAME", "DB_USER", "DB_PASSWORD", "DB_HOST", "DB_PORT",
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "CLOUD_SQL_CONNECTION_NAME",
+    "CACHE_BACKEND", "CACHE_LOCATION", "RATELIMIT_CACHE_BACKEND", "RATELIMIT_CACHE_LOCATION",
+    "DJANGO_LOG_LEVEL", "LOG_TO_CONSOLE", "MIDDLEWARE_ADDITIONS",
+}
+
+# Claves cuyo valor no se imprime (settings_diff)
+SECRET_KEYS = {"SECRET_KEY", "DB_PASSWORD", "POSTGRES_PASSWORD", "AWS_SECRET_ACCESS_KEY", "METRICS_TOKEN", "CLOUDFLARE_API_TOKEN"}
+
+
+# ============================================================================
+# CAPA 1: VALORES BASE
+# ============================================================================
+
+BASE = {
+    "BASE_DIR": BASE_DIR,
+    "SECRET_KEY": INSECURE_SECRET_KEY,
+    "DEBUG": True,
+    "ALLOWED_HOSTS": ["localhost", "127.0.0.1"],
+    # Arranque rápido (serverless): admin sin autodiscover al inicio y sin
+    # WhiteNoise, porque la plataforma sirve /static/ (ver vercel.json)
+    "FAST_START": False,
+    "INSTALLED_APPS": [
+        "django.contrib.admin",
+        "django.contrib.auth",
+        "django.contrib.contenttypes",
+        "django.contrib.sessions",
+        "django.contrib.messages",
+        "django.contrib.staticfiles",
+        "games",
+    ],
+    "MIDDLEWARE": [
+        "games.instrumentation.ServerTimingMiddleware",  # Primero: mide todo lo demás
+        "django.middleware.security.SecurityMiddleware",
+        "games.lean.PublicCacheMiddleware",  # Cache-Control: public en el catálogo
+        "games.edge.SurrogateKeyMiddleware",  # Cache-Tag/Surrogate-Key para purgar el CDN
+        WHITENOISE_MIDDLEWARE,  # Para servir archivos estáticos
+        # games.lean: los de Django, sin trabajo ni cookies en las páginas públicas
+        "games.lean.SessionMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "games.routers.ReplicaRoutingMiddleware",  # lecturas de games.views a réplicas
+        "games.lean.CsrfViewMiddleware",
+        "games.lean.AuthenticationMiddleware",
+        "games.profiling.ProfilingMiddleware",  # ?_profile=1 (staff) o X-Profile firmado
+        "games.lean.MessageMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+        "games.hints.PreloadHintsMiddleware",  # Link: preload/preconnect
+    ],
+    "ROOT_URLCONF": "davegames_project.urls",
+    # Páginas del catálogo sin sesión ni cookies en GET (games.lean); segundos de
+    # Cache-Control: public para navegadores y CDN (0 = sin cabecera)
+    "LEAN_PUBLIC_PAGES": True,
+    "PUBLIC_CACHE_MAX_AGE": 60,
+    # CDN delante (games.edge): "cloudflare" o "fake" (en memoria, tests); vacío = sin
+    # etiquetas ni purgas. Con purga selectiva el CDN puede guardar las páginas horas
+    "EDGE_CDN": "",
+    "EDGE_CACHE_MAX_AGE": 21600,  # CDN-Cache-Control: max-age
+    "EDGE_PURGE_DELAY": 1.0,  # segundos agrupando purgas antes de llamar al CDN
+    "CLOUDFLARE_ZONE_ID": "",
+    "CLOUDFLARE_API_TOKEN": "",  # permiso Zone > Cache Purge
+    "TEMPLATES": [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "DIRS": [],
+            "APP_DIRS": True,
+            "OPTIONS": {
+                "context_processors": [
+                    "django.template.context_processors.debug",
+                    "django.template.context_processors.request",
+                    "django.contrib.auth.context_processors.auth",
+                    "django.contrib.messages.context_processors.messages",
+                ],
+            },
+        },
+    ],
+    "WSGI_APPLICATION": "davegames_project.wsgi.application",
+    # Base de datos: DATABASE_URL (Vercel, Heroku...) o PostgreSQL local
+    "DATABASE_URL": None,
+    # Réplicas de lectura (games.routers): URLs separadas por comas, alias replica_1, replica_2...
+    "DATABASE_REPLICA_URLS": [],
+    "DATABASE_ROUTERS": ["games.routers.ReplicaRouter"],
+    "REPLICA_MAX_LAG": 5.0,  # segundos de retraso tolerados antes de leer del primario
+    "REPLICA_CHECK_INTERVAL": 5.0,  # segundos entre comprobaciones de retraso por réplica
+    "REPLICA_PIN_SECONDS": 0,  # lecturas del primario tras escribir (0 = resto de la sesión del navegador)
+    "DB_NAME": "davegames_db",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "sa654321",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "POSTGRES_DB": None,
+    "POSTGRES_USER": None,
+    "POSTGRES_PASSWORD": None,
+    "CLOUD_SQL_CONNECTION_NAME": None,
+    "AUTH_PASSWORD_VALIDATORS": [
+        {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
+        {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
+        {"NAME": "django.contrib.auth.password_validation.CommonPasswordValidator"},
+        {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
+    ],
+    "LANGUAGE_CODE": "en-us",
+    "TIME_ZONE": "UTC",
+    "USE_I18N": True,
+    "USE_TZ": True,
+    "STATIC_URL": "/static/",
+    # build_files.sh lo apunta a staticfiles_build (escritura directa, sin copia)
+    "STATIC_ROOT": os.path.join(BASE_DIR, "staticfiles"),
+    # Procesos para comprimir en build_static (0 = uno por núcleo)
+    "STATIC_BUILD_WORKERS": 0,
+    # WhiteNoise, con compresión incremental y en paralelo
+    "STATICFILES_STORAGE": "games.staticbuild.ParallelCompressedManifestStorage",
+    "MEDIA_URL": "/media/",
+    "MEDIA_ROOT": os.path.join(BASE_DIR, "media"),
+    # Cache de media sin hash de contenido (segundos)
+    "MEDIA_CACHE_MAX_AGE": 3600,
+    # Prefijo interno de Nginx para X-Accel-Redirect (vacío = servir desde Django)
+    # Ejemplo: MEDIA_ACCEL_REDIRECT=/protected-media/
+    "MEDIA_ACCEL_REDIRECT": "",
+    # 103 Early Hints bajo ASGI (solo si el servidor soporta la extensión)
+    "EARLY_HINTS": True,
+    # Cabecera Server-Timing (db, tpl, mw, view, total) en cada respuesta
+    "SERVER_TIMING_HEADER": True,
+    # Métricas /metrics: un archivo por proceso en METRICS_DIR (multiproceso)
+    "METRICS_DIR": os.path.join(tempfile.gettempdir(), "davegames-metrics"),
+    # Si se define, /metrics exige "Authorization: Bearer <token>"
+    "METRICS_TOKEN": "",
+    # Perfilado por petición: pilas colapsadas en PROFILES_DIR
+    "PROFILES_DIR": os.path.join(BASE_DIR, "profiles"),
+    "PROFILE_INTERVAL": 0.001,  # segundos entre muestras
+    "PROFILE_KEEP": 50,  # perfiles que se conservan
+    "PROFILE_TOKEN_MAX_AGE": 3600,  # validez de X-Profile
+    # Cache (locmem por proceso; para compartirla entre workers usar, por ejemplo,
+    # CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache y CACHE_LOCATION=/var/tmp/davegames)
+    "CACHE_BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "CACHE_LOCATION": "davegames",
+    # Segundos de cache de páginas públicas y fragmentos (0 = sin cache de páginas)
+    "PAGE_CACHE_TIMEOUT": 300,
+    # Stale-while-revalidate (games.cache.cached_page): segundos que una página caducada
+    # se sigue sirviendo mientras una sola petición la regenera, peso de la expiración
+    # anticipada XFetch (0 = sin anticipar) y validez máxima del cerrojo de regeneración
+    "PAGE_CACHE_STALE": 300,
+    "PAGE_CACHE_BETA": 1.0,
+    "PAGE_CACHE_LOCK_TIMEOUT": 10,
+    # Warm-up de caches al arrancar el worker (games.warmup)
+    "WARMUP_ON_BOOT": False,
+    "WARMUP_BUDGET": 2.0,  # segundos máximos
+    "WARMUP_TOP": 20,  # páginas a pre-renderizar
+    "WARMUP_SNAPSHOT": os.path.join(BASE_DIR, "warmup.json"),
+    # Registro de consultas lentas (0 = desactivado) y frecuencia de EXPLAIN por huella
+    "SLOW_QUERY_MS": 100.0,
+    "SLOW_QUERY_EXPLAIN_INTERVAL": 3600,
+    # Contraseñas de comentarios (games.credentials; medir con bench_hashing)
+    "COMMENT_PASSWORD_HASHER": "scrypt",  # scrypt, pbkdf2_sha256 o argon2 (argon2-cffi)
+    "COMMENT_SCRYPT_WORK_FACTOR": 2**14,  # ~16 MB y ~50 ms por hash
+    "COMMENT_PBKDF2_ITERATIONS": 600000,
+    "COMMENT_ARGON2_TIME_COST": 2,
+    "COMMENT_ARGON2_MEMORY_COST": 102400,  # KiB
+    "COMMENT_HASH_WORKERS": 2,  # hashes simultáneos por proceso (0 = en el hilo de la petición)
+    "COMMENT_HASH_TIMEOUT": 5.0,  # segundos esperando hueco en el pool antes de responder 503
+    # Límite de comentarios por IP y por email (games.ratelimit; 0 = sin límite)
+    "COMMENT_RATE_BURST": 5,  # comentarios seguidos permitidos
+    "COMMENT_RATE_PER_MINUTE": 2.0,  # ritmo sostenido
+    # Moderación de comentarios (games.moderation): probabilidad de spam a partir de la
+    # cual se retienen para revisión o se marcan como spam directamente
+    "COMMENT_SPAM_HOLD": 0.5,
+    "COMMENT_SPAM_REJECT": 0.99,
+    # Comentarios en game_detail: los COMMENT_PAGE_SIZE más recientes, buscados primero
+    # en los últimos COMMENT_RECENT_MONTHS meses (con particiones, solo las recientes)
+    "COMMENT_PAGE_SIZE": 50,
+    "COMMENT_RECENT_MONTHS": 3,
+    # Particiones mensuales de comentarios en PostgreSQL (comando comment_partitions):
+    # meses creados por adelantado y meses tras los que se archivan (0 = nunca)
+    "COMMENT_PARTITION_AHEAD": 3,
+    "COMMENT_ARCHIVE_AFTER_MONTHS": 0,
+    "COMMENT_ARCHIVE_DIR": os.path.join(BASE_DIR, "archive"),
+    # Admin para catálogos grandes: conteo estimado, sin date_hierarchy y búsqueda
+    # solo en columnas indexadas (medir con bench_admin)
+    "ADMIN_PERFORMANCE_MODE": False,
+    "ADMIN_COUNT_ESTIMATE_THRESHOLD": 10000,  # filas contadas exactamente antes de estimar
+    # Filas por lote de las acciones masivas del admin (games.bulkjobs, run_bulk_jobs)
+    "BULK_JOB_BATCH": 200,
+    # Cache compartida entre workers para los contadores (alias "ratelimit"); tabla
+    # creada por la migración 0008. Con Redis: RATELIMIT_CACHE_BACKEND=
+    # django.core.cache.backends.redis.RedisCache y RATELIMIT_CACHE_LOCATION=redis://...
+    "RATELIMIT_CACHE_BACKEND": "django.core.cache.backends.db.DatabaseCache",
+    "RATELIMIT_CACHE_LOCATION": "games_ratelimit",
+    "RATELIMIT_TRUSTED_PROXIES": 0,  # proxies delante que añaden X-Forwarded-For
+    "DEFAULT_AUTO_FIELD": "django.db.models.BigAutoField",
+    # Logging: sin configurar en desarrollo, a archivo en producción
+    "LOG_TO_CONSOLE": False,
+    "DJANGO_LOG_LEVEL": "INFO",
+}
+
+
+# ============================================================================
+# CAPA 2: SSL/HTTPS SEGÚN DEBUG
+# ============================================================================
+
+SSL_DEVELOPMENT = {
+    "SECURE_SSL_REDIRECT": False,  # No forzar HTTPS en desarrollo
+    "SESSION_COOKIE_SECURE": False,
+    "CSRF_COOKIE_SECURE": False,
+    "SECURE_HSTS_SECONDS": 0,
+    "SECURE_HSTS_INCLUDE_SUBDOMAINS": False,
+    "SECURE_HSTS_PRELOAD": False,
+}
+
+SSL_PRODUCTION = {
+    # Forzar HTTPS
+    "SECURE_SSL_REDIRECT": True,
+    # Configuración de proxy SSL (para Nginx, Heroku, etc.)
+    "SECURE_PROXY_SSL_HEADER": ("HTTP_X_FORWARDED_PROTO", "https"),
+    # HTTP Strict Transport Security (HSTS)
+    "SECURE_HSTS_SECONDS": 31536000,  # 1 año
+    "SECURE_HSTS_INCLUDE_SUBDOMAINS": True,
+    "SECURE_HSTS_PRELOAD": True,
+    # Cookies seguras
+    "SESSION_COOKIE_SECURE": True,
+    "CSRF_COOKIE_SECURE": True,
+    "SESSION_COOKIE_HTTPONLY": True,
+    "CSRF_COOKIE_HTTPONLY": True,
+    # Configuración adicional de seguridad
+    "SECURE_BROWSER_XSS_FILTER": True,
+    "SECURE_CONTENT_TYPE_NOSNIFF": True,
+    "SECURE_REFERRER_POLICY": "strict-origin-when-cross-origin",
+    "X_FRAME_OPTIONS": "DENY",
+    # Configuración de Content Security Policy (CSP)
+    "CSP_DEFAULT_SRC": ["'self'"],
+    "CSP_STYLE_SRC": [
+        "'self'",
+        "'unsafe-inline'",
+        "https://cdn.jsdelivr.net",
+        "https://fonts.googleapis.com",
+        "https://cdnjs.cloudflare.com",
+    ],
+    "CSP_SCRIPT_SRC": [
+        "'self'",
+        "https://cdn.jsdelivr.net",
+        "https://cdnjs.cloudflare.com",
+    ],
+    "CSP_FONT_SRC": [
+        "'self'",
+        "https://fonts.gstatic.com",
+        "https://cdnjs.cloudflare.com",
+    ],
+    "CSP_IMG_SRC": ["'self'", "data:", "https:"],
+    "CSP_CONNECT_SRC": ["'self'"],
+}
+
+# Producción sin perfil de proveedor (actualizar con tu dominio)
+PRODUCTION = {
+    "ALLOWED_HOSTS": ["localhost", "127.0.0.1", "tu-dominio.com", "www.tu-dominio.com"],
+}
+
+
+# ============================================================================
+# CAPA 3: PERFILES POR PROVEEDOR
+# ============================================================================
+# Un valor invocable se evalúa con los settings ya combinados (capa 5).
+
+PROFILES = {
+    "development": {},
+    "vercel": {
+        "SECRET_KEY": "django-insecure-vercel-key-change-in-production",
+        "DEBUG": False,
+        "ALLOWED_HOSTS": [".vercel.app", ".now.sh", "localhost", "127.0.0.1", "davegames.vercel.app"],
+        # Arranque rápido: admin perezoso y /static/ servido por Vercel
+        "FAST_START": True,
+        # Sin DATABASE_URL: SQLite local
+        "DATABASES": {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "db.sqlite3"}},
+        "LANGUAGE_CODE": "es-es",
+        "TIME_ZONE": "Europe/Madrid",
+        "STATICFILES_DIRS": [os.path.join(BASE_DIR, "static")],
+        # /tmp es el único directorio escribible en Vercel
+        "METRICS_DIR": "/tmp/davegames-metrics",
+        "PROFILES_DIR": "/tmp/davegames-profiles",
+        # Cache por instancia y warm-up acotado (cada cold start empieza vacío)
+        "WARMUP_BUDGET": 0.5,
+        "WARMUP_TOP": 5,
+        # una función por petición: el pool no aporta concurrencia
+        "COMMENT_HASH_WORKERS": 0,
+        # el edge de Vercel añade la IP del cliente a X-Forwarded-For
+        "RATELIMIT_TRUSTED_PROXIES": 1,
+        "LOG_TO_CONSOLE": True,
+    },
+    "heroku": {
+        "ALLOWED_HOSTS": [".herokuapp.com"],
+        "RATELIMIT_TRUSTED_PROXIES": 1,
+        "MIDDLEWARE_ADDITIONS": [WHITENOISE_MIDDLEWARE],
+    },
+    "digitalocean": {
+        "ALLOWED_HOSTS": [".ondigitalocean.app", ".your-domain.com"],
+    },
+    "aws": {
+        "ALLOWED_HOSTS": [".elasticbeanstalk.com", ".your-domain.com"],
+        "AWS_ACCESS_KEY_ID": None,
+        "AWS_SECRET_ACCESS_KEY": None,
+        "AWS_STORAGE_BUCKET_NAME": None,
+        "AWS_S3_REGION_NAME": "us-east-1",
+        # Estáticos y media en S3 (django-storages)
+        "DEFAULT_FILE_STORAGE": "storages.backends.s3boto3.S3Boto3Storage",
+        "STATICFILES_STORAGE": "storages.backends.s3boto3.S3StaticStorage",
+        "AWS_S3_CUSTOM_DOMAIN": lambda s: f"{s['AWS_STORAGE_BUCKET_NAME']}.s3.amazonaws.com",
+        "STATIC_URL": lambda s: f"https://{s['AWS_STORAGE_BUCKET_NAME']}.s3.amazonaws.com/static/",
+        "MEDIA_URL": lambda s: f"https://{s['AWS_STORAGE_BUCKET_NAME']}.s3.amazonaws.com/media/",
+    },
+    "gcp": {
+        "ALLOWED_HOSTS": [".appspot.com", ".your-domain.com"],
+        # Cloud SQL por socket unix
+        "DB_HOST": lambda s: f"/cloudsql/{s['CLOUD_SQL_CONNECTION_NAME']}",
+        "DB_PORT": "",
+    },
+    "cloudflare": {
+        "SECURE_PROXY_SSL_HEADER": ("HTTP_CF_VISITOR", '{"scheme":"https"}'),
+        # purga por Cache-Tag en cuanto haya zona configurada
+        "EDGE_CDN": lambda s: "cloudflare" if s["CLOUDFLARE_ZONE_ID"] else "",
+    },
+    "vps": {
+        "ALLOWED_HOSTS": ["your-domain.com", "www.your-domain.com"],
+        "STATIC_ROOT": "/var/www/davegames/staticfiles/",
+        "MEDIA_ROOT": "/var/www/davegames/media/",
+    },
+    "docker": {
+        "ALLOWED_HOSTS": ["*"],  # Configurar según el entorno
+        "SECURE_SSL_REDIRECT": False,  # Manejar en el proxy reverso
+        "DB_NAME": lambda s: s["POSTGRES_DB"] or "davegames_db",
+        "DB_USER": lambda s: s["POSTGRES_USER"] or "postgres",
+        "DB_PASSWORD": lambda s: s["POSTGRES_PASSWORD"] or "",
+        "DB_HOST": "db",
+    },
+}
+
+
+def detect_provider(environ):
+    """Proveedor según las variables que define cada plataforma"""
+    if "VERCEL" in environ:
+        return "vercel"
+    if "DYNO" in environ:
+        return "heroku"
+    if "APP_PLATFORM" in environ:
+        return "digitalocean"
+    if "AWS_EXECUTION_ENV" in environ:
+        return "aws"
+    if "GAE_ENV" in environ:
+        return "gcp"
+    if "CF_RAY" in environ:
+        return "cloudflare"
+    if os.path.exists("/.dockerenv"):
+        return "docker"
+    return "vps"
+
+
+# ============================================================================
+# CAPA 4: VARIABLES DE ENTORNO
+# ============================================================================
+
+TRUE_VALUES = {"1", "true", "yes", "on", "y", "t"}
+FALSE_VALUES = {"0", "false", "no", "off", "n", "f", ""}
+
+
+def as_bool(value):
+    value = value.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError("se esperaba un booleano (true/false)")
+
+
+def as_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def non_negative(cast):
+    def parse(value):
+        number = cast(value)
+        if number < 0:
+            raise ValueError("no puede ser negativo")
+        return number
+
+    return parse
+
+
+def positive(cast):
+    def parse(value):
+        number = cast(value)
+        if number <= 0:
+            raise ValueError("debe ser mayor que cero")
+        return number
+
+    return parse
+
+
+def power_of_two(maximum):
+    def parse(value):
+        number = int(value)
+        if number < 2 or number & (number - 1):
+            raise ValueError("debe ser una potencia de 2")
+        if number > maximum:
+            raise ValueError(f"no puede superar {maximum}")
+        return number
+
+    return parse
+
+
+# desde 2**17 el hash de scrypt ocupa 129 caracteres y no cabe en Comment.password (128)
+SCRYPT_MAX_WORK_FACTOR = 2**16
+
+
+# Variable -> conversión. Solo estas se leen del entorno.
+ENV = {
+    "SECRET_KEY": str,
+    "DEBUG": as_bool,
+    "ALLOWED_HOSTS": as_list,
+    "FAST_START": as_bool,
+    "LEAN_PUBLIC_PAGES": as_bool,
+    "PUBLIC_CACHE_MAX_AGE": non_negative(int),
+    "EDGE_CDN": str,
+    "EDGE_CACHE_MAX_AGE": non_negative(int),
+    "EDGE_PURGE_DELAY": non_negative(float),
+    "CLOUDFLARE_ZONE_ID": str,
+    "CLOUDFLARE_API_TOKEN": str,
+    "DATABASE_URL": str,
+    "DATABASE_REPLICA_URLS": as_list,
+    "REPLICA_MAX_LAG": non_negative(float),
+    "REPLICA_CHECK_INTERVAL": non_negative(float),
+    "REPLICA_PIN_SECONDS": non_negative(int),
+    "DB_NAME": str,
+    "DB_USER": str,
+    "DB_PASSWORD": str,
+    "DB_HOST": str,
+    "DB_PORT": str,
+    "POSTGRES_DB": str,
+    "POSTGRES_USER": str,
+    "POSTGRES_PASSWORD": str,
+    "CLOUD_SQL_CONNECTION_NAME": str,
+    "AWS_ACCESS_KEY_ID": str,
+    "AWS_SECRET_ACCESS_KEY": str,
+    "AWS_STORAGE_BUCKET_NAME": str,
+    "AWS_S3_REGION_NAME": str,
+    "STATIC_ROOT": str,
+    "STATIC_BUILD_WORKERS": non_negative(int),
+    "MEDIA_CACHE_MAX_AGE": non_negative(int),
+    "MEDIA_ACCEL_REDIRECT": str,
+    "EARLY_HINTS": as_bool,
+    "SERVER_TIMING_HEADER": as_bool,
+    "METRICS_DIR": str,
+    "METRICS_TOKEN": str,
+    "PROFILES_DIR": str,
+    "PROFILE_INTERVAL": non_negative(float),
+    "PROFILE_KEEP": non_negative(int),
+    "PROFILE_TOKEN_MAX_AGE": non_negative(int),
+    "CACHE_BACKEND": str,
+    "CACHE_LOCATION": str,
+    "PAGE_CACHE_TIMEOUT": non_negative(int),
+    "PAGE_CACHE_STALE": non_negative(int),
+    "PAGE_CACHE_BETA": non_negative(float),
+    "PAGE_CACHE_LOCK_TIMEOUT": positive(int),
+    "WARMUP_ON_BOOT": as_bool,
+    "WARMUP_BUDGET": non_negative(float),
+    "WARMUP_TOP": non_negative(int),
+    "WARMUP_SNAPSHOT": str,
+    "SLOW_QUERY_MS": non_negative(float),
+    "SLOW_QUERY_EXPLAIN_INTERVAL": non_negative(int),
+    "COMMENT_PASSWORD_HASHER": str,
+    "COMMENT_SCRYPT_WORK_FACTOR": power_of_two(SCRYPT_MAX_WORK_FACTOR),
+    "COMMENT_PBKDF2_ITERATIONS": non_negative(int),
+    "COMMENT_ARGON2_TIME_COST": non_negative(int),
+    "COMMENT_ARGON2_MEMORY_COST": non_negative(int),
+    "COMMENT_HASH_WORKERS": non_negative(int),
+    "COMMENT_HASH_TIMEOUT": non_negative(float),
+    "COMMENT_RATE_BURST": non_negative(int),
+    "COMMENT_RATE_PER_MINUTE": non_negative(float),
+    "COMMENT_SPAM_HOLD": non_negative(float),
+    "COMMENT_SPAM_REJECT": non_negative(float),
+    "COMMENT_PAGE_SIZE": positive(int),
+    "COMMENT_RECENT_MONTHS": non_negative(int),
+    "COMMENT_PARTITION_AHEAD": non_negative(int),
+    "COMMENT_ARCHIVE_AFTER_MONTHS": non_negative(int),
+    "COMMENT_ARCHIVE_DIR": str,
+    "ADMIN_PERFORMANCE_MODE": as_bool,
+    "ADMIN_COUNT_ESTIMATE_THRESHOLD": non_negative(int),
+    "BULK_JOB_BATCH": positive(int),
+    "RATELIMIT_CACHE_BACKEND": str,
+    "RATELIMIT_CACHE_LOCATION": str,
+    "RATELIMIT_TRUSTED_PROXIES": non_negative(int),
+    "DJANGO_LOG_LEVEL": str,
+}
+
+def parse_environ(environ):
+    """Convertir las variables declaradas; todos los errores a la vez"""
+    values, errors = {}, []
+    for name, cast in ENV.items():
+        if name not in environ:
+            continue
+        try:
+            values[name] = cast(environ[name])
+        except ValueError as exc:
+            errors.append(f"{name}={environ[name]!r}: {exc}")
+    if errors:
+        raise ImproperlyConfigured("Variables de entorno inválidas:\n  " + "\n  ".join(errors))
+    return values
+
+
+def read_environ():
+    """Entorno relevante (os.environ y .env vía decouple) como tupla ordenable"""
+    names = [*ENV, "DEPLOY_PROVIDER"]
+    if any((BASE_DIR / name).exists() for name in (".env", "settings.ini")):
+        from decouple import config
+
+        items = ((name, config(name, default=None)) for name in names)
+    else:
+        # sin .env no hace falta importar decouple (arranque en frío)
+        items = ((name, os.environ.get(name)) for name in names)
+    return tuple(sorted((name, value) for name, value in items if value is not None))
+
+
+# ============================================================================
+# CAPA 5: DERIVADOS
+# ============================================================================
+
+
+def production_logging():
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "handlers": {
+            "file": {
+                "level": "INFO",
+                "class": "logging.FileHandler",
+                "filename": os.path.join(BASE_DIR, "django.log"),
+            },
+            "perf": {
+                "level": "INFO",
+                "class": "logging.FileHandler",
+                "filename": os.path.join(BASE_DIR, "perf.log"),
+            },
+        },
+        "loggers": {
+            "django": {"handlers": ["file"], "level": "INFO", "propagate": True},
+            # Una línea JSON por petición (games.instrumentation)
+            "games.perf": {"handlers": ["perf"], "level": "INFO", "propagate": False},
+        },
+    }
+
+
+def console_logging(level):
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "handlers": {"console": {"class": "logging.StreamHandler"}},
+        "root": {"handlers": ["console"]},
+        "loggers": {
+            "django": {"handlers": ["console"], "level": level, "propagate": False},
+            "games.perf": {"handlers": ["console"], "level": "INFO", "propagate": False},
+        },
+    }
+
+
+def derive(values):
+    for key, value in list(values.items()):
+        if callable(value):
+            values[key] = value(values)
+
+    if values["DATABASE_URL"]:
+        try:
+            import dj_database_url
+        except ImportError:
+            dj_database_url = None
+        if dj_database_url:
+            values["DATABASES"] = {"default": dj_database_url.parse(values["DATABASE_URL"])}
+    if "DATABASES" not in values:
+        values["DATABASES"] = {
+            "default": {
+                "ENGINE": "django.db.backends.postgresql",
+                "NAME": values["DB_NAME"],
+                "USER": values["DB_USER"],
+                "PASSWORD": values["DB_PASSWORD"],
+                "HOST": values["DB_HOST"],
+                "PORT": values["DB_PORT"],
+            }
+        }
+
+    replicas = values["DATABASE_REPLICA_URLS"]
+    if replicas:
+        try:
+            import dj_database_url
+        except ImportError as exc:
+            raise ImproperlyConfigured("DATABASE_REPLICA_URLS requiere dj-database-url") from exc
+        for index, url in enumerate(replicas, 1):
+            config = dj_database_url.parse(url)
+            # en los tests la réplica es la base de datos de test de default
+            config["TEST"] = {"MIRROR": "default"}
+            values["DATABASES"][f"replica_{index}"] = config
+    values["DATABASE_REPLICAS"] = [f"replica_{index}" for index in range(1, len(replicas) + 1)]
+
+    if values["EDGE_CDN"] == "cloudflare" and not (values["CLOUDFLARE_ZONE_ID"] and values["CLOUDFLARE_API_TOKEN"]):
+        raise ImproperlyConfigured("EDGE_CDN=cloudflare requiere CLOUDFLARE_ZONE_ID y CLOUDFLARE_API_TOKEN")
+
+    values["CACHES"] = {
+        "default": {"BACKEND": values["CACHE_BACKEND"], "LOCATION": values["CACHE_LOCATION"]},
+        "ratelimit": {"BACKEND": values["RATELIMIT_CACHE_BACKEND"], "LOCATION": values["RATELIMIT_CACHE_LOCATION"]},
+    }
+
+    if values["LOG_TO_CONSOLE"]:
+        values["LOGGING"] = console_logging(values["DJANGO_LOG_LEVEL"])
+    elif not values["DEBUG"]:
+        values["LOGGING"] = production_logging()
+
+    middleware = values["MIDDLEWARE"]
+    for addition in values.get("MIDDLEWARE_ADDITIONS", ()):
+        if addition not in middleware:
+            middleware.insert(1, addition)
+    if values["FAST_START"]:
+        # los admin.py se importan con la primera petición a /admin/ (admin_urls.py)
+        values["INSTALLED_APPS"][0] = "django.contrib.admin.apps.SimpleAdminConfig"
+        if WHITENOISE_MIDDLEWARE in middleware:
+            middleware.remove(WHITENOISE_MIDDLEWARE)
+
+    for key in INPUT_ONLY:
+        values.pop(key, None)
+    return values
+
+
+# ============================================================================
+# RESOLUCIÓN
+# ============================================================================
+
+
+class FrozenList(tuple):
+    """Lista congelada (vuelve a ser list al descongelar; las tuplas no)"""
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    if isinstance(value, tuple) and not isinstance(value, FrozenList):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, FrozenList):
+        return [thaw(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(thaw(item) for item in value)
+    return value
+
+
+def copy(value):
+    return thaw(freeze(value))
+
+
+@functools.lru_cache(maxsize=32)
+def resolve(provider="development", environ=()):
+    """
+    Args:
+        provider (str): perfil de PROFILES
+        environ (tuple): pares (variable, valor) como los de read_environ()
+
+    Returns:
+        MappingProxyType: settings efectivos, congelados
+    """
+    if provider not in PROFILES:
+        raise ImproperlyConfigured(
+            f"Proveedor desconocido: {provider!r} (opciones: {', '.join(sorted(PROFILES))})"
+        )
+    profile = PROFILES[provider]
+    env = parse_environ(dict(environ))
+    debug = env.get("DEBUG", profile.get("DEBUG", BASE["DEBUG"]))
+
+    values = copy(BASE)
+    values.update(copy(SSL_DEVELOPMENT if debug else SSL_PRODUCTION))
+    if not debug:
+        values.update(copy(PRODUCTION))
+    values.update(copy(profile))
+    values.update(env)
+    return freeze(derive(values))
+
+
+def provider_from(environ):
+    provider = dict(environ).get("DEPLOY_PROVIDER") or "development"
+    if provider == "auto":
+        provider = detect_provider(os.environ)
+    return provider
+
+
+def load(provider=None):
+    """Settings efectivos como dict mutable, para globals() del módulo de settings"""
+    environ = read_environ()
+    return thaw(resolve(provider or provider_from(environ), environ))
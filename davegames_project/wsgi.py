@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'davegames_project.settings')
 
 application = get_wsgi_application()
+
+from games.warmup import warm_up_on_boot  # noqa: E402  (requiere apps cargadas)
+
+warm_up_on_boot()
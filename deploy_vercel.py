@@ -34,7 +34,7 @@ def check_required_files():
     required_files = [
         'vercel.json',
         'build_files.sh',
-        'vercel_settings.py',
+        'davegames_project/settings_loader.py',
         'requirements_vercel.txt',
         'davegames_project/wsgi.py'
     ]
@@ -78,7 +78,8 @@ def collect_static_files():
     
     try:
         # Configurar Django
-        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vercel_settings')
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'davegames_project.settings')
+        os.environ.setdefault('DEPLOY_PROVIDER', 'vercel')
         
         # Ejecutar collectstatic
         result = subprocess.run([
@@ -125,7 +126,8 @@ def set_environment_variables():
     print("\n🔐 Configurando variables de entorno...")
     
     env_vars = {
-        'DJANGO_SETTINGS_MODULE': 'vercel_settings',
+        'DJANGO_SETTINGS_MODULE': 'davegames_project.settings',
+        'DEPLOY_PROVIDER': 'vercel',
         'DEBUG': 'False',
         'SECRET_KEY': 'django-insecure-change-this-in-production-vercel-key-12345',
     }
@@ -1,5 +1,48 @@
-from django.contrib import admin
-from .models import Category, Game
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from . import bulkjobs
+from .cache import bump_game
+from .edge import game_key, purge
+from .models import BulkJob, Category, Comment, Game, RequestProfile, SlowQuery
+from .pagination import EstimatedCountPaginator
+from .profiling import profile_path, speedscope_json
+
+
+# Modo rendimiento (ADMIN_PERFORMANCE_MODE) para catálogos grandes: conteo
+# estimado, sin el COUNT del total sin filtrar y búsqueda solo en columnas
+# con índice (migración 0010)
+class PerformanceModeMixin:
+    performance_search_fields = None
+    performance_defer = ()  # columnas largas que el listado no muestra
+
+    @property
+    def show_full_result_count(self):
+        return not settings.ADMIN_PERFORMANCE_MODE
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        if settings.ADMIN_PERFORMANCE_MODE:
+            return EstimatedCountPaginator(queryset, per_page, orphans, allow_empty_first_page)
+        return super().get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+
+    def get_search_fields(self, request):
+        if settings.ADMIN_PERFORMANCE_MODE and self.performance_search_fields is not None:
+            return self.performance_search_fields
+        return super().get_search_fields(request)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = getattr(request, "resolver_match", None)
+        # solo en el changelist: el formulario de edición sí usa todos los campos
+        if settings.ADMIN_PERFORMANCE_MODE and match and match.url_name.endswith("_changelist"):
+            queryset = queryset.defer(*self.performance_defer)
+        return queryset
 
 
 # Configuración para Category
@@ -10,13 +53,29 @@ class CategoryAdmin(admin.ModelAdmin):
     list_filter = ("name",)
 
 
+# Campo extra junto al desplegable de acciones (destino de "cambiar categoría")
+class GameActionForm(ActionForm):
+    category = forms.ModelChoiceField(Category.objects.order_by("name"), required=False, label="Categoría")
+
+
 # Configuración para Game
 @admin.register(Game)
-class GameAdmin(admin.ModelAdmin):
+class GameAdmin(PerformanceModeMixin, admin.ModelAdmin):
     list_display = ("title", "category", "release_date")
+    list_select_related = ("category",)
     list_filter = ("category", "release_date")
     search_fields = ("title", "description")
-    date_hierarchy = "release_date"
+    performance_search_fields = ("title",)  # índice trigram en PostgreSQL
+    performance_defer = ("description", "min_requirements", "max_requirements", "cover_placeholder")
+    autocomplete_fields = ("category",)
+    # acciones masivas: se encolan y las procesa run_bulk_jobs por lotes
+    action_form = GameActionForm
+    actions = ("recategorize_in_background", "delete_in_background", "reprocess_covers_in_background")
+
+    @property
+    def date_hierarchy(self):
+        # recorre todas las fechas distintas de la tabla en cada carga
+        return None if settings.ADMIN_PERFORMANCE_MODE else "release_date"
 
     # Campos organizados en el formulario
     fieldsets = (
@@ -31,3 +90,165 @@ class GameAdmin(admin.ModelAdmin):
         ("Multimedia", {"fields": ("cover_image", "trailer_url")}),
         ("Enlaces y Fecha", {"fields": ("download_link", "release_date")}),
     )
+
+    def _enqueue(self, request, queryset, action, **params):
+        job = bulkjobs.enqueue(action, queryset, request.user, **params)
+        url = reverse("admin:games_bulkjob_change", args=[job.pk])
+        self.message_user(
+            request,
+            format_html('{} juegos en cola: <a href="{}">{}</a>', job.total, url, job.get_action_display()),
+        )
+
+    @admin.action(description="Cambiar categoría (en segundo plano)", permissions=["change"])
+    def recategorize_in_background(self, request, queryset):
+        try:
+            category = GameActionForm.base_fields["category"].clean(request.POST.get("category"))
+        except forms.ValidationError:
+            category = None
+        if category is None:
+            self.message_user(request, "Elige la categoría de destino junto a la acción.", messages.WARNING)
+            return
+        self._enqueue(request, queryset, BulkJob.Action.RECATEGORIZE, category_id=category.pk)
+
+    @admin.action(description="Borrar (en segundo plano)", permissions=["delete"])
+    def delete_in_background(self, request, queryset):
+        self._enqueue(request, queryset, BulkJob.Action.DELETE)
+
+    @admin.action(description="Reprocesar portadas (en segundo plano)", permissions=["change"])
+    def reprocess_covers_in_background(self, request, queryset):
+        self._enqueue(request, queryset, BulkJob.Action.REPROCESS_COVERS)
+
+
+# Cola de moderación: lo que el worker retuvo se decide aquí
+@admin.register(Comment)
+class CommentAdmin(PerformanceModeMixin, admin.ModelAdmin):
+    list_display = ("nickname", "game", "status", "spam_score", "created_at")
+    list_filter = ("status",)
+    search_fields = ("nickname", "email", "text")
+    performance_search_fields = ("=email",)  # índice sobre UPPER(email) en PostgreSQL
+    performance_defer = ("text",)
+    list_select_related = ("game",)
+    raw_id_fields = ("game",)
+    readonly_fields = ("spam_score", "created_at", "moderated_by")
+    exclude = ("password",)
+    actions = ("publish", "mark_spam")
+
+    def save_model(self, request, obj, form, change):
+        # solo las decisiones de un admin entrenan el clasificador
+        if "status" in form.changed_data:
+            obj.moderated_by = request.user
+        super().save_model(request, obj, form, change)
+
+    def _set_status(self, request, queryset, status):
+        game_ids = set(queryset.values_list("game_id", flat=True))
+        updated = queryset.update(status=status, moderated_by=request.user)
+        # update() no dispara señales
+        for game_id in game_ids:
+            bump_game(game_id)
+        purge(*map(game_key, game_ids))
+        self.message_user(request, f"{updated} comentarios: {Comment.Status(status).label}")
+
+    @admin.action(description="Publicar los comentarios seleccionados")
+    def publish(self, request, queryset):
+        self._set_status(request, queryset, Comment.Status.PUBLISHED)
+
+    @admin.action(description="Marcar como spam (entrena el clasificador)")
+    def mark_spam(self, request, queryset):
+        self._set_status(request, queryset, Comment.Status.SPAM)
+
+
+# Progreso de las acciones masivas (run_bulk_jobs)
+@admin.register(BulkJob)
+class BulkJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "action", "status", "progress_bar", "created_by", "created_at", "finished_at")
+    list_filter = ("status", "action")
+    list_select_related = ("created_by",)
+    exclude = ("object_ids",)
+    readonly_fields = ("action", "params", "status", "progress_bar", "total", "processed", "error",
+                       "created_by", "created_at", "updated_at", "finished_at")
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description="Progreso")
+    def progress_bar(self, obj):
+        return format_html(
+            '<progress max="100" value="{}"></progress> {}%', obj.progress, obj.progress
+        )
+
+
+# Perfiles de peticiones (?_profile=1 o cabecera X-Profile)
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "method", "path", "view_name", "status_code", "duration_ms", "samples", "downloads")
+    list_filter = ("view_name", "status_code")
+    search_fields = ("path",)
+    date_hierarchy = "created_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Descargar")
+    def downloads(self, obj):
+        return format_html(
+            '<a href="{}">collapsed</a> · <a href="{}">speedscope</a>',
+            reverse("admin:games_requestprofile_download", args=[obj.pk, "folded"]),
+            reverse("admin:games_requestprofile_download", args=[obj.pk, "speedscope"]),
+        )
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/download/<str:fmt>/",
+                self.admin_site.admin_view(self.download),
+                name="games_requestprofile_download",
+            ),
+        ] + super().get_urls()
+
+    def download(self, request, pk, fmt):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        if not self.has_view_permission(request, profile):
+            raise Http404
+        try:
+            collapsed = profile_path(profile.filename).read_text(encoding="utf-8")
+        except OSError:
+            raise Http404("Archivo de perfil no encontrado")
+        stem = f"profile-{profile.pk}"
+        if fmt == "speedscope":
+            response = HttpResponse(speedscope_json(collapsed, str(profile)), content_type="application/json")
+            response["Content-Disposition"] = f'attachment; filename="{stem}.speedscope.json"'
+        elif fmt == "folded":
+            response = HttpResponse(collapsed, content_type="text/plain; charset=utf-8")
+            response["Content-Disposition"] = f'attachment; filename="{stem}.folded"'
+        else:
+            raise Http404
+        return response
+
+
+# Consultas lentas agrupadas por huella (SLOW_QUERY_MS)
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ("fingerprint", "short_sql", "source", "calls", "total_ms", "average_ms", "max_ms", "last_seen")
+    list_filter = ("vendor",)
+    search_fields = ("normalized", "source")
+    readonly_fields = ("normalized", "example", "source", "vendor", "calls", "total_ms", "max_ms",
+                       "last_ms", "plan_display", "explained_at", "first_seen", "last_seen")
+    exclude = ("fingerprint", "plan")
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description="SQL")
+    def short_sql(self, obj):
+        return obj.normalized[:120]
+
+    @admin.display(description="Media (ms)", ordering="total_ms")
+    def average_ms(self, obj):
+        return f"{obj.avg_ms:.1f}"
+
+    @admin.display(description="Plan (EXPLAIN)")
+    def plan_display(self, obj):
+        return format_html("<pre>{}</pre>", obj.plan)
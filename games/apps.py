@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class GamesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'games'
+
+    def ready(self):
+        from django.core.signals import request_finished
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401
+        from . import slowlog
+
+        connection_created.connect(slowlog.install, dispatch_uid="games.slowlog.install")
+        request_finished.connect(slowlog.flush, dispatch_uid="games.slowlog.flush")
@@ -0,0 +1,335 @@
+"""
+Suite de carga reproducible
+Datos sintéticos con tamaños de texto realistas (seed_data) y escenarios de
+navegación contra un servidor local (loadtest): portada, categorías, detalle
+y envío de comentarios. Reporta req/s, p50/p95/p99 y consultas por petición
+(leídas de la cabecera Server-Timing) y compara con una línea base guardada.
+"""
+
+import http.cookiejar
+import io
+import json
+import random
+import re
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import F
+from PIL import Image
+
+from .cache import bump_catalog
+from .edge import NAV, purge
+from .credentials import make
+from .models import Category, Comment, Game, MediaBlob
+
+# Marca de las categorías generadas (permite borrarlas con --clear)
+SEED_MARKER = "[seed_data]"
+
+BASELINE_PATH = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+
+SCENARIOS = ("home", "category", "detail", "comment")
+
+WORDS = (
+    "acción aventura batalla mundo jugador enemigo nivel misión historia personaje "
+    "combate arma mapa secreto jefe final modo cooperativo online campaña gráficos "
+    "música ciudad bosque castillo nave espacio tiempo poder equipo estrategia "
+    "carrera velocidad torneo desafío explorar descubrir construir sobrevivir "
+    "legendario épico clásico retro nuevo increíble rápido oscuro brillante "
+    "el la los las un una de del con sin para por en sobre entre y o pero muy más"
+).split()
+
+CATEGORY_NAMES = (
+    "Acción", "Aventura", "RPG", "Estrategia", "Deportes", "Carreras", "Lucha",
+    "Plataformas", "Puzzle", "Simulación", "Terror", "Shooter",
+)
+
+# Rangos de caracteres observados en el catálogo real
+DESCRIPTION_CHARS = (600, 2000)
+REQUIREMENTS_CHARS = (120, 320)
+COMMENT_CHARS = (40, 600)
+
+COVER_POOL = 8
+
+QUERIES_RE = re.compile(r'db;[^,]*desc="(\d+) queries"')
+CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+def text(rng, length_range):
+    """Párrafos de palabras aleatorias con longitud dentro del rango"""
+    target = rng.randint(*length_range)
+    words, size = [], 0
+    while size < target:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    sentence = " ".join(words)[:target].rstrip()
+    return sentence[0].upper() + sentence[1:] + "."
+
+
+def cover_pool(rng, size=COVER_POOL):
+    """
+    Crear unas pocas portadas reales (con miniatura y placeholder) guardando un
+    juego por portada; el resto de juegos las comparte vía bulk_create.
+    """
+    covers = []
+    for index in range(size):
+        color = tuple(rng.randint(0, 255) for _ in range(3))
+        buffer = io.BytesIO()
+        Image.new("RGB", (600, 800), color).save(buffer, "JPEG", quality=85)
+        covers.append(ContentFile(buffer.getvalue(), name=f"seed-{index}.jpg"))
+    return covers
+
+
+def seed(categories, games, comments, rng_seed=0, stdout=None):
+    """
+    Generar categorías, juegos y comentarios de forma determinista.
+
+    Returns:
+        dict: número de objetos creados por modelo
+    """
+    rng = random.Random(rng_seed)
+    created_categories = Category.objects.bulk_create(
+        Category(
+            name=f"{CATEGORY_NAMES[index % len(CATEGORY_NAMES)]} {index + 1}",
+            description=f"{SEED_MARKER} {text(rng, (80, 200))}",
+        )
+        for index in range(categories)
+    )
+
+    def game_fields(index):
+        return {
+            "title": f"{text(rng, (8, 40)).rstrip('.').title()} {index + 1}",
+            "category": rng.choice(created_categories),
+            "description": text(rng, DESCRIPTION_CHARS),
+            "min_requirements": text(rng, REQUIREMENTS_CHARS),
+            "max_requirements": text(rng, REQUIREMENTS_CHARS),
+            "download_link": f"https://example.com/descargas/{index + 1}",
+            "release_date": f"{rng.randint(1990, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        }
+
+    # Las primeras portadas pasan por save(): señales, miniaturas y MediaBlob
+    templates = []
+    for index, cover in enumerate(cover_pool(rng)[: max(games, 0)]):
+        game = Game(cover_image=cover, **game_fields(index))
+        game.save()
+        templates.append(game)
+
+    derived = ("cover_image", "cover_thumbnail", "cover_width", "cover_height", "cover_placeholder", "cover_color")
+    bulk = []
+    for index in range(len(templates), games):
+        template = templates[index % len(templates)]
+        bulk.append(Game(**game_fields(index), **{field: getattr(template, field) for field in derived}))
+    Game.objects.bulk_create(bulk, batch_size=500)
+
+    # bulk_create no dispara señales: sumar las referencias compartidas a mano
+    for template in templates:
+        shared = sum(1 for game in bulk if game.cover_image.name == template.cover_image.name)
+        for field in ("cover_image", "cover_thumbnail"):
+            name = getattr(template, field).name
+            if name and shared:
+                MediaBlob.objects.filter(name=name).update(ref_count=F("ref_count") + shared)
+
+    all_games = templates + bulk
+    # un único hash compartido: hashear cada comentario dominaría el seed
+    password = make("benchmark")
+    batch = []
+    created_comments = 0
+    for game in all_games:
+        for _ in range(comments):
+            nickname = f"{rng.choice(WORDS)}{rng.randint(1, 9999)}"[:50]
+            batch.append(
+                Comment(
+                    game=game,
+                    nickname=nickname,
+                    email=f"{nickname}@example.com",
+                    password=password,
+                    status=Comment.Status.PUBLISHED,
+                    text=text(rng, COMMENT_CHARS),
+                )
+            )
+        if len(batch) >= 2000:
+            created_comments += len(Comment.objects.bulk_create(batch))
+            batch = []
+    created_comments += len(Comment.objects.bulk_create(batch))
+    # bulk_create tampoco invalida la cache de páginas
+    bump_catalog()
+    purge(NAV)
+    return {"categories": len(created_categories), "games": len(all_games), "comments": created_comments}
+
+
+def clear_seeded():
+    """Borrar lo generado por seed (los juegos y comentarios caen en cascada)"""
+    games = Game.objects.filter(category__description__startswith=SEED_MARKER)
+    # delete() por instancia para liberar las referencias de MediaBlob
+    deleted = 0
+    for game in games.iterator():
+        game.delete()
+        deleted += 1
+    Category.objects.filter(description__startswith=SEED_MARKER).delete()
+    return deleted
+
+
+def percentile(ordered, point):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, round((len(ordered) - 1) * point / 100))]
+
+
+def summarize(samples, elapsed):
+    """Resumen de un escenario a partir de (latencia s, consultas, ok)"""
+    latencies = sorted(sample[0] * 1000 for sample in samples)
+    queries = [sample[1] for sample in samples if sample[1] is not None]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if not sample[2]),
+        "rps": len(samples) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "queries": statistics.mean(queries) if queries else None,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Regresiones respecto a la línea base: menos req/s o más p95 que la
+    tolerancia relativa, o cualquier consulta extra por petición.
+    """
+    regressions = []
+    for scenario, current in results.items():
+        base = baseline.get(scenario)
+        if not base:
+            continue
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{scenario}: req/s {base['rps']:.1f} -> {current['rps']:.1f}")
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{scenario}: p95 {base['p95_ms']:.1f} ms -> {current['p95_ms']:.1f} ms")
+        if base.get("queries") is not None and current["queries"] is not None:
+            if current["queries"] > base["queries"] + 0.5:
+                regressions.append(f"{scenario}: consultas {base['queries']:.1f} -> {current['queries']:.1f}")
+    return regressions
+
+
+class LoadClient:
+    """Cliente HTTP con cookies propias (una sesión por hilo)"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+
+        class NoRedirect(urllib.request.HTTPRedirectHandler):
+            def redirect_request(self, *args, **kwargs):
+                return None
+
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), NoRedirect
+        )
+
+    def request(self, path, data=None, headers=None):
+        """Devuelve (segundos, consultas, status, cuerpo)"""
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=body, headers=headers or {})
+        start = time.perf_counter()
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                status, content, timing = response.status, response.read(), response.headers.get("Server-Timing")
+        except urllib.error.HTTPError as exc:
+            status, content, timing = exc.code, exc.read(), exc.headers.get("Server-Timing")
+        elapsed = time.perf_counter() - start
+        match = QUERIES_RE.search(timing or "")
+        return elapsed, int(match.group(1)) if match else None, status, content
+
+
+class Scenarios:
+    """Pasos de cada escenario; devuelven (segundos, consultas, ok)"""
+
+    def __init__(self, base_url, category_ids, game_ids, rng_seed=0):
+        self.base_url = base_url
+        self.category_ids = category_ids
+        self.game_ids = game_ids
+        self.rng = random.Random(rng_seed)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def client(self):
+        if not hasattr(self.local, "client"):
+            self.local.client = LoadClient(self.base_url)
+        return self.local.client
+
+    def choice(self, values):
+        with self.lock:
+            return self.rng.choice(values)
+
+    def get(self, path):
+        elapsed, queries, status, _ = self.client().request(path)
+        return elapsed, queries, status == 200
+
+    def home(self):
+        return self.get("/")
+
+    def category(self):
+        return self.get(f"/category/{self.choice(self.category_ids)}/")
+
+    def detail(self):
+        return self.get(f"/game/{self.choice(self.game_ids)}/")
+
+    def comment(self):
+        """GET del detalle, token CSRF y POST del formulario; se mide el POST"""
+        path = f"/game/{self.choice(self.game_ids)}/"
+        client = self.client()
+        _, _, _, content = client.request(path)
+        token = CSRF_INPUT_RE.search(content.decode("utf-8", "replace"))
+        if token:
+            token = token.group(1)
+        else:
+            # página pública sin cookies (games.lean): como el script del formulario
+            _, _, status, content = client.request("/csrf-token/")
+            if status != 200:
+                return 0.0, None, False
+            token = json.loads(content)["token"]
+        with self.lock:
+            body = text(self.rng, COMMENT_CHARS)
+        elapsed, queries, status, _ = client.request(
+            path,
+            data={
+                "csrfmiddlewaretoken": token,
+                "nickname": "loadtest",
+                "email": "loadtest@example.com",
+                "password": "loadtest",
+                "text": body,
+            },
+            headers={"Referer": client.base_url + path},
+        )
+        return elapsed, queries, status == 302
+
+    def run(self, scenario, requests, concurrency, warmup=0):
+        step = getattr(self, scenario)
+        for _ in range(warmup):
+            step()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(lambda _: step(), range(requests)))
+        return summarize(samples, time.perf_counter() - start)
+
+
+def load_baseline(path):
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))["scenarios"]
+
+
+def save_baseline(path, results, options):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"options": options, "scenarios": results}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
@@ -0,0 +1,143 @@
+"""
+Acciones masivas del admin en segundo plano
+Las acciones de GameAdmin (cambiar categoría, borrar, reprocesar portadas)
+solo guardan un BulkJob con los ids seleccionados; el comando run_bulk_jobs
+los procesa en lotes de BULK_JOB_BATCH filas. Cada lote va en su propia
+transacción con QuerySet.update()/bulk_update() y la cache se invalida una
+vez por lote (batched_invalidation), no una por fila. El progreso se guarda
+tras cada lote, así que un trabajo interrumpido continúa donde se quedó.
+"""
+
+import logging
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import batched_invalidation, bump_catalog
+from .edge import purge_games
+from .images import DERIVED_FIELDS, process_cover
+from . import slowlog
+from .models import BulkJob, Game, MediaBlob
+
+logger = logging.getLogger(__name__)
+
+# segundos sin latido tras los que otro worker puede retomar un trabajo
+STALE_AFTER = 300
+
+
+def _recategorize(ids, params):
+    games = Game.objects.filter(pk__in=ids)
+    previous = set(games.values_list("category_id", flat=True))
+    games.update(category_id=params["category_id"])
+    bump_catalog()
+    purge_games(ids, previous | {params["category_id"]})
+
+
+def _delete(ids, params):
+    # las señales por fila mantienen los MediaBlob; la cache sube una vez al salir del lote
+    Game.objects.filter(pk__in=ids).delete()
+
+
+def _reprocess_covers(ids, params):
+    from .signals import retain_media
+
+    games = list(Game.objects.filter(pk__in=ids).exclude(cover_image=""))
+    retained, released = Counter(), Counter()
+    for game in games:
+        previous = game.cover_thumbnail.name
+        try:
+            process_cover(game)
+        except OSError:
+            logger.warning("No se pudo procesar la portada %s", game.cover_image.name, exc_info=True)
+            continue
+        current = game.cover_thumbnail.name
+        if current != previous:
+            if current:
+                retained[current] += 1
+            if previous:
+                released[previous] += 1
+    # bulk_update no dispara señales: referencias de miniaturas agregadas por lote
+    Game.objects.bulk_update(games, DERIVED_FIELDS)
+    purge_games([game.pk for game in games], {game.category_id for game in games})
+    for name, count in retained.items():
+        retain_media("cover_thumbnail", name, count)
+    storage = Game._meta.get_field("cover_thumbnail").storage
+    for name, count in released.items():
+        MediaBlob.objects.release(name, storage, count)
+    bump_catalog()
+
+
+HANDLERS = {
+    BulkJob.Action.RECATEGORIZE: _recategorize,
+    BulkJob.Action.DELETE: _delete,
+    BulkJob.Action.REPROCESS_COVERS: _reprocess_covers,
+}
+
+
+def enqueue(action, queryset, user=None, **params):
+    ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+    return BulkJob.objects.create(
+        action=action, params=params, object_ids=ids, total=len(ids), created_by=user
+    )
+
+
+def claim():
+    """Siguiente trabajo en cola (o abandonado); varios workers no toman el mismo"""
+    stale = timezone.now() - timedelta(seconds=STALE_AFTER)
+    with transaction.atomic():
+        job = (
+            BulkJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=BulkJob.Status.QUEUED) | Q(status=BulkJob.Status.RUNNING, updated_at__lt=stale))
+            .order_by("id")
+            .first()
+        )
+        if job:
+            job.status = BulkJob.Status.RUNNING
+            job.save(update_fields=["status", "updated_at"])
+    return job
+
+
+def run_batch(job, size=None):
+    """Procesar el siguiente lote; devuelve las filas procesadas"""
+    size = size or settings.BULK_JOB_BATCH
+    ids = job.object_ids[job.processed : job.processed + size]
+    # la cache se invalida después del commit del lote
+    with batched_invalidation(), transaction.atomic():
+        HANDLERS[job.action](ids, job.params)
+        job.processed += len(ids)
+        if job.processed >= job.total:
+            job.status = BulkJob.Status.DONE
+            job.finished_at = timezone.now()
+        job.save(update_fields=["processed", "status", "finished_at", "updated_at"])
+    return len(ids)
+
+
+def run(job, size=None, deadline=None):
+    """
+    Procesar lotes hasta terminar o hasta `deadline` (time.monotonic()).
+
+    Returns:
+        bool: True si el trabajo terminó (bien o con error)
+    """
+    while job.status == BulkJob.Status.RUNNING:
+        if deadline is not None and time.monotonic() >= deadline:
+            # de vuelta a la cola: la siguiente ejecución lo retoma sin esperar a STALE_AFTER
+            job.status = BulkJob.Status.QUEUED
+            job.save(update_fields=["status", "updated_at"])
+            return False
+        try:
+            run_batch(job, size)
+        except Exception as exc:
+            logger.exception("Falló el trabajo masivo %s", job.pk)
+            job.status = BulkJob.Status.FAILED
+            job.error = f"{type(exc).__name__}: {exc}"
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        # fuera de la transacción del lote
+        slowlog.flush()
+    return True
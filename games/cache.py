@@ -0,0 +1,233 @@
+"""
+Cache de páginas, fragmentos y navegación
+Las claves llevan un número de versión: guardar o borrar un juego, una
+categoría o un comentario sube la versión (games.signals) y las entradas
+viejas simplemente dejan de leerse hasta que caducan.
+
+- nav_categories(): categorías del menú, compartidas por todas las vistas.
+- cached_page: página completa de home, category_games y, en el perfil
+  ligero (games.lean, sin token CSRF en el HTML), game_detail; con
+  stale-while-revalidate y una sola regeneración por clave a la vez.
+- game_detail cachea además sus fragmentos en la plantilla ({% cache %}) con
+  fragment_version(game), que es lo que se usa sin el perfil ligero.
+"""
+
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial, wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .lean import is_public
+from .metrics import cache_requests, count_cache
+
+CATALOG_VERSION_KEY = "games:catalog:version"
+NAV_KEY = "games:nav:{version}"
+PAGE_KEY = "games:page:{path}"
+GAME_VERSION_KEY = "games:game:{game_id}:version"
+
+# segundos entre comprobaciones mientras otra petición regenera una página
+LOCK_POLL = 0.01
+
+
+def _version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+_batch = threading.local()
+
+
+@contextmanager
+def batched_invalidation():
+    """
+    Agrupar invalidaciones (acciones masivas): dentro del bloque cada versión
+    se apunta una vez y sube al salir, en lugar de una vez por fila.
+    """
+    if getattr(_batch, "keys", None) is not None:
+        yield
+        return
+    _batch.keys = set()
+    try:
+        yield
+    finally:
+        keys, _batch.keys = _batch.keys, None
+        for key in keys:
+            _bump(key)
+
+
+def _bump(key):
+    if getattr(_batch, "keys", None) is not None:
+        _batch.keys.add(key)
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 2, timeout=None)
+
+
+def catalog_version():
+    return _version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog():
+    """Juegos o categorías cambiaron: invalida páginas y navegación"""
+    _bump(CATALOG_VERSION_KEY)
+
+
+def game_version(game_id):
+    return _version(GAME_VERSION_KEY.format(game_id=game_id))
+
+
+def bump_game(game_id):
+    """Comentarios del juego cambiaron: invalida sus fragmentos"""
+    _bump(GAME_VERSION_KEY.format(game_id=game_id))
+
+
+def fragment_version(game):
+    return f"{catalog_version()}.{game_version(game.pk)}"
+
+
+def nav_categories():
+    """Categorías del menú (lista evaluada, se guarda tal cual en la cache)"""
+    from .models import Category
+
+    key = NAV_KEY.format(version=catalog_version())
+    categories = cache.get(key)
+    count_cache("nav", categories is not None)
+    if categories is None:
+        categories = list(Category.objects.all())
+        cache.set(key, categories, settings.PAGE_CACHE_TIMEOUT)
+    return categories
+
+
+def detail_version(game_id):
+    """Versión de la ficha de un juego: catálogo más sus comentarios"""
+    return f"{catalog_version()}.{game_version(game_id)}"
+
+
+def page_key(path):
+    return PAGE_KEY.format(path=path)
+
+
+def should_refresh(entry, now=None, beta=None):
+    """
+    Expiración anticipada probabilística (XFetch): cuanto más cara fue la
+    página (delta) y más cerca está de caducar, más probable es que esta
+    petición la regenere antes de tiempo, una sola y no todas a la vez.
+    """
+    now = time.time() if now is None else now
+    beta = settings.PAGE_CACHE_BETA if beta is None else beta
+    # 1 - random() está en (0, 1]: el logaritmo nunca es de 0
+    return now - entry["delta"] * beta * math.log(1.0 - random.random()) >= entry["expires"]
+
+
+def _from_entry(request, entry):
+    response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    # las cabeceras Link de la vista (portada) también salen de la cache
+    if entry["links"]:
+        request.preload_links = list(entry["links"])
+    return response
+
+
+def _render(view, request, args, kwargs, key, version):
+    start = time.perf_counter()
+    response = view(request, *args, **kwargs)
+    if hasattr(response, "render") and not response.is_rendered:
+        response.render()
+    if response.status_code == 200:
+        timeout = settings.PAGE_CACHE_TIMEOUT
+        entry = {
+            "content": response.content,
+            "content_type": response["Content-Type"],
+            "version": version,
+            "expires": time.time() + timeout,
+            "delta": time.perf_counter() - start,
+            "links": tuple(getattr(request, "preload_links", ())),
+        }
+        # la entrada sobrevive PAGE_CACHE_STALE segundos más para servirse caducada
+        cache.set(key, entry, timeout + settings.PAGE_CACHE_STALE)
+    return response
+
+
+def _wait_for(key, lock, version):
+    """
+    Otra petición está regenerando la clave: esperar su resultado. Si suelta
+    el cerrojo sin dejar entrada (404, excepción, respuesta no 200) se deja
+    de esperar y cada petición renderiza la suya.
+    """
+    deadline = time.monotonic() + settings.PAGE_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL)
+        # el cerrojo se mira antes que la entrada: se borra después de guardarla
+        released = cache.get(lock) is None
+        entry = cache.get(key)
+        if entry is not None and entry["version"] == version:
+            return entry
+        if released:
+            return None
+    return None
+
+
+def cached_page(view=None, *, version=None, public_only=False):
+    """
+    Cachear el HTML completo de una vista pública sin contenido por usuario.
+    Solo GET/HEAD sin query string y respuestas 200.
+
+    Stale-while-revalidate: la clave no lleva versión; una entrada de otra
+    versión del catálogo, caducada o elegida por XFetch la regenera una sola
+    petición (cerrojo con cache.add()) mientras las demás reciben la copia
+    anterior. Sin copia anterior, las demás esperan a la que regenera.
+
+    Args:
+        version: función de los kwargs de la vista que da la versión vigente
+            (por defecto la del catálogo)
+        public_only: cachear solo las peticiones de games.lean (la página
+            lleva un formulario con CSRF que sin el perfil ligero es por usuario)
+    """
+    if view is None:
+        return partial(cached_page, version=version, public_only=public_only)
+    get_version = version or (lambda **kwargs: catalog_version())
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or request.GET or not settings.PAGE_CACHE_TIMEOUT:
+            return view(request, *args, **kwargs)
+        if public_only and not is_public(request):
+            return view(request, *args, **kwargs)
+
+        key = page_key(request.path)
+        current = get_version(**kwargs)
+        entry = cache.get(key)
+        fresh = entry is not None and entry["version"] == current
+        if fresh and not should_refresh(entry):
+            count_cache("page", True)
+            return _from_entry(request, entry)
+
+        lock = key + ":lock"
+        if cache.add(lock, 1, timeout=settings.PAGE_CACHE_LOCK_TIMEOUT):
+            count_cache("page", False)
+            try:
+                return _render(view, request, args, kwargs, key, current)
+            finally:
+                cache.delete(lock)
+
+        if entry is not None:
+            # otra petición ya la está regenerando
+            cache_requests.inc(cache="page", result="hit" if fresh else "stale")
+            return _from_entry(request, entry)
+        entry = _wait_for(key, lock, current)
+        count_cache("page", entry is not None)
+        if entry is not None:
+            return _from_entry(request, entry)
+        return view(request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,137 @@
+"""
+Contraseñas de los comentarios
+Se guardan con un hasher de Django configurable (COMMENT_PASSWORD_HASHER:
+scrypt, pbkdf2_sha256 o argon2) y coste ajustable, medido con el comando
+bench_hashing. El cálculo se hace en un pool acotado de hilos (hashlib y
+argon2-cffi liberan el GIL): como mucho COMMENT_HASH_WORKERS hashes a la vez
+por proceso, y si la cola está llena durante COMMENT_HASH_TIMEOUT segundos
+se lanza HashingBusy en lugar de saturar la CPU del worker.
+
+verify() rehashea de forma transparente cuando el hash guardado usa otro
+algoritmo u otros parámetros que los configurados.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+
+HASHERS = {
+    "pbkdf2_sha256": PBKDF2PasswordHasher,
+    "scrypt": ScryptPasswordHasher,
+    "argon2": Argon2PasswordHasher,
+}
+
+# techo de memoria de scrypt (el de OpenSSL, 32 MiB, no llega a 2**15)
+SCRYPT_MAXMEM = 256 * 1024 * 1024
+
+# tareas en cola por hilo del pool antes de rechazar
+QUEUE_PER_WORKER = 4
+
+_lock = threading.Lock()
+_pool = None
+_slots = None
+
+
+class HashingBusy(Exception):
+    """El pool de hashing está saturado"""
+
+
+def get_hasher(algorithm=None, **params):
+    """
+    Hasher con los parámetros de settings (o los indicados).
+
+    Args:
+        algorithm (str): por defecto COMMENT_PASSWORD_HASHER
+        params: iterations, work_factor, time_cost, memory_cost...
+    """
+    algorithm = algorithm or settings.COMMENT_PASSWORD_HASHER
+    if algorithm not in HASHERS:
+        raise ImproperlyConfigured(
+            f"COMMENT_PASSWORD_HASHER desconocido: {algorithm!r} (opciones: {', '.join(HASHERS)})"
+        )
+    hasher = HASHERS[algorithm]()
+    if algorithm == "pbkdf2_sha256":
+        params.setdefault("iterations", settings.COMMENT_PBKDF2_ITERATIONS)
+    elif algorithm == "scrypt":
+        params.setdefault("work_factor", settings.COMMENT_SCRYPT_WORK_FACTOR)
+        params.setdefault("maxmem", SCRYPT_MAXMEM)
+    else:
+        try:
+            hasher._load_library()
+        except ValueError as exc:
+            raise ImproperlyConfigured("COMMENT_PASSWORD_HASHER=argon2 requiere argon2-cffi") from exc
+        params.setdefault("time_cost", settings.COMMENT_ARGON2_TIME_COST)
+        params.setdefault("memory_cost", settings.COMMENT_ARGON2_MEMORY_COST)
+    for name, value in params.items():
+        setattr(hasher, name, value)
+    return hasher
+
+
+def run(func, *args):
+    """Ejecutar en el pool acotado (en línea si COMMENT_HASH_WORKERS=0)"""
+    workers = settings.COMMENT_HASH_WORKERS
+    if not workers:
+        return func(*args)
+    global _pool, _slots
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="comment-hash")
+            _slots = threading.BoundedSemaphore(workers * QUEUE_PER_WORKER)
+        pool, slots = _pool, _slots
+    if not slots.acquire(timeout=settings.COMMENT_HASH_TIMEOUT):
+        raise HashingBusy
+    try:
+        return pool.submit(func, *args).result()
+    finally:
+        slots.release()
+
+
+def reset_pool(**kwargs):
+    """Receptor de setting_changed: el pool se recrea con el nuevo tamaño"""
+    global _pool, _slots
+    if kwargs.get("setting") not in (None, "COMMENT_HASH_WORKERS"):
+        return
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = _slots = None
+
+
+setting_changed.connect(reset_pool, dispatch_uid="games.credentials.reset_pool")
+
+
+def make(password):
+    hasher = get_hasher()
+    return run(hasher.encode, password, hasher.salt())
+
+
+def needs_rehash(encoded):
+    algorithm = encoded.split("$", 1)[0]
+    preferred = get_hasher()
+    return algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def verify(password, encoded, setter=None):
+    """
+    Comprobar la contraseña; si es correcta y el hash está desfasado, llama a
+    setter(password) para guardarla con los parámetros actuales.
+    """
+    algorithm = encoded.split("$", 1)[0] if encoded else ""
+    if algorithm not in HASHERS:
+        return False
+    valid = run(get_hasher(algorithm).verify, password, encoded)
+    if valid and setter and needs_rehash(encoded):
+        setter(password)
+    return valid
+
+
+def is_hashed(value):
+    return bool(value) and value.split("$", 1)[0] in HASHERS
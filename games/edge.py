@@ -0,0 +1,257 @@
+"""
+Cache en el CDN con surrogate keys y purga selectiva
+Las páginas públicas (games.lean) salen etiquetadas según su URL:
+
+- home: nav, home
+- category_games: nav, category-<id>
+- game_detail: nav, game-<id>
+
+en Cache-Tag (Cloudflare) y Surrogate-Key (Fastly y compatibles), con
+CDN-Cache-Control: max-age=EDGE_CACHE_MAX_AGE para que el CDN las guarde
+horas mientras el navegador solo PUBLIC_CACHE_MAX_AGE segundos.
+
+Al cambiar un juego, una categoría o los comentarios visibles se purgan solo
+las etiquetas afectadas (games.signals, games.bulkjobs, games.moderation).
+Las purgas se apuntan al hacer commit y un hilo las agrupa durante
+EDGE_PURGE_DELAY segundos, sin duplicados y en lotes del tamaño que admite
+el proveedor, fuera de la petición. EDGE_CDN elige el proveedor:
+"cloudflare" (API de purga por etiquetas) o "fake" (CDN en memoria para
+tests y desarrollo); vacío desactiva etiquetas y purgas.
+"""
+
+import atexit
+import json
+import logging
+import threading
+import urllib.request
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.db import transaction
+
+from .lean import is_public
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+NAV = "nav"
+HOME = "home"
+
+edge_purges = registry.counter("davegames_edge_purges_total", "Etiquetas purgadas en el CDN por resultado")
+
+
+def game_key(game_id):
+    return f"game-{game_id}"
+
+
+def category_key(category_id):
+    return f"category-{category_id}"
+
+
+def surrogate_keys(match):
+    """Etiquetas de una página pública a partir de su URL"""
+    if match.url_name == "home":
+        return [NAV, HOME]
+    if match.url_name == "category_games":
+        return [NAV, category_key(match.kwargs["category_id"])]
+    if match.url_name == "game_detail":
+        return [NAV, game_key(match.kwargs["game_id"])]
+    return []
+
+
+class SurrogateKeyMiddleware:
+    """Etiquetas y TTL del CDN en las páginas públicas cacheables"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        if not settings.EDGE_CDN or match is None or response.status_code != 200 or not is_public(request):
+            return response
+        keys = surrogate_keys(match)
+        if keys:
+            response["Cache-Tag"] = ",".join(keys)
+            response["Surrogate-Key"] = " ".join(keys)
+            if settings.EDGE_CACHE_MAX_AGE:
+                response["CDN-Cache-Control"] = f"public, max-age={settings.EDGE_CACHE_MAX_AGE}"
+        return response
+
+
+# ============================================================================
+# PROVEEDORES
+# ============================================================================
+
+
+class CloudflarePurger:
+    """POST /zones/{zone}/purge_cache con {"tags": [...]}"""
+
+    API = "https://api.cloudflare.com/client/v4/zones/{zone}/purge_cache"
+    max_keys = 30
+
+    def __init__(self):
+        self.url = self.API.format(zone=settings.CLOUDFLARE_ZONE_ID)
+        self.token = settings.CLOUDFLARE_API_TOKEN
+
+    def purge(self, keys):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"tags": keys}).encode(),
+            headers={"Authorization": f"Bearer {self.token}", "Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=10) as response:
+            result = json.load(response)
+        if not result.get("success"):
+            raise RuntimeError(f"Cloudflare rechazó la purga: {result.get('errors')}")
+
+
+class FakeCDN:
+    """
+    CDN en memoria: guarda las respuestas cacheables por ruta con sus
+    etiquetas y las descarta al purgar. fetch() sirve desde la cache o pide
+    la página al cliente de pruebas de Django.
+    """
+
+    max_keys = 30
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.purges = []
+
+    def fetch(self, client, path):
+        with self.lock:
+            entry = self.entries.get(path)
+        if entry:
+            return entry[0], True
+        response = client.get(path)
+        tags = response.get("Cache-Tag")
+        if response.status_code == 200 and tags and "CDN-Cache-Control" in response and not response.cookies:
+            with self.lock:
+                self.entries[path] = (response, set(tags.split(",")))
+        return response, False
+
+    def purge(self, keys):
+        keys = set(keys)
+        with self.lock:
+            self.purges.append(sorted(keys))
+            for path in [path for path, (_, tags) in self.entries.items() if tags & keys]:
+                del self.entries[path]
+
+
+BACKENDS = {
+    "cloudflare": CloudflarePurger,
+    "fake": FakeCDN,
+}
+
+_lock = threading.Lock()
+_backend = None
+_dispatcher = None
+
+
+def backend():
+    """Proveedor configurado en EDGE_CDN (una instancia por proceso), o None"""
+    global _backend
+    if not settings.EDGE_CDN:
+        return None
+    if settings.EDGE_CDN not in BACKENDS:
+        raise ImproperlyConfigured(f"EDGE_CDN desconocido: {settings.EDGE_CDN!r} (opciones: {', '.join(BACKENDS)})")
+    with _lock:
+        if _backend is None:
+            _backend = BACKENDS[settings.EDGE_CDN]()
+        return _backend
+
+
+# ============================================================================
+# PURGAS AGRUPADAS
+# ============================================================================
+
+
+class PurgeDispatcher:
+    """Etiquetas pendientes sin duplicados; un hilo las envía tras `delay` segundos"""
+
+    def __init__(self, purger, delay):
+        self.purger = purger
+        self.delay = delay
+        self.pending = set()
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def add(self, keys):
+        with self.condition:
+            self.pending.update(keys)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.worker, name="edge-purge", daemon=True)
+                self.thread.start()
+
+    def worker(self):
+        while True:
+            with self.condition:
+                # se agrupan las purgas que lleguen durante el retraso
+                self.condition.wait(self.delay)
+                if not self.pending:
+                    self.thread = None
+                    return
+            self.flush()
+
+    def flush(self):
+        """Enviar ya lo pendiente (tests, salida del proceso, serverless)"""
+        with self.condition:
+            keys, self.pending = sorted(self.pending), set()
+        size = self.purger.max_keys
+        for start in range(0, len(keys), size):
+            batch = keys[start : start + size]
+            try:
+                self.purger.purge(batch)
+            except (OSError, ValueError, RuntimeError):
+                # el CDN servirá la versión anterior hasta EDGE_CACHE_MAX_AGE
+                logger.exception("No se pudo purgar el CDN: %s", ", ".join(batch))
+                edge_purges.inc(len(batch), result="error")
+            else:
+                edge_purges.inc(len(batch), result="ok")
+
+
+def dispatcher():
+    global _dispatcher
+    purger = backend()
+    if purger is None:
+        return None
+    with _lock:
+        if _dispatcher is None:
+            _dispatcher = PurgeDispatcher(purger, settings.EDGE_PURGE_DELAY)
+        return _dispatcher
+
+
+def purge(*keys):
+    """Purgar etiquetas del CDN cuando la transacción actual haga commit"""
+    target = dispatcher()
+    if target is None or not keys:
+        return
+    transaction.on_commit(lambda: target.add(keys))
+
+
+def purge_games(game_ids, category_ids=()):
+    """Juegos cambiados: sus páginas, las de sus categorías y la portada"""
+    purge(HOME, *map(game_key, game_ids), *map(category_key, set(category_ids)))
+
+
+def flush():
+    if _dispatcher is not None:
+        _dispatcher.flush()
+
+
+atexit.register(flush)
+
+
+def reset_backend(**kwargs):
+    """Receptor de setting_changed: el proveedor se crea de nuevo"""
+    global _backend, _dispatcher
+    if kwargs.get("setting") not in (None, "EDGE_CDN", "EDGE_PURGE_DELAY", "CLOUDFLARE_ZONE_ID", "CLOUDFLARE_API_TOKEN"):
+        return
+    with _lock:
+        _backend = _dispatcher = None
+
+
+setting_changed.connect(reset_backend, dispatch_uid="games.edge.reset_backend")
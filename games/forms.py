@@ -6,3 +6,11 @@ class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
         fields = ['nickname', 'email', 'password', 'text']
+
+    def save(self, commit=True):
+        # el hash se calcula en el pool de games.credentials (puede lanzar HashingBusy)
+        comment = super().save(commit=False)
+        comment.set_password(self.cleaned_data['password'])
+        if commit:
+            comment.save()
+        return comment
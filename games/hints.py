@@ -0,0 +1,145 @@
+"""
+Preload/preconnect de los recursos críticos de cada página
+Cabeceras Link en la respuesta y 103 Early Hints opcional bajo ASGI.
+"""
+
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.template.loader import get_template
+from django.templatetags.static import static
+from django.urls import Resolver404, resolve
+
+from .metrics import register_lru_cache
+
+# Vistas que extienden games/base.html
+HINTED_VIEWS = {"home", "category_games", "game_detail"}
+
+BASE_TEMPLATE = "games/base.html"
+
+STYLESHEET_RE = re.compile(r"<link\b[^>]*\brel=[\"']stylesheet[\"'][^>]*>", re.IGNORECASE)
+HREF_RE = re.compile(r"\bhref=[\"']([^\"']+)[\"']")
+STATIC_TAG_RE = re.compile(r"\{%\s*static\s+[\"']([^\"']+)[\"']\s*%\}")
+
+# valores que no necesitan comillas en la cabecera Link
+TOKEN_RE = re.compile(r"^[\w.:/-]+$")
+
+# Google Fonts sirve el CSS desde un origen y los archivos desde otro
+FONT_ORIGINS = {"https://fonts.googleapis.com": "https://fonts.gstatic.com"}
+
+
+def link_header_value(url, rel, **params):
+    """Formatear una entrada de cabecera Link"""
+    value = f"<{url}>; rel={rel}"
+    for key, param in params.items():
+        key = key.replace("_", "")
+        if param is True:
+            value += f"; {key}"
+        elif TOKEN_RE.match(str(param)):
+            value += f"; {key}={param}"
+        else:
+            # imagesrcset/imagesizes llevan espacios y comas: van entre comillas
+            value += f'; {key}="{param}"'
+    return value
+
+
+@lru_cache(maxsize=None)
+def template_links():
+    """
+    Preconnect y preload derivados de las hojas de estilo de base.html.
+    Se calcula una vez por proceso.
+    """
+    source = get_template(BASE_TEMPLATE).template.source
+    stylesheets = []
+    for tag in STYLESHEET_RE.findall(source):
+        href = HREF_RE.search(tag)
+        if not href:
+            continue
+        url = href.group(1)
+        static_tag = STATIC_TAG_RE.search(url)
+        stylesheets.append(static(static_tag.group(1)) if static_tag else url)
+
+    links = []
+    for url in stylesheets:
+        parts = urlsplit(url)
+        if not (parts.scheme and parts.netloc):
+            continue
+        origin = f"{parts.scheme}://{parts.netloc}"
+        # las hojas de estilo se piden sin CORS; las fuentes siempre con CORS
+        preconnects = [link_header_value(origin, "preconnect")]
+        if origin in FONT_ORIGINS:
+            preconnects.append(link_header_value(FONT_ORIGINS[origin], "preconnect", crossorigin=True))
+        links += [link for link in preconnects if link not in links]
+
+    links += [link_header_value(url, "preload", as_="style") for url in stylesheets]
+    return tuple(links)
+
+
+register_lru_cache("template_links", template_links)
+
+
+def add_preload(request, url, as_, **params):
+    """Registrar un recurso crítico propio de la vista (ej: la portada)"""
+    if not hasattr(request, "preload_links"):
+        request.preload_links = []
+    request.preload_links.append(link_header_value(url, "preload", as_=as_, **params))
+
+
+def view_name(path):
+    try:
+        return resolve(path).url_name
+    except Resolver404:
+        return None
+
+
+class PreloadHintsMiddleware:
+    """Añade la cabecera Link con los recursos críticos a las páginas HTML"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        if (
+            match is None
+            or match.url_name not in HINTED_VIEWS
+            or response.status_code != 200
+            or not response.get("Content-Type", "").startswith("text/html")
+        ):
+            return response
+        links = list(template_links()) + getattr(request, "preload_links", [])
+        if links:
+            response["Link"] = ", ".join(links)
+        return response
+
+
+class EarlyHintsMiddleware:
+    """
+    Middleware ASGI que envía 103 Early Hints antes de ejecutar la vista,
+    solo si el servidor anuncia la extensión http.response.early_hint
+    (por ejemplo Hypercorn).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and settings.EARLY_HINTS
+            and "http.response.early_hint" in scope.get("extensions", {})
+            and scope["method"] in ("GET", "HEAD")
+            and view_name(scope["path"]) in HINTED_VIEWS
+        ):
+            links = template_links()
+            if links:
+                await send(
+                    {
+                        "type": "http.response.early_hint",
+                        "links": [link.encode("latin-1") for link in links],
+                    }
+                )
+        await self.app(scope, receive, send)
@@ -0,0 +1,111 @@
+"""
+Procesamiento de portadas al subirlas
+Dimensiones, placeholder borroso en base64, color dominante y miniatura
+para las grillas de juegos.
+
+Pillow se importa dentro de cada función: cover_tags importa este módulo y
+no debe cargar Pillow en el cold start (solo hace falta al subir portadas).
+"""
+
+import base64
+import io
+import posixpath
+
+from django.core.files.base import ContentFile
+
+# Ancho de la miniatura usada en home y categorías (tarjetas de ~400px)
+THUMBNAIL_WIDTH = 480
+THUMBNAIL_QUALITY = 80
+
+# Lado mayor del placeholder: ~300-600 bytes en base64
+PLACEHOLDER_SIZE = 16
+
+# Campos de Game que rellena process_cover
+DERIVED_FIELDS = ["cover_thumbnail", "cover_width", "cover_height", "cover_placeholder", "cover_color"]
+
+
+def cover_sources(game):
+    """
+    src y srcset de la portada: con miniatura, src es la miniatura y el
+    srcset ofrece ambas anchuras; sin ella, la original y srcset vacío.
+    """
+    cover = game.cover_image
+    if game.cover_thumbnail and game.cover_width:
+        thumb = game.cover_thumbnail.url
+        return thumb, f"{thumb} {THUMBNAIL_WIDTH}w, {cover.url} {game.cover_width}w"
+    return cover.url, ""
+
+
+def dominant_color(image):
+    """Color medio de la imagen en formato #rrggbb"""
+    from PIL import Image
+
+    red, green, blue = image.resize((1, 1), Image.BOX).getpixel((0, 0))
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def placeholder_data_uri(image):
+    """Imagen diminuta y desenfocada como data URI JPEG"""
+    from PIL import ImageFilter
+
+    small = image.copy()
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    small = small.filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    small.save(buffer, format="JPEG", quality=50, optimize=True)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def thumbnail_content(image):
+    """Miniatura JPEG de THUMBNAIL_WIDTH de ancho, o None si la original ya es pequeña"""
+    from PIL import Image
+
+    if image.width <= THUMBNAIL_WIDTH:
+        return None
+    height = round(image.height * THUMBNAIL_WIDTH / image.width)
+    thumb = image.resize((THUMBNAIL_WIDTH, height), Image.LANCZOS)
+    buffer = io.BytesIO()
+    thumb.save(buffer, format="JPEG", quality=THUMBNAIL_QUALITY, optimize=True, progressive=True)
+    return ContentFile(buffer.getvalue())
+
+
+def process_cover(game):
+    """
+    Rellenar los campos derivados de la portada de un juego.
+
+    No guarda el juego: se llama desde pre_save o desde process_covers.
+    """
+    from PIL import Image
+
+    if not game.cover_image:
+        game.cover_width = game.cover_height = None
+        game.cover_placeholder = game.cover_color = ""
+        game.cover_thumbnail = None
+        return
+
+    cover = game.cover_image
+    # Una subida sin guardar todavía la escribirá FileField.pre_save: solo rebobinar
+    committed = cover._committed
+    cover.open("rb")
+    try:
+        with Image.open(cover) as original:
+            if original.mode == "P":
+                # paletas con transparencia: pasar por RGBA evita el aviso de Pillow
+                original = original.convert("RGBA")
+            image = original.convert("RGB")
+    finally:
+        if committed:
+            cover.close()
+        else:
+            cover.seek(0)
+
+    game.cover_width, game.cover_height = image.size
+    game.cover_color = dominant_color(image)
+    game.cover_placeholder = placeholder_data_uri(image)
+
+    thumb = thumbnail_content(image)
+    if thumb is None:
+        game.cover_thumbnail = None
+    else:
+        name = posixpath.splitext(posixpath.basename(game.cover_image.name))[0] + ".jpg"
+        game.cover_thumbnail.save(name, thumb, save=False)
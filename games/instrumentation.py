@@ -0,0 +1,167 @@
+"""
+Instrumentación por petición
+Tiempo de base de datos y número de consultas, tiempo de render de la
+plantilla y tiempo total. Se exponen como cabecera Server-Timing, como una
+línea de log estructurada (logger games.perf) y en histogramas móviles de
+percentiles por nombre de URL.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth.decorators import user_passes_test
+from django.db import connections
+from django.http import JsonResponse
+
+from . import metrics
+
+logger = logging.getLogger("games.perf")
+
+# Muestras que conserva cada histograma (ventana móvil)
+WINDOW_SIZE = 1024
+
+PERCENTILES = (50, 95, 99)
+
+
+class RollingHistogram:
+    """Últimas WINDOW_SIZE muestras de una métrica, con percentiles bajo demanda"""
+
+    def __init__(self, size=WINDOW_SIZE):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        with self.lock:
+            self.samples.append(value)
+            self.count += 1
+
+    def percentiles(self, points=PERCENTILES):
+        with self.lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return {}
+        last = len(ordered) - 1
+        return {f"p{point}": ordered[round(last * point / 100)] for point in points}
+
+
+class TimingRegistry:
+    """Histogramas por (nombre de URL, métrica)"""
+
+    def __init__(self):
+        self.histograms = defaultdict(RollingHistogram)
+
+    def observe(self, view, timings):
+        for metric, value in timings.items():
+            self.histograms[(view, metric)].observe(value)
+
+    def snapshot(self):
+        result = defaultdict(dict)
+        for (view, metric), histogram in list(self.histograms.items()):
+            result[view][metric] = dict(histogram.percentiles(), count=histogram.count)
+        return dict(result)
+
+
+view_timings = TimingRegistry()
+
+
+class QueryTimer:
+    """execute_wrapper que acumula tiempo y número de consultas"""
+
+    def __init__(self):
+        self.duration = 0.0
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class ServerTimingMiddleware:
+    """
+    Debe ir primero en MIDDLEWARE para que total incluya al resto.
+
+    Métricas (ms): total, mw (fase de petición del middleware y resolución
+    de URL), view (vista y fase de respuesta), db y tpl (render).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        request._perf = {"view_start": None, "tpl": 0.0}
+        timer = QueryTimer()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(timer))
+            response = self.get_response(request)
+        end = time.perf_counter()
+
+        view_start = request._perf["view_start"] or end
+        timings = {
+            "total": (end - start) * 1000,
+            "mw": (view_start - start) * 1000,
+            "view": (end - view_start) * 1000,
+            "db": timer.duration * 1000,
+            "tpl": request._perf["tpl"] * 1000,
+        }
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else None
+
+        if view:
+            view_timings.observe(view, dict(timings, queries=timer.count))
+        metrics.observe_request(view, response.status_code, timings["total"] / 1000, timer.count)
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = ", ".join(
+                [
+                    f'db;dur={timings["db"]:.1f};desc="{timer.count} queries"',
+                    f'tpl;dur={timings["tpl"]:.1f};desc="template"',
+                    f'mw;dur={timings["mw"]:.1f};desc="middleware"',
+                    f'view;dur={timings["view"]:.1f};desc="view"',
+                    f'total;dur={timings["total"]:.1f}',
+                ]
+            )
+        logger.info(
+            json.dumps(
+                {
+                    "event": "request",
+                    "method": request.method,
+                    "path": request.path,
+                    "view": view,
+                    "status": response.status_code,
+                    "queries": timer.count,
+                    **{f"{metric}_ms": round(value, 2) for metric, value in timings.items()},
+                }
+            )
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._perf["view_start"] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # process_template_response es lo último antes de response.render()
+        render_start = time.perf_counter()
+
+        def render_done(rendered):
+            request._perf["tpl"] += time.perf_counter() - render_start
+
+        response.add_post_render_callback(render_done)
+        return response
+
+
+# user_passes_test en lugar de staff_member_required: no importar el admin al arrancar
+@user_passes_test(lambda user: user.is_active and user.is_staff, login_url="admin:login")
+def perf_snapshot(request):
+    """Percentiles de los histogramas de este proceso (solo staff)"""
+    return JsonResponse(view_timings.snapshot())
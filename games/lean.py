@@ -0,0 +1,87 @@
+"""
+Páginas públicas sin sesión, cookies ni Vary: Cookie
+Las vistas del catálogo (home, category_games, game_detail) son iguales
+para todos los visitantes. En GET/HEAD los middlewares de sesión,
+autenticación, mensajes y CSRF de este módulo no hacen nada: no se lee la
+sesión, no se crea el usuario, no se envía Set-Cookie ni Vary: Cookie, y la
+respuesta lleva Cache-Control: public para que un CDN o proxy pueda
+guardarla (PUBLIC_CACHE_MAX_AGE).
+
+El formulario de comentarios no lleva el token CSRF en el HTML: un script
+lo pide a /csrf-token/ (no cacheable) al enviarlo. Los POST, el admin y el
+resto de URLs pasan por el perfil completo. LEAN_PUBLIC_PAGES=False
+desactiva todo y los middlewares se comportan como los de Django.
+"""
+
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import csrf
+from django.utils.cache import patch_cache_control
+
+from .hints import view_name
+from .profiling import PROFILE_PARAM
+
+PUBLIC_VIEWS = {"home", "category_games", "game_detail"}
+SAFE_METHODS = ("GET", "HEAD")
+
+
+def is_public(request):
+    """Petición anónima a una página del catálogo (se calcula una vez por petición)"""
+    public = getattr(request, "_public_page", None)
+    if public is None:
+        public = request._public_page = (
+            settings.LEAN_PUBLIC_PAGES
+            and request.method in SAFE_METHODS
+            # ?_profile=1 necesita request.user para comprobar que es staff
+            and PROFILE_PARAM not in request.GET
+            and view_name(request.path_info) in PUBLIC_VIEWS
+        )
+    return public
+
+
+class SkipOnPublicMixin:
+    def __call__(self, request):
+        if is_public(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(SkipOnPublicMixin, sessions.SessionMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(SkipOnPublicMixin, csrf.CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # GET/HEAD no se validan; sin process_request no hay cookie que leer
+        if is_public(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(SkipOnPublicMixin, auth.AuthenticationMiddleware):
+    pass
+
+
+class MessageMiddleware(SkipOnPublicMixin, messages.MessageMiddleware):
+    pass
+
+
+class PublicCacheMiddleware:
+    """Cache-Control: public en las páginas públicas que respondieron 200"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            settings.PUBLIC_CACHE_MAX_AGE
+            and is_public(request)
+            and response.status_code == 200
+            and not response.has_header("Cache-Control")
+            and not response.cookies
+        ):
+            patch_cache_control(response, public=True, max_age=settings.PUBLIC_CACHE_MAX_AGE)
+        return response
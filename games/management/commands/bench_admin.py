@@ -0,0 +1,68 @@
+"""
+Benchmark del changelist del admin
+Carga las listas de juegos y comentarios (con y sin búsqueda) con el modo
+rendimiento desactivado y activado, y muestra la mediana en ms y las
+consultas SQL de cada una. Usa los datos actuales (seed_data para generar
+un catálogo grande); el superusuario temporal se crea en una transacción
+que se deshace al terminar.
+
+Uso:
+    python manage.py seed_data --games 20000 --comments 5
+    python manage.py bench_admin --runs 5
+"""
+
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from games.models import Comment, Game
+
+PAGES = (
+    ("juegos", "/admin/games/game/"),
+    ("juegos ?q=", "/admin/games/game/?q=doom"),
+    ("juegos ?category", "/admin/games/game/?category__id__exact=1"),
+    ("comentarios", "/admin/games/comment/"),
+    ("comentarios ?q=", "/admin/games/comment/?q=bot@example.com"),
+)
+
+
+class Command(BaseCommand):
+    help = "Mide el tiempo de carga del changelist del admin con y sin ADMIN_PERFORMANCE_MODE"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Cargas por página y modo")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"🗂️  Changelist del admin ({Game.objects.count()} juegos, {Comment.objects.count()} comentarios; "
+            f"mediana de {options['runs']})"
+        )
+        self.stdout.write(f"   {'Página':<20}{'normal ms':>11}{'consultas':>11}{'rápido ms':>11}{'consultas':>11}")
+        with transaction.atomic():
+            user = get_user_model().objects.create_superuser("bench-admin", "bench@example.com", None)
+            client = Client(HTTP_HOST="localhost")
+            client.force_login(user)
+            for label, url in PAGES:
+                row = []
+                for mode in (False, True):
+                    with override_settings(ADMIN_PERFORMANCE_MODE=mode):
+                        row += self.measure(client, url, options["runs"])
+                self.stdout.write(f"   {label:<20}{row[0]:>11.1f}{row[1]:>11}{row[2]:>11.1f}{row[3]:>11}")
+            transaction.set_rollback(True)
+
+    def measure(self, client, url, runs):
+        client.get(url)  # plantillas y caches en caliente
+        samples = []
+        for _ in range(runs):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = client.get(url)
+                samples.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                self.stderr.write(f"⚠️  {url} respondió {response.status_code}")
+        return [statistics.median(samples), len(queries)]
@@ -0,0 +1,109 @@
+"""
+Benchmark de cold start
+Lanza procesos Python nuevos que importan davegames_project.wsgi y sirven una
+primera petición, con FAST_START desactivado y activado. Con --importtime
+muestra además el informe de python -X importtime agrupado por paquete.
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Se ejecuta en un intérprete nuevo: nada importado de antemano
+COLD_START_SCRIPT = """
+import io, json, os, time
+start = time.perf_counter()
+from davegames_project.wsgi import application
+loaded = time.perf_counter()
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": os.environ["COLDSTART_PATH"], "QUERY_STRING": "",
+    "SERVER_NAME": "localhost", "SERVER_PORT": "80", "HTTP_HOST": "localhost",
+    "SERVER_PROTOCOL": "HTTP/1.1", "wsgi.input": io.BytesIO(), "wsgi.errors": io.StringIO(),
+    "wsgi.url_scheme": "http", "wsgi.version": (1, 0), "wsgi.multithread": False,
+    "wsgi.multiprocess": True, "wsgi.run_once": False,
+}
+status = []
+body = b"".join(application(environ, lambda s, h, exc_info=None: status.append(s)))
+done = time.perf_counter()
+print(json.dumps({"import_ms": (loaded - start) * 1000, "response_ms": (done - loaded) * 1000,
+                  "status": status[0], "bytes": len(body)}))
+"""
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+class Command(BaseCommand):
+    help = "Mide el cold start (import + primera respuesta) con y sin FAST_START"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Procesos por modo")
+        parser.add_argument("--path", default="/", help="URL de la primera petición")
+        parser.add_argument("--importtime", action="store_true", help="Informe de -X importtime")
+        parser.add_argument("--top", type=int, default=15, help="Paquetes a mostrar en el informe")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"🧊 Cold start de {options['path']} (mediana de {options['runs']} procesos)")
+        self.stdout.write(f"{'Modo':<16}{'Proceso':>12}{'Import':>12}{'1ª respuesta':>15}")
+        for fast_start in (False, True):
+            samples = [self.measure(options["path"], fast_start) for _ in range(options["runs"])]
+            wall, imported, response = (statistics.median(column) for column in zip(*samples))
+            mode = "FAST_START" if fast_start else "normal"
+            self.stdout.write(f"{mode:<16}{wall:>9.1f} ms{imported:>9.1f} ms{response:>12.1f} ms")
+
+        if options["importtime"]:
+            for fast_start in (False, True):
+                self.report_importtime(options["path"], fast_start, options["top"])
+
+    def env(self, path, fast_start):
+        env = dict(os.environ, COLDSTART_PATH=path, FAST_START=str(fast_start), PYTHONPATH=str(settings.BASE_DIR))
+        env.setdefault("DJANGO_SETTINGS_MODULE", "davegames_project.settings")
+        return env
+
+    def measure(self, path, fast_start):
+        """Devuelve (ms del proceso completo, ms de import, ms de la primera respuesta)"""
+        wall, data, _ = self.spawn(path, fast_start)
+        return wall, data["import_ms"], data["response_ms"]
+
+    def spawn(self, path, fast_start, *flags):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, *flags, "-c", COLD_START_SCRIPT],
+            env=self.env(path, fast_start),
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        wall = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            raise CommandError(f"El proceso falló:\n{result.stderr[-2000:]}")
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        if not data["status"].startswith("200"):
+            raise CommandError(f"Respuesta inesperada: {data['status']}")
+        return wall, data, result.stderr
+
+    def report_importtime(self, path, fast_start, top):
+        _, _, stderr = self.spawn(path, fast_start, "-X", "importtime")
+        by_package = defaultdict(int)
+        total = 0
+        for line in stderr.splitlines():
+            match = IMPORTTIME_RE.match(line)
+            if not match:
+                continue
+            self_us, cumulative_us, indent, module = match.groups()
+            by_package[module.split(".")[0]] += int(self_us)
+            if len(indent) == 1:
+                total += int(cumulative_us)
+
+        mode = "FAST_START" if fast_start else "normal"
+        self.stdout.write("")
+        self.stdout.write(f"📦 Import por paquete ({mode}, total {total / 1000:.1f} ms)")
+        for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+            self.stdout.write(f"   {package:<28}{self_us / 1000:>9.1f} ms")
@@ -0,0 +1,79 @@
+"""
+Benchmark del hashing de contraseñas de comentarios
+Mide ms por hash de cada algoritmo y coste, y la latencia p50/p95 con C
+hilos concurrentes hashing a través del pool acotado de games.credentials
+frente a hacerlo en línea en cada hilo. Para la latencia del POST completo:
+    python manage.py loadtest --scenario comment --concurrency 8
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand
+
+from games import credentials
+from games.benchmark import percentile
+
+COSTS = (
+    ("pbkdf2_sha256", "iterations", (100_000, 300_000, 600_000, 1_000_000)),
+    ("scrypt", "work_factor", (2**13, 2**14, 2**15)),
+    ("argon2", "time_cost", (1, 2, 3)),
+)
+
+
+class Command(BaseCommand):
+    help = "Mide el coste de cada hasher y la latencia de hashing bajo concurrencia"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Hashes por algoritmo y coste")
+        parser.add_argument("--concurrency", type=int, default=8, help="Hilos simultáneos")
+        parser.add_argument("--requests", type=int, default=40, help="Hashes totales en la prueba concurrente")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"🔐 ms por hash (mediana de {options['runs']})")
+        for algorithm, param, values in COSTS:
+            for value in values:
+                try:
+                    hasher = credentials.get_hasher(algorithm, **{param: value})
+                except ImproperlyConfigured as exc:
+                    self.stdout.write(self.style.WARNING(f"   {algorithm:<15}omitido: {exc}"))
+                    break
+                samples = sorted(self.timed(hasher.encode, "benchmark", hasher.salt()) for _ in range(options["runs"]))
+                self.stdout.write(f"   {algorithm:<15}{param}={value:<10}{percentile(samples, 50):>9.1f} ms")
+
+        hasher = credentials.get_hasher()
+        self.stdout.write("")
+        self.stdout.write(
+            f"⚡ {options['requests']} hashes con {options['concurrency']} hilos "
+            f"({settings.COMMENT_PASSWORD_HASHER}, COMMENT_HASH_WORKERS={settings.COMMENT_HASH_WORKERS})"
+        )
+        self.stdout.write(f"   {'Modo':<12}{'p50 ms':>10}{'p95 ms':>10}{'hash/s':>10}{'ocupado':>9}")
+        for label, call in (("en línea", lambda: hasher.encode("benchmark", hasher.salt())), ("pool", lambda: credentials.make("benchmark"))):
+            self.concurrent(label, call, options)
+
+    def timed(self, func, *args):
+        start = time.perf_counter()
+        func(*args)
+        return (time.perf_counter() - start) * 1000
+
+    def concurrent(self, label, call, options):
+        def step(_):
+            start = time.perf_counter()
+            try:
+                call()
+            except credentials.HashingBusy:
+                return None
+            return (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            samples = list(pool.map(step, range(options["requests"])))
+        elapsed = time.perf_counter() - start
+        latencies = sorted(sample for sample in samples if sample is not None)
+        busy = len(samples) - len(latencies)
+        self.stdout.write(
+            f"   {label:<12}{percentile(latencies, 50):>10.1f}{percentile(latencies, 95):>10.1f}"
+            f"{len(latencies) / elapsed:>10.1f}{busy:>9}"
+        )
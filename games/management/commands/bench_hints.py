@@ -0,0 +1,77 @@
+"""
+Benchmark local de tiempo hasta el primer recurso
+Ejecuta la aplicación ASGI en proceso y mide cuándo el navegador podría
+empezar a pedir el primer recurso crítico: con 103 Early Hints, con la
+cabecera Link o parseando el HTML.
+"""
+
+import asyncio
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from games.models import Category, Game
+
+
+class Command(BaseCommand):
+    help = "Mide el tiempo hasta el primer recurso con Early Hints, Link y solo HTML"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Peticiones por página")
+
+    def handle(self, *args, **options):
+        from davegames_project.asgi import application
+
+        paths = [reverse("home")]
+        category = Category.objects.first()
+        if category:
+            paths.append(reverse("category_games", args=[category.id]))
+        game = Game.objects.first()
+        if game:
+            paths.append(reverse("game_detail", args=[game.id]))
+
+        self.stdout.write(f"⏱️  Tiempo hasta el primer recurso (mediana de {options['requests']} peticiones)")
+        self.stdout.write(f"{'Página':<24}{'103 Early Hints':>18}{'Cabecera Link':>16}{'Solo HTML':>14}")
+        for path in paths:
+            samples = [asyncio.run(self.measure(application, path)) for _ in range(options["requests"])]
+            hint, link, html = (statistics.median(column) for column in zip(*samples))
+            self.stdout.write(f"{path:<24}{hint:>15.2f} ms{link:>13.2f} ms{html:>11.2f} ms")
+
+    async def measure(self, application, path):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"localhost")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("localhost", 80),
+            "extensions": {"http.response.early_hint": {}},
+        }
+        marks = {}
+        start = time.perf_counter()
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            elapsed = (time.perf_counter() - start) * 1000
+            if message["type"] == "http.response.early_hint":
+                marks.setdefault("hint", elapsed)
+            elif message["type"] == "http.response.start":
+                has_link = any(name.lower() == b"link" for name, _ in message["headers"])
+                marks.setdefault("link", elapsed if has_link else None)
+            elif message["type"] == "http.response.body":
+                marks.setdefault("html", elapsed)
+
+        await application(scope, receive, send)
+        # sin hint o sin Link el primer recurso solo se descubre al parsear el HTML
+        html = marks["html"]
+        return marks.get("hint") or html, marks.get("link") or html, html
@@ -0,0 +1,60 @@
+"""
+Benchmark de throughput para servir media
+Compara games.media.serve_media con django.views.static.serve
+"""
+
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from django.views.static import serve
+
+from games.media import serve_media
+
+
+class Command(BaseCommand):
+    help = "Mide el throughput de serve_media frente a django.views.static.serve"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size-kb", type=int, default=512, help="Tamaño del archivo de prueba")
+        parser.add_argument("--requests", type=int, default=500, help="Peticiones por escenario")
+
+    def handle(self, *args, **options):
+        size = options["size_kb"] * 1024
+        total = options["requests"]
+        factory = RequestFactory()
+
+        with tempfile.TemporaryDirectory() as media_root:
+            name = "0123456789abcdef0123.jpg"
+            with open(os.path.join(media_root, name), "wb") as fh:
+                fh.write(os.urandom(size))
+
+            with override_settings(MEDIA_ROOT=media_root, MEDIA_ACCEL_REDIRECT=""):
+                etag = serve_media(factory.get("/media/" + name), name)["ETag"]
+                scenarios = [
+                    ("static.serve completo", lambda r: serve(r, name, document_root=media_root), {}),
+                    ("serve_media completo", lambda r: serve_media(r, name), {}),
+                    ("serve_media Range 64KB", lambda r: serve_media(r, name), {"HTTP_RANGE": "bytes=0-65535"}),
+                    ("serve_media If-None-Match", lambda r: serve_media(r, name), {"HTTP_IF_NONE_MATCH": etag}),
+                ]
+
+                self.stdout.write(f"📦 Archivo de prueba: {size // 1024} KB, {total} peticiones por escenario")
+                self.stdout.write("=" * 72)
+                for label, view, headers in scenarios:
+                    sent = 0
+                    start = time.perf_counter()
+                    for _ in range(total):
+                        response = view(factory.get("/media/" + name, **headers))
+                        if response.streaming:
+                            sent += sum(len(chunk) for chunk in response.streaming_content)
+                        else:
+                            sent += len(response.content)
+                        response.close()
+                    elapsed = time.perf_counter() - start
+                    self.stdout.write(
+                        f"{label:<28} {total / elapsed:>9.0f} req/s "
+                        f"{sent / elapsed / 1024 / 1024:>9.1f} MB/s "
+                        f"{elapsed / total * 1e6:>9.0f} µs/req"
+                    )
@@ -0,0 +1,45 @@
+"""
+Benchmark del limitador de comentarios
+Mide el coste por llamada a games.ratelimit.take() en cada backend de cache
+(LocMemCache como referencia y la cache "ratelimit" configurada), con
+claves distintas (caso normal) y con una misma clave ya agotada (un bot).
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from games import ratelimit
+from games.benchmark import percentile
+
+
+class Command(BaseCommand):
+    help = "Mide los microsegundos que añade el limitador de comentarios por petición"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=2000, help="Llamadas por caso")
+
+    def handle(self, *args, **options):
+        backends = (
+            ("locmem", LocMemCache("bench-ratelimit", {})),
+            (settings.CACHES["ratelimit"]["BACKEND"].rsplit(".", 1)[-1], caches["ratelimit"]),
+        )
+        self.stdout.write(f"🚦 take() por llamada ({options['iterations']} iteraciones)")
+        self.stdout.write(f"   {'Backend':<16}{'Caso':<14}{'p50 µs':>10}{'p95 µs':>10}{'media µs':>10}")
+        for label, cache in backends:
+            for case, ident in (("claves nuevas", None), ("clave agotada", "bot")):
+                samples = []
+                for index in range(options["iterations"]):
+                    start = time.perf_counter()
+                    ratelimit.take("bench", ident or f"198.51.100.{index}", 1.0, 5, cache=cache)
+                    samples.append((time.perf_counter() - start) * 1_000_000)
+                samples.sort()
+                self.stdout.write(
+                    f"   {label:<16}{case:<14}{percentile(samples, 50):>10.1f}{percentile(samples, 95):>10.1f}"
+                    f"{sum(samples) / len(samples):>10.1f}"
+                )
+            cache.clear()
+        self.stdout.write("💡 Con DatabaseCache el coste lo marca el commit; para microsegundos usa Redis (RATELIMIT_CACHE_BACKEND)")
@@ -0,0 +1,70 @@
+"""
+Benchmark de arranque de settings
+Mide en procesos nuevos cuánto tarda en importarse el módulo de settings de
+cada proveedor, y en este proceso la resolución en frío frente a la cacheada
+de davegames_project.settings_loader.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from davegames_project import settings_loader
+
+# Django ya está importado cuando se cargan los settings: solo se mide el módulo
+IMPORT_SCRIPT = """
+import importlib, os, time
+import django.conf, django.core.exceptions
+start = time.perf_counter()
+importlib.import_module(os.environ["BENCH_SETTINGS_MODULE"])
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+class Command(BaseCommand):
+    help = "Mide el tiempo de importar y resolver los settings por proveedor"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=10, help="Procesos por módulo")
+        parser.add_argument("--iterations", type=int, default=1000, help="Resoluciones cacheadas a medir")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"⚙️  Import del módulo de settings (mediana de {options['runs']} procesos)")
+        modules = (
+            ("davegames_project.settings", {}),
+            ("davegames_project.settings", {"DEPLOY_PROVIDER": "heroku"}),
+            ("davegames_project.settings", {"DEPLOY_PROVIDER": "vercel"}),
+        )
+        for module, extra in modules:
+            samples = [self.import_ms(module, extra) for _ in range(options["runs"])]
+            label = module + (f" ({extra['DEPLOY_PROVIDER']})" if extra else "")
+            self.stdout.write(f"   {label:<45}{statistics.median(samples):>8.2f} ms")
+
+        environ = settings_loader.read_environ()
+        self.stdout.write("")
+        self.stdout.write("🧊 resolve() en frío frente a cacheado")
+        for provider in settings_loader.PROFILES:
+            settings_loader.resolve.cache_clear()
+            start = time.perf_counter()
+            settings_loader.resolve(provider, environ)
+            cold = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            for _ in range(options["iterations"]):
+                settings_loader.resolve(provider, environ)
+            cached = (time.perf_counter() - start) * 1_000_000 / options["iterations"]
+            self.stdout.write(f"   {provider:<15}{cold:>8.2f} ms en frío{cached:>9.2f} µs cacheado")
+        settings_loader.resolve.cache_clear()
+
+    def import_ms(self, module, extra):
+        env = dict(os.environ, BENCH_SETTINGS_MODULE=module, PYTHONPATH=str(settings.BASE_DIR), **extra)
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT], env=env, cwd=settings.BASE_DIR, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise CommandError(f"No se pudo importar {module}:\n{result.stderr[-2000:]}")
+        return float(result.stdout.strip().splitlines()[-1])
@@ -0,0 +1,63 @@
+"""
+Benchmark del build de estáticos
+Mide en procesos nuevos, sobre un STATIC_ROOT temporal, el build anterior
+(collectstatic --clear en serie y copia a staticfiles_build) frente a
+build_static en frío (directorio vacío) y en caliente (sin cambios).
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Compara el tiempo de build de estáticos: collectstatic vs build_static en frío y en caliente"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3, help="Repeticiones por modo")
+        parser.add_argument("--workers", type=int, default=0, help="Procesos de compresión (0 = uno por núcleo)")
+
+    def handle(self, *args, **options):
+        runs, workers = options["runs"], options["workers"]
+        self.stdout.write(f"📁 Build de estáticos (mediana de {runs} ejecuciones, {workers or os.cpu_count()} procesos)")
+        rows = {"collectstatic --clear + cp": [], "build_static en frío": [], "build_static en caliente": []}
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory() as tmp:
+                root, build = Path(tmp) / "staticfiles", Path(tmp) / "staticfiles_build"
+                rows["collectstatic --clear + cp"].append(self.legacy(root, build))
+            with tempfile.TemporaryDirectory() as tmp:
+                root = Path(tmp) / "staticfiles_build"
+                rows["build_static en frío"].append(self.run(root, workers, "build_static"))
+                rows["build_static en caliente"].append(self.run(root, workers, "build_static"))
+
+        for mode, samples in rows.items():
+            self.stdout.write(f"   {mode:<30}{statistics.median(samples):>9.0f} ms")
+
+    def run(self, root, workers, command, *args):
+        env = dict(os.environ, STATIC_ROOT=str(root), STATIC_BUILD_WORKERS=str(workers))
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "manage.py", command, "--noinput", *args],
+            env=env,
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"{command} falló:\n{result.stderr[-2000:]}")
+        return (time.perf_counter() - start) * 1000
+
+    def legacy(self, root, build):
+        """Build anterior: todo en serie y una segunda copia del árbol"""
+        start = time.perf_counter()
+        self.run(root, 1, "collectstatic", "--clear")
+        shutil.copytree(root, build)
+        return (time.perf_counter() - start) * 1000
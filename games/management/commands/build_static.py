@@ -0,0 +1,60 @@
+"""
+collectstatic incremental
+Copia solo los estáticos cuyo contenido cambió (sha256 frente al build
+anterior) y comprime en paralelo con ParallelCompressedManifestStorage.
+Pensado para build_files.sh con STATIC_ROOT=staticfiles_build.
+"""
+
+import time
+
+from django.contrib.staticfiles.management.commands.collectstatic import Command as CollectStaticCommand
+
+from games.staticbuild import BuildCache, ParallelCompressedManifestStorage, file_digest
+
+
+class Command(CollectStaticCommand):
+    help = "collectstatic incremental (por contenido) con compresión en paralelo"
+
+    def set_options(self, **options):
+        super().set_options(**options)
+        self.build_cache = BuildCache(self.storage.location)
+        self.source_digests = {}
+
+    def delete_file(self, path, prefixed_path, source_storage):
+        """Saltar la copia si el origen tiene el mismo contenido que en el build anterior"""
+        with source_storage.open(path) as handle:
+            digest = file_digest(handle)
+        self.source_digests[prefixed_path] = digest
+        if self.storage.exists(prefixed_path):
+            if self.build_cache.sources.get(prefixed_path) == digest and not self.symlink:
+                if prefixed_path not in self.unmodified_files:
+                    self.unmodified_files.append(prefixed_path)
+                self.log(f"Skipping '{path}' (contenido sin cambios)")
+                return False
+            if not self.dry_run:
+                self.log(f"Deleting '{path}'")
+                self.storage.delete(prefixed_path)
+        return True
+
+    def collect(self):
+        if isinstance(self.storage, ParallelCompressedManifestStorage):
+            self.storage.build_cache = self.build_cache
+        start = time.perf_counter()
+        collected = super().collect()
+        self.elapsed = time.perf_counter() - start
+        if not self.dry_run:
+            # --clear vacía STATIC_ROOT: solo cuenta lo que existe tras este build
+            self.build_cache.sources = self.source_digests
+            self.build_cache.save()
+        return collected
+
+    def handle(self, **options):
+        summary = super().handle(**options)
+        stats = getattr(self.storage, "compress_stats", None) or {}
+        if self.verbosity >= 1 and not self.dry_run:
+            self.stdout.write(
+                f"⏱️  Build de estáticos en {self.elapsed:.2f}s: {len(self.copied_files)} copiados, "
+                f"{len(self.unmodified_files)} sin cambios, {stats.get('compressed', 0)} comprimidos "
+                f"({stats.get('workers', 0)} procesos), {stats.get('reused', 0)} compresiones reutilizadas"
+            )
+        return summary
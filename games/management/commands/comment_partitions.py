@@ -0,0 +1,58 @@
+"""
+Mantenimiento de las particiones mensuales de comentarios (PostgreSQL)
+Crea las particiones de los próximos meses y archiva las antiguas: DETACH,
+volcado a COMMENT_ARCHIVE_DIR/games_comment_pAAAA_MM.csv.gz y DROP. Pensado
+para cron (una vez al día basta). En SQLite no hace nada.
+
+Uso:
+    python manage.py comment_partitions
+    python manage.py comment_partitions --archive-after 12 --dry-run
+    python manage.py comment_partitions --archive-after 12 --detach-only
+"""
+
+from django.core.management.base import BaseCommand
+
+from games import partitions
+
+
+class Command(BaseCommand):
+    help = "Crea las particiones futuras de comentarios y archiva las antiguas"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, help="Meses a crear por adelantado (COMMENT_PARTITION_AHEAD)")
+        parser.add_argument(
+            "--archive-after", type=int, help="Archivar meses más antiguos que estos (COMMENT_ARCHIVE_AFTER_MONTHS)"
+        )
+        parser.add_argument("--archive-dir", help="Directorio de los .csv.gz (COMMENT_ARCHIVE_DIR)")
+        parser.add_argument("--detach-only", action="store_true", help="Solo desadjuntar, sin volcar ni borrar")
+        parser.add_argument("--dry-run", action="store_true", help="Mostrar qué se haría sin tocar nada")
+
+    def handle(self, *args, **options):
+        if not partitions.is_partitioned():
+            self.stdout.write("ℹ️  games_comment no está particionada (solo PostgreSQL, migración 0012): nada que hacer")
+            return
+
+        attached = partitions.attached_partitions()
+        self.stdout.write(
+            f"🗄️  {len(attached)} particiones mensuales"
+            + (f" ({attached[0]:%Y-%m} → {attached[-1]:%Y-%m})" if attached else "")
+        )
+        if options["dry_run"]:
+            self.stdout.write("   (simulación: no se modifica nada)")
+            created = [partitions.partition_name(month) for month in partitions.missing_partitions(options["ahead"])]
+        else:
+            created = partitions.ensure_partitions(options["ahead"])
+        for name in created:
+            self.stdout.write(f"   ➕ {name}")
+
+        for month in partitions.archivable(options["archive_after"]):
+            name = partitions.partition_name(month)
+            if options["dry_run"]:
+                self.stdout.write(f"   📦 {name} (se archivaría)")
+                continue
+            path, rows = partitions.archive_partition(month, options["archive_dir"], options["detach_only"])
+            if path:
+                self.stdout.write(f"   📦 {name}: {rows} comentarios → {path}")
+            else:
+                self.stdout.write(f"   ⏏️  {name}: desadjuntada (la tabla se conserva)")
+        self.stdout.write(self.style.SUCCESS("✅ Particiones al día"))
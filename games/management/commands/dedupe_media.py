@@ -0,0 +1,120 @@
+"""
+Deduplicar el directorio de media existente
+Agrupa los archivos por SHA-256, conserva una copia con nombre direccionado
+por contenido, actualiza las filas de Game y recalcula las referencias.
+Cada archivo conserva su directorio de subida: las miniaturas de
+covers/thumbs/ siguen ahí y se actualiza cover_thumbnail.
+"""
+
+import os
+import posixpath
+import re
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from games.models import Game, MediaBlob
+from games.storage import file_digest, hashed_name
+
+# Campos de Game que referencian archivos de media
+MEDIA_FIELDS = ("cover_image", "cover_thumbnail")
+
+# Directorio de reparto por hash, ej: covers/ab/ab12....jpg
+SHARD_RE = re.compile(r"^[0-9a-f]{2}$")
+
+
+def upload_dir(name):
+    """Directorio de subida de un archivo, sin el reparto por hash"""
+    dirname = posixpath.dirname(name)
+    if SHARD_RE.match(posixpath.basename(dirname)) and posixpath.basename(name).startswith(posixpath.basename(dirname)):
+        return posixpath.dirname(dirname)
+    return dirname
+
+
+def referenced_by(names):
+    """Filas de Game que apuntan a alguno de los nombres, por campo"""
+    return {field: Game.objects.filter(**{f"{field}__in": names}) for field in MEDIA_FIELDS}
+
+
+class Command(BaseCommand):
+    help = "Deduplica las portadas de MEDIA_ROOT y reporta los bytes recuperados"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subdir", default="covers", help="Subdirectorio de MEDIA_ROOT a revisar")
+        parser.add_argument("--dry-run", action="store_true", help="Solo reportar, sin modificar nada")
+
+    def handle(self, *args, **options):
+        subdir = options["subdir"].strip("/")
+        dry_run = options["dry_run"]
+        root = os.path.join(settings.MEDIA_ROOT, subdir)
+
+        groups = defaultdict(list)
+        scanned = 0
+        for dirpath, _, filenames in os.walk(root):
+            for filename in sorted(filenames):
+                fullpath = os.path.join(dirpath, filename)
+                name = os.path.relpath(fullpath, settings.MEDIA_ROOT).replace(os.sep, "/")
+                with open(fullpath, "rb") as fh:
+                    groups[upload_dir(name), file_digest(fh)].append(name)
+                scanned += 1
+
+        reclaimed = duplicates = moved = games_updated = 0
+        moves, removals = [], []
+        with transaction.atomic():
+            for (directory, digest), names in groups.items():
+                canonical = hashed_name(f"{directory}/{posixpath.basename(names[0])}", digest)
+                size = os.path.getsize(os.path.join(settings.MEDIA_ROOT, names[0]))
+                extra = [name for name in names if name != canonical]
+                if canonical not in names:
+                    # La primera copia pasa a ser la canónica
+                    extra = names[1:]
+                    moved += 1
+                    moves.append((names[0], canonical))
+                duplicates += len(extra)
+                reclaimed += size * len(extra)
+
+                if dry_run:
+                    continue
+                removals.extend(extra)
+                stale = [name for name in names if name != canonical]
+                if stale:
+                    for field, games in referenced_by(stale).items():
+                        games_updated += games.update(**{field: canonical})
+                refs = sum(games.count() for games in referenced_by([canonical]).values())
+                MediaBlob.objects.filter(name__in=stale).delete()
+                MediaBlob.objects.update_or_create(
+                    name=canonical,
+                    defaults={"sha256": digest, "size": size, "ref_count": refs},
+                )
+
+        # Tocar el disco solo cuando la base de datos ya apunta a los nombres nuevos
+        if not dry_run:
+            for name, target in moves:
+                self._move(name, target)
+            for name in removals:
+                os.remove(os.path.join(settings.MEDIA_ROOT, name))
+
+        orphans = MediaBlob.objects.filter(name__startswith=subdir + "/")
+        for field in MEDIA_FIELDS:
+            orphans = orphans.exclude(name__in=Game.objects.values(field))
+        orphans = orphans.count()
+        referenced = Game.objects.exclude(cover_image="").aggregate(n=Count("cover_image", distinct=True))["n"]
+
+        prefix = "🔍 [dry-run] " if dry_run else "✅ "
+        self.stdout.write(f"{prefix}Archivos revisados: {scanned}")
+        self.stdout.write(f"   - Contenidos distintos: {len(groups)}")
+        self.stdout.write(f"   - Copias duplicadas eliminadas: {duplicates}")
+        self.stdout.write(f"   - Archivos renombrados por hash: {moved}")
+        self.stdout.write(f"   - Juegos actualizados: {games_updated}")
+        self.stdout.write(f"   - Portadas referenciadas: {referenced}")
+        self.stdout.write(f"   - Blobs sin referencias: {orphans}")
+        self.stdout.write(f"💾 Bytes recuperados: {reclaimed} ({reclaimed / 1024:.1f} KB)")
+
+    def _move(self, name, target):
+        source = os.path.join(settings.MEDIA_ROOT, name)
+        destination = os.path.join(settings.MEDIA_ROOT, target)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        os.replace(source, destination)
@@ -0,0 +1,85 @@
+"""
+Prueba de carga contra un servidor local
+Ejecuta los escenarios (portada, categoría, detalle, comentario) con N
+peticiones y C hilos concurrentes y reporta req/s, p50/p95/p99 y consultas
+por petición. Compara con benchmarks/baseline.json para detectar regresiones.
+
+Uso:
+    python manage.py seed_data --games 500 --comments 20
+    python manage.py runserver --noreload  (o gunicorn) en otra terminal
+    python manage.py loadtest --save-baseline
+    python manage.py loadtest              (falla si hay regresiones)
+"""
+
+import platform
+
+from django.core.management.base import BaseCommand, CommandError
+
+from games import benchmark
+from games.models import Category, Game
+
+
+class Command(BaseCommand):
+    help = "Mide req/s, percentiles de latencia y consultas por petición del sitio"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="URL del servidor")
+        parser.add_argument(
+            "--scenario", action="append", choices=benchmark.SCENARIOS,
+            help="Escenario a ejecutar (repetible; por defecto todos)",
+        )
+        parser.add_argument("--requests", type=int, default=200, help="Peticiones por escenario")
+        parser.add_argument("--concurrency", type=int, default=4, help="Hilos concurrentes")
+        parser.add_argument("--warmup", type=int, default=10, help="Peticiones de calentamiento")
+        parser.add_argument("--seed", type=int, default=0, help="Semilla de la selección de páginas")
+        parser.add_argument("--baseline", default=str(benchmark.BASELINE_PATH), help="Archivo de línea base")
+        parser.add_argument("--save-baseline", action="store_true", help="Guardar el resultado como línea base")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.15, help="Regresión relativa permitida (0.15 = 15%%)"
+        )
+
+    def handle(self, *args, **options):
+        # el servidor debe usar la misma base de datos que este comando
+        category_ids = list(Category.objects.values_list("id", flat=True))
+        game_ids = list(Game.objects.values_list("id", flat=True))
+        if not category_ids or not game_ids:
+            raise CommandError("No hay datos: ejecutar antes python manage.py seed_data")
+
+        scenarios = benchmark.Scenarios(options["url"], category_ids, game_ids, rng_seed=options["seed"])
+        self.stdout.write(
+            f"🚀 {options['url']} | {options['requests']} peticiones x escenario | "
+            f"concurrencia {options['concurrency']} | {len(game_ids)} juegos"
+        )
+        self.stdout.write(
+            f"{'Escenario':<12}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'consultas':>11}{'errores':>9}"
+        )
+        results = {}
+        for name in options["scenario"] or benchmark.SCENARIOS:
+            try:
+                result = scenarios.run(name, options["requests"], options["concurrency"], options["warmup"])
+            except OSError as exc:
+                raise CommandError(f"No se pudo conectar con {options['url']}: {exc}")
+            results[name] = result
+            queries = f"{result['queries']:.1f}" if result["queries"] is not None else "-"
+            self.stdout.write(
+                f"{name:<12}{result['rps']:>9.1f}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                f"{result['p99_ms']:>10.1f}{queries:>11}{result['errors']:>9}"
+            )
+
+        if options["save_baseline"]:
+            run_options = {
+                key: options[key] for key in ("url", "requests", "concurrency", "warmup", "seed")
+            }
+            run_options.update(games=len(game_ids), python=platform.python_version())
+            benchmark.save_baseline(options["baseline"], results, run_options)
+            self.stdout.write(self.style.SUCCESS(f"💾 Línea base guardada en {options['baseline']}"))
+            return
+
+        baseline = benchmark.load_baseline(options["baseline"])
+        if baseline is None:
+            self.stdout.write("💡 Sin línea base: ejecutar con --save-baseline para guardarla")
+            return
+        regressions = benchmark.compare(results, baseline, options["tolerance"])
+        if regressions:
+            raise CommandError("Regresiones respecto a la línea base:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("✅ Sin regresiones respecto a la línea base"))
@@ -0,0 +1,57 @@
+"""
+Worker de moderación de comentarios
+Puntúa los comentarios pendientes con el naive Bayes de games.moderation y
+los publica, los retiene o los marca como spam. Sin --loop procesa la cola
+una vez (cron); con --loop queda escuchando y reentrena periódicamente con
+las decisiones tomadas en el admin.
+
+Uso:
+    python manage.py moderate_comments
+    python manage.py moderate_comments --loop --interval 2
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from games import moderation, slowlog
+from games.metrics import registry
+
+
+class Command(BaseCommand):
+    help = "Puntúa los comentarios pendientes y los publica o retiene para revisión"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=200, help="Comentarios por lote")
+        parser.add_argument("--loop", action="store_true", help="Seguir procesando la cola indefinidamente")
+        parser.add_argument("--interval", type=float, default=5.0, help="Segundos de espera con la cola vacía")
+        parser.add_argument("--retrain", type=float, default=600.0, help="Segundos entre reentrenamientos")
+        parser.add_argument("--training-limit", type=int, default=5000, help="Comentarios por clase para entrenar")
+
+    def handle(self, *args, **options):
+        classifier, trained_at = self.train(options), time.monotonic()
+        while True:
+            start = time.perf_counter()
+            results = moderation.moderate(classifier, options["batch"])
+            registry.flush(force=True)
+            slowlog.flush()
+            total = sum(results.values())
+            if total:
+                summary = ", ".join(f"{status}: {count}" for status, count in sorted(results.items()))
+                self.stdout.write(f"🛡️  {total} comentarios en {(time.perf_counter() - start) * 1000:.1f} ms ({summary})")
+            if not options["loop"]:
+                if total == options["batch"]:
+                    continue
+                return
+            if time.monotonic() - trained_at >= options["retrain"]:
+                classifier, trained_at = self.train(options), time.monotonic()
+            if total < options["batch"]:
+                time.sleep(options["interval"])
+
+    def train(self, options):
+        start = time.perf_counter()
+        classifier = moderation.train_from_db(options["training_limit"])
+        self.stdout.write(
+            f"🧠 Clasificador entrenado: {len(classifier.weights)} tokens en {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        return classifier
@@ -0,0 +1,82 @@
+"""
+Sondeo de salud y TLS de muchos hosts a la vez
+Handshake TLS, días hasta la caducidad del certificado, código HTTP y
+latencia por URL, con concurrencia limitada. Sale con error si alguna URL
+falla (conexión, TLS, HTTP 5xx o certificado a punto de caducar).
+
+Uso:
+    python manage.py probe https://davegames.example https://api.example
+    python manage.py probe --file hosts.txt --concurrency 50 --json --output probe.json
+    python manage.py probe https://localhost:8443 --cafile davegames_ssl_advanced.crt
+"""
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from games import probe
+
+
+class Command(BaseCommand):
+    help = "Sondea en paralelo TLS, caducidad del certificado, código HTTP y latencia de varias URLs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="*", help="URLs a sondear (sin esquema se asume https)")
+        parser.add_argument("--file", help="Archivo con una URL por línea (# para comentarios)")
+        parser.add_argument("--concurrency", type=int, default=20, help="Sondeos simultáneos")
+        parser.add_argument("--timeout", type=float, default=10.0, help="Segundos por fase (conexión, TLS, HTTP)")
+        parser.add_argument("--warn-days", type=int, default=14, help="Días mínimos de validez del certificado")
+        parser.add_argument("--cafile", help="CA adicional de confianza (p. ej. un certificado self-signed)")
+        parser.add_argument(
+            "--insecure", action="store_true",
+            help="No verificar el certificado (tampoco se puede leer su caducidad)",
+        )
+        parser.add_argument("--json", action="store_true", help="Imprimir el informe en JSON")
+        parser.add_argument("--output", help="Guardar el informe JSON en este archivo")
+
+    def handle(self, *args, **options):
+        urls = list(options["urls"])
+        if options["file"]:
+            for line in Path(options["file"]).read_text(encoding="utf-8").splitlines():
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    urls.append(line)
+        if not urls:
+            raise CommandError("Indica al menos una URL o --file")
+
+        report = probe.run(
+            urls,
+            concurrency=max(1, options["concurrency"]),
+            timeout=options["timeout"],
+            cafile=options["cafile"],
+            insecure=options["insecure"],
+            warn_days=options["warn_days"],
+        )
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_table(report)
+
+        if report["summary"]["failed"]:
+            raise CommandError(f"{report['summary']['failed']} de {report['summary']['total']} URLs con problemas")
+
+    def print_table(self, report):
+        self.stdout.write(
+            f"🔍 {report['summary']['total']} URLs en {report['seconds']:.2f}s "
+            f"({report['summary']['ok']} OK, {report['summary']['failed']} con problemas)"
+        )
+        self.stdout.write(f"{'':3}{'URL':<40}{'HTTP':>6}{'TLS ms':>9}{'Latencia':>10}{'Cert (días)':>13}")
+        for result in report["results"]:
+            icon = "✅" if result["ok"] else "❌"
+            tls = f"{result['tls_ms']:.1f}" if result["tls_ms"] is not None else "-"
+            latency = f"{result['latency_ms']:.1f}" if result["latency_ms"] is not None else "-"
+            days = result["cert_days_left"] if result["cert_days_left"] is not None else "-"
+            self.stdout.write(
+                f"{icon} {result['url'][:40]:<40}{result['status'] or '-':>6}{tls:>9}{latency:>10}{days:>13}"
+            )
+            if result["error"]:
+                self.stdout.write(f"   ⚠️  {result['error']}")
@@ -0,0 +1,47 @@
+"""
+Generar miniaturas, placeholders y dimensiones de las portadas existentes
+Reporta los bytes de imagen que descargan las grillas antes y después.
+"""
+
+from django.core.management.base import BaseCommand
+
+from games.images import DERIVED_FIELDS, process_cover
+from games.models import Game
+
+
+class Command(BaseCommand):
+    help = "Procesa las portadas de los juegos (miniatura, placeholder, dimensiones)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Reprocesar también las ya procesadas")
+
+    def handle(self, *args, **options):
+        games = Game.objects.exclude(cover_image="")
+        if not options["all"]:
+            games = games.filter(cover_width__isnull=True)
+
+        processed = failed = 0
+        for game in games.iterator():
+            try:
+                process_cover(game)
+            except OSError as exc:
+                failed += 1
+                self.stderr.write(f"❌ {game.title}: {exc}")
+                continue
+            game.save(update_fields=DERIVED_FIELDS)
+            processed += 1
+
+        original_bytes = grid_bytes = placeholder_bytes = 0
+        for game in Game.objects.exclude(cover_image=""):
+            try:
+                size = game.cover_image.size
+            except OSError:
+                continue
+            original_bytes += size
+            grid_bytes += game.cover_thumbnail.size if game.cover_thumbnail else size
+            placeholder_bytes += len(game.cover_placeholder)
+
+        self.stdout.write(f"✅ Portadas procesadas: {processed} (errores: {failed})")
+        self.stdout.write(f"🖼️  Bytes de portadas originales: {original_bytes / 1024:.1f} KB")
+        self.stdout.write(f"📉 Bytes con miniaturas en grillas: {grid_bytes / 1024:.1f} KB")
+        self.stdout.write(f"🌫️  Placeholders inline en el HTML: {placeholder_bytes / 1024:.1f} KB")
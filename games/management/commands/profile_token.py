@@ -0,0 +1,21 @@
+"""
+Generar un token para la cabecera X-Profile
+Permite perfilar una petición sin sesión de staff (curl, loadtest).
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from games.profiling import PROFILE_HEADER, make_token
+
+
+class Command(BaseCommand):
+    help = "Imprime un token firmado para perfilar peticiones con la cabecera X-Profile"
+
+    def handle(self, *args, **options):
+        token = make_token()
+        self.stdout.write(token)
+        self.stderr.write(
+            f"💡 Válido {settings.PROFILE_TOKEN_MAX_AGE}s. Ejemplo:\n"
+            f'   curl -H "{PROFILE_HEADER}: {token}" -I http://127.0.0.1:8000/game/1/'
+        )
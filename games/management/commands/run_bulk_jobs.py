@@ -0,0 +1,45 @@
+"""
+Worker de acciones masivas del admin
+Procesa los BulkJob en cola por lotes (games.bulkjobs). Sin --loop vacía la
+cola y termina; --max-seconds acota la ejecución para lanzarlo desde un
+cron sin superar el límite de tiempo de la plataforma (el trabajo sigue en
+la siguiente ejecución).
+
+Uso:
+    python manage.py run_bulk_jobs
+    python manage.py run_bulk_jobs --loop --interval 2
+    python manage.py run_bulk_jobs --max-seconds 50
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from games import bulkjobs
+
+
+class Command(BaseCommand):
+    help = "Procesa las acciones masivas del admin en cola, por lotes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, help="Filas por lote (por defecto BULK_JOB_BATCH)")
+        parser.add_argument("--loop", action="store_true", help="Seguir esperando trabajos nuevos")
+        parser.add_argument("--interval", type=float, default=5.0, help="Segundos de espera con la cola vacía")
+        parser.add_argument("--max-seconds", type=float, help="Tiempo máximo de ejecución")
+
+    def handle(self, *args, **options):
+        deadline = time.monotonic() + options["max_seconds"] if options["max_seconds"] else None
+        while deadline is None or time.monotonic() < deadline:
+            job = bulkjobs.claim()
+            if job is None:
+                if not options["loop"]:
+                    return
+                time.sleep(options["interval"])
+                continue
+            start = time.perf_counter()
+            finished = bulkjobs.run(job, options["batch"], deadline)
+            icon = "❌" if job.status == job.Status.FAILED else ("✅" if finished else "⏸️ ")
+            self.stdout.write(
+                f"{icon} #{job.pk} {job.get_action_display()}: {job.processed}/{job.total} "
+                f"en {time.perf_counter() - start:.1f}s{' - ' + job.error if job.error else ''}"
+            )
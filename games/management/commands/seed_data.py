@@ -0,0 +1,44 @@
+"""
+Generar datos sintéticos para pruebas de carga
+N categorías, M juegos con textos de tamaño realista y K comentarios por
+juego. Con la misma semilla siempre se generan los mismos datos.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from games import benchmark
+
+
+class Command(BaseCommand):
+    help = "Genera categorías, juegos y comentarios sintéticos para loadtest"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--categories", type=int, default=10, help="Número de categorías")
+        parser.add_argument("--games", type=int, default=200, help="Número de juegos")
+        parser.add_argument("--comments", type=int, default=20, help="Comentarios por juego")
+        parser.add_argument("--seed", type=int, default=0, help="Semilla aleatoria")
+        parser.add_argument("--clear", action="store_true", help="Borrar antes los datos generados")
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            deleted = benchmark.clear_seeded()
+            self.stdout.write(f"🗑️  Juegos generados borrados: {deleted}")
+
+        if options["categories"] < 1:
+            return
+
+        start = time.perf_counter()
+        with transaction.atomic():
+            created = benchmark.seed(
+                options["categories"], options["games"], options["comments"], rng_seed=options["seed"]
+            )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {created['categories']} categorías, {created['games']} juegos y "
+                f"{created['comments']} comentarios en {elapsed:.1f}s"
+            )
+        )
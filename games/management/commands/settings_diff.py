@@ -0,0 +1,84 @@
+"""
+Diferencia efectiva de settings por proveedor
+Resuelve cada perfil de davegames_project.settings_loader con el entorno
+actual y muestra qué cambia frente a otro (por defecto "development").
+Los secretos se enmascaran.
+
+Uso:
+    python manage.py settings_diff
+    python manage.py settings_diff --provider vercel --set DEBUG=False
+    python manage.py settings_diff --provider heroku --against vercel --json
+"""
+
+import json
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+
+from davegames_project import settings_loader
+
+SECRET_RE = re.compile(r"PASSWORD|SECRET|TOKEN", re.IGNORECASE)
+
+
+def mask(key, value):
+    if isinstance(value, dict):
+        return {item_key: mask(item_key, item) for item_key, item in value.items()}
+    if value and (key in settings_loader.SECRET_KEYS or SECRET_RE.search(key)):
+        return "********"
+    return value
+
+
+def diff(base, other):
+    """{"added": {...}, "changed": {clave: [antes, después]}, "removed": [...]}"""
+    return {
+        "added": {key: other[key] for key in sorted(other.keys() - base.keys())},
+        "changed": {key: [base[key], other[key]] for key in sorted(base.keys() & other.keys()) if base[key] != other[key]},
+        "removed": sorted(base.keys() - other.keys()),
+    }
+
+
+class Command(BaseCommand):
+    help = "Muestra los settings efectivos de cada proveedor que difieren de otro"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--provider", action="append", choices=sorted(settings_loader.PROFILES),
+            help="Proveedor a comparar (repetible; por defecto todos)",
+        )
+        parser.add_argument("--against", default="development", choices=sorted(settings_loader.PROFILES))
+        parser.add_argument(
+            "--set", action="append", default=[], metavar="VAR=VALOR",
+            help="Sobrescribir una variable de entorno para la comparación (p. ej. DEBUG=False)",
+        )
+        parser.add_argument("--json", action="store_true", help="Salida en JSON")
+
+    def handle(self, *args, **options):
+        environ = dict(settings_loader.read_environ())
+        environ.pop("DEPLOY_PROVIDER", None)
+        for assignment in options["set"]:
+            name, sep, value = assignment.partition("=")
+            if not sep or name not in settings_loader.ENV:
+                raise CommandError(f"--set inválido: {assignment!r} (variable no declarada en ENV)")
+            environ[name] = value
+        environ = tuple(sorted(environ.items()))
+
+        base = self.resolved(options["against"], environ)
+        providers = options["provider"] or [name for name in settings_loader.PROFILES if name != options["against"]]
+        report = {provider: diff(base, self.resolved(provider, environ)) for provider in providers}
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2, default=str))
+            return
+        for provider, changes in report.items():
+            total = len(changes["added"]) + len(changes["changed"]) + len(changes["removed"])
+            self.stdout.write(f"🔧 {provider} frente a {options['against']}: {total} diferencias")
+            for key, value in changes["added"].items():
+                self.stdout.write(self.style.SUCCESS(f"   + {key} = {value!r}"))
+            for key, (before, after) in changes["changed"].items():
+                self.stdout.write(self.style.WARNING(f"   ~ {key}: {before!r} -> {after!r}"))
+            for key in changes["removed"]:
+                self.stdout.write(self.style.ERROR(f"   - {key}"))
+
+    def resolved(self, provider, environ):
+        values = settings_loader.thaw(settings_loader.resolve(provider, environ))
+        return {key: mask(key, value) for key, value in values.items()}
@@ -0,0 +1,47 @@
+"""
+Mostrar las consultas lentas registradas (SLOW_QUERY_MS)
+Agrupadas por huella de SQL normalizado, con el punto del código que las
+lanza y el último plan de EXPLAIN.
+"""
+
+from django.core.management.base import BaseCommand
+
+from games.models import SlowQuery
+
+ORDERINGS = {"total": "-total_ms", "max": "-max_ms", "calls": "-calls", "recent": "-last_seen"}
+
+
+class Command(BaseCommand):
+    help = "Lista las consultas más lentas agrupadas por huella"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=10, help="Número de consultas a mostrar")
+        parser.add_argument("--order", choices=ORDERINGS, default="total", help="Criterio de orden")
+        parser.add_argument("--plans", action="store_true", help="Mostrar el plan de EXPLAIN")
+        parser.add_argument("--reset", action="store_true", help="Vaciar el registro")
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            deleted, _ = SlowQuery.objects.all().delete()
+            self.stdout.write(f"🗑️  Consultas lentas borradas: {deleted}")
+            return
+
+        queries = SlowQuery.objects.order_by(ORDERINGS[options["order"]])[: options["limit"]]
+        if not queries:
+            self.stdout.write("✅ No hay consultas lentas registradas")
+            return
+
+        self.stdout.write(f"🐢 Consultas lentas (orden: {options['order']})")
+        self.stdout.write("=" * 60)
+        for query in queries:
+            self.stdout.write(
+                f"[{query.fingerprint}] {query.calls} llamadas | total {query.total_ms:.0f} ms | "
+                f"media {query.avg_ms:.1f} ms | máx {query.max_ms:.1f} ms"
+            )
+            if query.source:
+                self.stdout.write(f"   📍 {query.source}")
+            self.stdout.write(f"   {query.normalized[:300]}")
+            if options["plans"] and query.plan:
+                for line in query.plan.splitlines():
+                    self.stdout.write(f"      {line}")
+            self.stdout.write("")
@@ -0,0 +1,91 @@
+"""
+Vendorizar Bootstrap, Font Awesome y Google Fonts en games/static/games/vendor
+Descarga las versiones fijadas, recorta las fuentes a los glifos usados,
+reescribe base.html con {% static %} (URLs con hash vía el manifest) y
+reporta el ahorro de bytes, peticiones y orígenes.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from games import vendoring
+
+
+class Command(BaseCommand):
+    help = "Vendoriza las dependencias frontend de base.html y recorta sus fuentes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-rewrite", action="store_true", help="No modificar games/templates/games/base.html"
+        )
+
+    def handle(self, *args, **options):
+        sources = vendoring.template_sources()
+        classes = vendoring.used_classes(sources.values())
+        glyphs = vendoring.template_codepoints(sources.values()) | vendoring.DYNAMIC_TEXT_CODEPOINTS
+
+        self.stdout.write("📦 Descargando dependencias fijadas...")
+        try:
+            bootstrap_css = vendoring.fetch(vendoring.BOOTSTRAP_CSS)
+            bootstrap_js = vendoring.fetch(vendoring.BOOTSTRAP_JS)
+            fontawesome_css = vendoring.fetch(vendoring.FONTAWESOME_CSS)
+            google_css = vendoring.fetch(vendoring.GOOGLE_FONTS_CSS)
+        except OSError as exc:
+            raise CommandError(f"No se pudo descargar: {exc}")
+
+        icons_css, icon_fonts = vendoring.subset_fontawesome_css(fontawesome_css.decode(), classes)
+        fonts_css, web_fonts = vendoring.localize_google_fonts_css(google_css.decode())
+
+        bytes_before = len(bootstrap_css) + len(bootstrap_js) + len(fontawesome_css) + len(google_css)
+        bytes_after = len(bootstrap_js)
+        subsetted = True
+
+        # fuentes: iconos recortados a los usados, web fonts a texto de plantillas + Latin-1
+        downloads = [
+            (name, f"{vendoring.FONTAWESOME_BASE}/webfonts/{name}.woff2", codepoints)
+            for name, codepoints in icon_fonts.items()
+        ] + [(name, url, glyphs) for name, url in web_fonts.items()]
+        for name, url, codepoints in downloads:
+            data = vendoring.fetch(url)
+            subset, ok = vendoring.subset_font(data, codepoints)
+            subsetted = subsetted and ok
+            self._write(f"{vendoring.FONTS_DIR}/{name}.woff2", subset)
+            bytes_before += len(data)
+            bytes_after += len(subset)
+            self.stdout.write(f"   🔤 {name}: {len(data) / 1024:.1f} KB -> {len(subset) / 1024:.1f} KB")
+
+        bundle = "\n".join(
+            [
+                vendoring.strip_source_maps(bootstrap_css.decode()),
+                fonts_css,
+                icons_css,
+            ]
+        ).encode()
+        bytes_after += len(bundle)
+        self._write(vendoring.BUNDLE_CSS, bundle)
+        self._write(vendoring.BUNDLE_JS, vendoring.strip_source_maps(bootstrap_js.decode()).encode())
+
+        if not subsetted:
+            self.stdout.write(
+                self.style.WARNING("⚠️  fonttools/brotli no instalados: fuentes copiadas sin recortar")
+            )
+
+        if not options["no_rewrite"]:
+            base = next(path for path in sources if path.name == "base.html")
+            rewritten = vendoring.rewrite_base_template(sources[base])
+            if rewritten != sources[base]:
+                base.write_text(rewritten, encoding="utf-8")
+                self.stdout.write(f"✏️  Plantilla reescrita: {base}")
+
+        # antes: 3 hojas de estilo + 1 script; después: 1 bundle + 1 script
+        requests_before = 4 + len(downloads)
+        requests_after = 2 + len(downloads)
+        self.stdout.write("=" * 60)
+        self.stdout.write(f"💾 Bytes: {bytes_before / 1024:.1f} KB -> {bytes_after / 1024:.1f} KB")
+        self.stdout.write(f"📉 Peticiones: {requests_before} -> {requests_after}")
+        self.stdout.write(f"🌐 Orígenes externos: {len(vendoring.CDN_ORIGINS)} -> 0 (sin DNS/TLS extra)")
+        self.stdout.write("💡 Ejecutar collectstatic y quitar los CDN de CSP en davegames_project/settings_loader.py")
+
+    def _write(self, name, data):
+        path = vendoring.static_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
@@ -0,0 +1,39 @@
+"""
+Calentar las caches: conexiones, navegación y páginas populares
+Mismo proceso que WARMUP_ON_BOOT; útil con una cache compartida entre
+workers (archivos, memcached) tras un deploy.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from games import warmup
+
+
+class Command(BaseCommand):
+    help = "Pre-renderiza las páginas más populares en la cache dentro de un presupuesto de tiempo"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budget", type=float, help="Segundos máximos (por defecto WARMUP_BUDGET)")
+        parser.add_argument("--top", type=int, help="Páginas a pre-renderizar (por defecto WARMUP_TOP)")
+        parser.add_argument(
+            "--save-snapshot", action="store_true",
+            help="Guardar la lista de popularidad actual en WARMUP_SNAPSHOT",
+        )
+
+    def handle(self, *args, **options):
+        if options["save_snapshot"]:
+            paths = warmup.popular_paths(options["top"] or settings.WARMUP_TOP)
+            warmup.save_snapshot(paths)
+            self.stdout.write(f"💾 {len(paths)} rutas guardadas en {settings.WARMUP_SNAPSHOT}")
+            return
+
+        stats = warmup.warm_up(budget=options["budget"], top=options["top"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"🔥 {stats['pages']} páginas en cache, {stats['connections']} conexiones abiertas, "
+                f"navegación {'cargada' if stats['nav'] else 'pendiente'} en {stats['seconds']:.2f}s"
+            )
+        )
+        if stats["skipped"]:
+            self.stdout.write(self.style.WARNING(f"⏱️  Presupuesto agotado: {stats['skipped']} páginas sin calentar"))
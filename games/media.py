@@ -0,0 +1,182 @@
+"""
+Servir archivos media (portadas) en producción
+Soporta peticiones Range, ETag/If-None-Match, cache inmutable para
+nombres con hash de contenido y X-Accel-Redirect para Nginx.
+"""
+
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+from .metrics import count_cache
+
+# Un año: máximo recomendado para recursos inmutables
+IMMUTABLE_MAX_AGE = 31536000
+
+# Nombres con hash de contenido, ej: covers/ab/ab12cd34ef56....jpg
+HASHED_NAME_RE = re.compile(r"(?:^|[._-])[0-9a-f]{12,64}\.[A-Za-z0-9]+$")
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def is_content_hashed(name):
+    """Indica si el nombre del archivo incluye un hash de su contenido"""
+    return bool(HASHED_NAME_RE.search(posixpath.basename(name)))
+
+
+def cache_control_for(name):
+    """Cabecera Cache-Control según el tipo de nombre del archivo"""
+    if is_content_hashed(name):
+        return f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+
+
+def file_etag(stat):
+    """ETag fuerte derivado de la fecha de modificación y el tamaño"""
+    return quote_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+
+
+def etag_matches(header, etag):
+    """Comparar If-None-Match / If-Range con el ETag actual"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    # Comparación débil: ignorar el prefijo W/
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def parse_range(header, size):
+    """
+    Interpretar una cabecera Range de un solo intervalo.
+
+    Returns:
+        tuple | None: (inicio, fin) inclusivos, None si se debe enviar el
+        archivo completo. Lanza ValueError si el rango no es satisfacible.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        # Rangos múltiples o mal formados: se ignoran (RFC 9110)
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Sufijo: los últimos N bytes
+        length = int(end)
+        if length == 0:
+            raise ValueError("Rango vacío")
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError("Rango fuera del archivo")
+    return start, end
+
+
+class MediaFileResponse(FileResponse):
+    """FileResponse con bloques de 64 KB (4 KB por defecto multiplica las iteraciones)"""
+
+    block_size = 64 * 1024
+
+
+class RangeFile:
+    """Lector limitado a un intervalo del archivo (sin fileno: evita sendfile completo)"""
+
+    def __init__(self, fileobj, start, length):
+        self.fileobj = fileobj
+        self.name = fileobj.name
+        self.remaining = length
+        fileobj.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fileobj.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.fileobj.close()
+
+
+@require_safe
+def serve_media(request, path):
+    """Servir un archivo de MEDIA_ROOT con cabeceras de cache y soporte de Range"""
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Archivo no encontrado")
+    try:
+        stat = os.stat(fullpath)
+    except OSError:
+        raise Http404("Archivo no encontrado")
+    if not os.path.isfile(fullpath):
+        raise Http404("Archivo no encontrado")
+
+    etag = file_etag(stat)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Cache-Control": cache_control_for(path),
+        "Accept-Ranges": "bytes",
+    }
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        count_cache("media_etag", etag_matches(if_none_match, etag))
+    if etag_matches(if_none_match, etag):
+        response = HttpResponseNotModified()
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    content_type = mimetypes.guess_type(fullpath)[0] or "application/octet-stream"
+
+    # Delegar la transferencia a Nginx (sendfile, Range y keep-alive nativos)
+    if settings.MEDIA_ACCEL_REDIRECT:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT.rstrip("/") + "/" + path
+        for key, value in headers.items():
+            response[key] = value
+        return response
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if range_header and (
+        "If-Range" not in request.headers
+        or etag_matches(request.headers["If-Range"], etag)
+    ):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{stat.st_size}"
+            return response
+
+    fileobj = open(fullpath, "rb")
+    if byte_range is None:
+        # FileResponse usa wsgi.file_wrapper (sendfile) cuando el servidor lo soporta
+        response = MediaFileResponse(fileobj, content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = MediaFileResponse(
+            RangeFile(fileobj, start, length), content_type=content_type, status=206
+        )
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    for key, value in headers.items():
+        response[key] = value
+    return response
@@ -0,0 +1,414 @@
+"""
+Métricas en formato de texto de Prometheus
+Registro en memoria (contadores, gauges e histogramas) que cada proceso
+vuelca a un archivo JSON propio en METRICS_DIR. El endpoint /metrics suma los
+archivos de todos los workers, así que funciona con gunicorn/uwsgi en modo
+multiproceso sin memoria compartida.
+
+El archivo de cada proceso se llama <pid>-<arranque>.json: un PID reutilizado
+no sobrescribe los contadores del proceso muerto (retrocederían y romperían
+rate()). Cada ARCHIVE_INTERVAL segundos los archivos de procesos terminados
+se suman en archived.json y se borran.
+"""
+
+import json
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Segundos mínimos entre volcados a disco de un mismo proceso
+FLUSH_INTERVAL = 1.0
+
+# Contadores e histogramas acumulados de los procesos terminados
+ARCHIVE = "archived.json"
+ARCHIVE_INTERVAL = 60.0
+# un cerrojo más antiguo es de un proceso que murió archivando
+ARCHIVE_LOCK_TIMEOUT = 60.0
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+def _key(labels):
+    return json.dumps(labels, sort_keys=True)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, registry, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.samples = {}
+        self.lock = registry.lock
+        registry.metrics[name] = self
+
+    def dump(self):
+        with self.lock:
+            return {"type": self.kind, "help": self.help, "samples": dict(self.samples)}
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = _key(labels)
+        with self.lock:
+            self.samples[key] = self.samples.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Valor por proceso; al agregar se suman solo los procesos vivos"""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.samples[_key(labels)] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, buckets):
+        super().__init__(registry, name, help_text)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = _key(labels)
+        with self.lock:
+            sample = self.samples.get(key)
+            if sample is None:
+                sample = self.samples[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                sample["le"] = list(self.buckets)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    sample["buckets"][index] += 1
+            sample["sum"] += value
+            sample["count"] += 1
+
+    def dump(self):
+        with self.lock:
+            samples = {key: dict(value, buckets=list(value["buckets"])) for key, value in self.samples.items()}
+        return {"type": self.kind, "help": self.help, "samples": samples}
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self.lock = threading.RLock()
+        self.last_flush = 0.0
+        self.last_archive = 0.0
+        self.pid = None
+        self.start = None
+        self.token = None
+
+    def counter(self, name, help_text):
+        return Counter(self, name, help_text)
+
+    def gauge(self, name, help_text):
+        return Gauge(self, name, help_text)
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        return Histogram(self, name, help_text, buckets)
+
+    def collector(self, func):
+        """Función que actualiza gauges/contadores justo antes de cada volcado"""
+        self.collectors.append(func)
+        return func
+
+    def identify(self):
+        """PID e instante de arranque; se recalculan en el hijo tras un fork"""
+        pid = os.getpid()
+        if self.pid != pid:
+            self.pid = pid
+            self.start = _process_start(pid)
+            # sin /proc (macOS, Windows) un token aleatorio distingue el archivo
+            self.token = str(self.start) if self.start is not None else secrets.token_hex(4)
+        return pid
+
+    def dump(self):
+        for collect in self.collectors:
+            collect()
+        pid = self.identify()
+        return {
+            "pid": pid,
+            "start": self.start,
+            "metrics": {name: metric.dump() for name, metric in self.metrics.items()},
+        }
+
+    def flush(self, force=False):
+        """Escribir el estado de este proceso en METRICS_DIR/<pid>-<arranque>.json"""
+        now = time.monotonic()
+        if not force and now - self.last_flush < FLUSH_INTERVAL:
+            return
+        self.last_flush = now
+        directory = Path(settings.METRICS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.identify()}-{self.token}.json"
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(self.dump()), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+registry = Registry()
+
+request_latency = registry.histogram(
+    "davegames_request_duration_seconds", "Duración de la petición por vista"
+)
+requests_total = registry.counter("davegames_requests_total", "Peticiones por vista y código de estado")
+db_queries = registry.histogram(
+    "davegames_db_queries_per_request", "Consultas SQL por petición", buckets=QUERY_BUCKETS
+)
+cache_requests = registry.counter("davegames_cache_requests_total", "Consultas a caches por resultado")
+comment_submissions = registry.counter(
+    "davegames_comment_submissions_total", "Comentarios enviados por resultado"
+)
+db_connections = registry.gauge("davegames_db_connections_open", "Conexiones abiertas por proceso")
+
+# Gauges globales: se calculan al servir /metrics, no por proceso
+cover_queue = "davegames_image_processing_queue_depth"
+moderation_queue = "davegames_comment_moderation_queue_depth"
+
+
+def observe_request(view, status, seconds, queries):
+    view = view or "unresolved"
+    request_latency.observe(seconds, view=view)
+    requests_total.inc(view=view, status=str(status))
+    db_queries.observe(queries, view=view)
+    registry.flush()
+
+
+def count_cache(cache, hit):
+    cache_requests.inc(cache=cache, result="hit" if hit else "miss")
+
+
+# caches lru_cache del proceso: se leen con cache_info() en cada volcado
+_lru_caches = {}
+
+
+def register_lru_cache(name, func):
+    _lru_caches[name] = func
+
+
+@registry.collector
+def _collect_process_state():
+    with registry.lock:
+        for name, func in _lru_caches.items():
+            info = func.cache_info()
+            cache_requests.samples[_key({"cache": name, "result": "hit"})] = info.hits
+            cache_requests.samples[_key({"cache": name, "result": "miss"})] = info.misses
+    for alias in connections:
+        db_connections.set(int(connections[alias].connection is not None), alias=alias)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _process_start(pid):
+    """Instante de arranque del proceso (ticks desde el boot, /proc de Linux) o None"""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as stat:
+            # el nombre del ejecutable puede tener espacios: se cuenta desde el último ")"
+            return int(stat.read().rsplit(b")", 1)[1].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _alive(data):
+    pid = data.get("pid")
+    if pid is None or not _pid_alive(pid):
+        return False
+    # PID reutilizado por otro proceso: el instante de arranque no coincide
+    start = data.get("start")
+    return start is None or _process_start(pid) in (None, start)
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _merge(merged, metrics, alive):
+    """Sumar las métricas de un archivo; los gauges solo de procesos vivos"""
+    for name, metric in metrics.items():
+        if metric["type"] == "gauge" and not alive:
+            continue
+        target = merged.setdefault(name, {"type": metric["type"], "help": metric["help"], "samples": {}})
+        for key, value in metric["samples"].items():
+            current = target["samples"].get(key)
+            if metric["type"] != "histogram":
+                target["samples"][key] = (current or 0) + value
+            elif current is None:
+                target["samples"][key] = value
+            else:
+                current["buckets"] = [a + b for a, b in zip(current["buckets"], value["buckets"])]
+                current["sum"] += value["sum"]
+                current["count"] += value["count"]
+
+
+def archive_dead(directory=None):
+    """
+    Sumar en archived.json los archivos de procesos terminados y borrarlos.
+    Un cerrojo (archivo creado con O_EXCL) evita que dos workers archiven a la
+    vez; archived.json lista los archivos ya sumados para que collect() no los
+    cuente dos veces mientras se borran.
+    """
+    directory = Path(directory or settings.METRICS_DIR)
+    lock = directory / "archive.lock"
+    try:
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        try:
+            if time.time() - lock.stat().st_mtime > ARCHIVE_LOCK_TIMEOUT:
+                lock.unlink()
+        except OSError:
+            pass
+        return 0
+    except OSError:
+        return 0
+    try:
+        archive = directory / ARCHIVE
+        data = _read(archive) or {}
+        merged = data.get("metrics", {})
+        names = {path.name for path in directory.glob("*.json")}
+        folded = [name for name in data.get("folded", []) if name in names]
+        dead = []
+        for path in sorted(directory.glob("*.json")):
+            if path.name == ARCHIVE or path.name in folded:
+                continue
+            worker = _read(path)
+            if worker is None or _alive(worker):
+                continue
+            _merge(merged, worker["metrics"], alive=False)
+            dead.append(path)
+        if dead or len(folded) != len(data.get("folded", [])):
+            tmp = archive.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(
+                json.dumps({"pid": None, "folded": folded + [path.name for path in dead], "metrics": merged}),
+                encoding="utf-8",
+            )
+            os.replace(tmp, archive)
+        for path in dead:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        return len(dead)
+    finally:
+        try:
+            lock.unlink()
+        except OSError:
+            pass
+
+
+def collect():
+    """
+    Sumar los archivos de todos los procesos.
+    Los contadores e histogramas de procesos terminados se conservan (en su
+    archivo o ya en archived.json) para que no retrocedan; los gauges solo
+    cuentan procesos vivos.
+    """
+    registry.flush(force=True)
+    directory = Path(settings.METRICS_DIR)
+    now = time.monotonic()
+    if now - registry.last_archive >= ARCHIVE_INTERVAL:
+        registry.last_archive = now
+        archive_dead(directory)
+
+    for _ in range(3):
+        merged = _collect_files(directory)
+        if merged is not None:
+            return merged
+    return _collect_files(directory, retry=False)
+
+
+def _collect_files(directory, retry=True):
+    """None si otro worker archivó un archivo a mitad de la lectura (se repite)"""
+    paths = sorted(directory.glob("*.json"))
+    archived = _read(directory / ARCHIVE) or {}
+    folded = set(archived.get("folded", []))
+    merged = {}
+    for path in paths:
+        if path.name in folded:
+            continue
+        data = archived if path.name == ARCHIVE else _read(path)
+        if data is None and retry and not path.exists():
+            return None
+        if data is None or "metrics" not in data:
+            continue
+        _merge(merged, data["metrics"], alive=path.name != ARCHIVE and _alive(data))
+    return merged
+
+
+def _global_gauges():
+    from .models import Comment, Game
+
+    pending = Game.objects.exclude(cover_image="").filter(cover_width__isnull=True).count()
+    unmoderated = Comment.objects.filter(status=Comment.Status.PENDING).count()
+    return {
+        cover_queue: {
+            "type": "gauge",
+            "help": "Portadas pendientes de procesar (process_covers)",
+            "samples": {_key({}): pending},
+        },
+        moderation_queue: {
+            "type": "gauge",
+            "help": "Comentarios pendientes de moderar (moderate_comments)",
+            "samples": {_key({}): unmoderated},
+        },
+    }
+
+
+def _labels(key, **extra):
+    labels = dict(json.loads(key), **extra)
+    if not labels:
+        return ""
+    body = ",".join(f'{name}="{str(value)}"' for name, value in sorted(labels.items()))
+    return "{" + body + "}"
+
+
+def render(metrics):
+    """Formato de exposición de texto 0.0.4"""
+    lines = []
+    for name, metric in sorted(metrics.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for key, value in sorted(metric["samples"].items()):
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_labels(key)} {value}")
+                continue
+            for bound, count in zip(value["le"], value["buckets"]):
+                lines.append(f"{name}_bucket{_labels(key, le=bound)} {count}")
+            lines.append(f"{name}_bucket{_labels(key, le='+Inf')} {value['count']}")
+            lines.append(f"{name}_sum{_labels(key)} {value['sum']}")
+            lines.append(f"{name}_count{_labels(key)} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    """Endpoint /metrics; con METRICS_TOKEN exige Authorization: Bearer <token>"""
+    token = settings.METRICS_TOKEN
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponseForbidden()
+    metrics = collect()
+    metrics.update(_global_gauges())
+    return HttpResponse(render(metrics), content_type=CONTENT_TYPE)
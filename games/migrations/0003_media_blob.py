@@ -0,0 +1,45 @@
+# Generated by Django 4.2.23 on 2026-10-19 15:53
+
+from django.db import migrations, models
+import games.storage
+
+
+def count_cover_references(apps, schema_editor):
+    # Crear los blobs de las portadas existentes con su número de referencias
+    Game = apps.get_model('games', 'Game')
+    MediaBlob = apps.get_model('games', 'MediaBlob')
+    counts = (
+        Game.objects.exclude(cover_image='')
+        .values('cover_image')
+        .annotate(refs=models.Count('id'))
+    )
+    MediaBlob.objects.bulk_create(
+        [MediaBlob(name=row['cover_image'], ref_count=row['refs']) for row in counts]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0002_comment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(blank=True, db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('ref_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='cover_image',
+            field=models.ImageField(storage=games.storage.get_cover_storage, upload_to='covers/'),
+        ),
+        migrations.RunPython(count_cover_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.23 on 2026-10-19 15:55
+
+from django.db import migrations, models
+import games.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0003_media_blob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='cover_color',
+            field=models.CharField(blank=True, editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='cover_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='cover_placeholder',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='cover_thumbnail',
+            field=models.ImageField(blank=True, editable=False, storage=games.storage.get_cover_storage, upload_to='covers/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='cover_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Hashear las contraseñas de comentarios guardadas en claro
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import migrations
+
+BATCH = 500
+
+
+def hash_passwords(apps, schema_editor):
+    from games.credentials import get_hasher, is_hashed
+
+    Comment = apps.get_model("games", "Comment")
+    manager = Comment.objects.using(schema_editor.connection.alias)
+    hasher = get_hasher()
+
+    def encode(password):
+        return hasher.encode(password, hasher.salt())
+
+    # una sal por comentario; hashlib libera el GIL, así que los hilos escalan
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        pending = manager.only("id", "password").order_by("id")
+        batch = []
+        for comment in pending.iterator(chunk_size=BATCH):
+            if not is_hashed(comment.password):
+                batch.append(comment)
+            if len(batch) >= BATCH:
+                for comment, encoded in zip(batch, pool.map(encode, [c.password for c in batch])):
+                    comment.password = encoded
+                manager.bulk_update(batch, ["password"])
+                batch = []
+        for comment, encoded in zip(batch, pool.map(encode, [c.password for c in batch])):
+            comment.password = encoded
+        manager.bulk_update(batch, ["password"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0006_slow_query"),
+    ]
+
+    operations = [
+        migrations.RunPython(hash_passwords, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Tabla de la cache "ratelimit" (DatabaseCache) para que exista tras migrate
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_tables(apps, schema_editor):
+    # solo crea las tablas de los backends DatabaseCache y no toca las existentes
+    call_command("createcachetable", database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0007_hash_comment_passwords"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_tables, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-19 16:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_ratelimit_cache_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='spam_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        # los comentarios existentes ya eran visibles: se marcan publicados
+        migrations.AddField(
+            model_name='comment',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pendiente'), ('published', 'Publicado'), ('held', 'Retenido para revisión'), ('spam', 'Spam')], default='published', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pendiente'), ('published', 'Publicado'), ('held', 'Retenido para revisión'), ('spam', 'Spam')], default='pending', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['game', '-created_at'], name='comment_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['status', 'id'], name='comment_status_idx'),
+        ),
+    ]
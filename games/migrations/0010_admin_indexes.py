@@ -0,0 +1,40 @@
+# Generated by Django 4.2.23 on 2026-10-19 16:40
+
+from django.db import migrations, models
+
+# Búsquedas del admin en modo rendimiento: icontains y iexact de Django
+# comparan UPPER(columna), así que los índices son sobre esa expresión.
+# Solo PostgreSQL (pg_trgm); en SQLite no hay equivalente y se omiten.
+POSTGRES_INDEXES = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS game_title_trgm_idx ON games_game USING gin (UPPER(title) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS comment_email_upper_idx ON games_comment (UPPER(email))",
+)
+POSTGRES_DROP = (
+    "DROP INDEX IF EXISTS game_title_trgm_idx",
+    "DROP INDEX IF EXISTS comment_email_upper_idx",
+)
+
+
+def run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            for statement in statements:
+                schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0009_comment_moderation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['-release_date'], name='game_release_date_idx'),
+        ),
+        migrations.RunPython(run_on_postgres(POSTGRES_INDEXES), run_on_postgres(POSTGRES_DROP)),
+    ]
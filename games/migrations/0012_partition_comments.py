@@ -0,0 +1,102 @@
+from django.db import migrations
+
+# games_comment pasa a estar particionada por mes de created_at (solo
+# PostgreSQL; en SQLite no hay particiones y la migración no hace nada).
+# La clave primaria de una tabla particionada debe incluir la columna de
+# partición, así que es (id, created_at); el id sigue saliendo de una
+# secuencia única. Las identity no se admiten en tablas particionadas antes
+# de PostgreSQL 17, por eso el id usa DEFAULT nextval().
+# Las particiones siguientes las crea el comando comment_partitions.
+AHEAD = 3
+
+INDEXES = (
+    "CREATE INDEX games_comment_game_id_idx ON games_comment (game_id)",
+    "CREATE INDEX comment_published_idx ON games_comment (game_id, created_at DESC) WHERE status = 'published'",
+    "CREATE INDEX comment_status_idx ON games_comment (status, id)",
+    "CREATE INDEX comment_email_upper_idx ON games_comment (UPPER(email))",
+)
+NAMED_INDEXES = ("comment_published_idx", "comment_status_idx", "comment_email_upper_idx", "games_comment_game_id_idx")
+FOREIGN_KEY = (
+    "ALTER TABLE games_comment ADD CONSTRAINT games_comment_game_id_fk_games_game_id "
+    "FOREIGN KEY (game_id) REFERENCES games_game (id) DEFERRABLE INITIALLY DEFERRED"
+)
+
+
+def months(first, last):
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def swap_table(schema_editor, old):
+    execute = schema_editor.execute
+    execute(f"ALTER TABLE games_comment RENAME TO {old}")
+    # los nombres de índice son globales: se liberan para la tabla nueva
+    execute(f"ALTER INDEX games_comment_pkey RENAME TO {old}_pkey")
+    for name in NAMED_INDEXES:
+        execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    execute = schema_editor.execute
+    swap_table(schema_editor, "games_comment_plain")
+    execute("CREATE SEQUENCE games_comment_partitioned_id_seq AS bigint")
+    execute(
+        "CREATE TABLE games_comment (LIKE games_comment_plain INCLUDING DEFAULTS INCLUDING CONSTRAINTS, "
+        "PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+    )
+    execute("ALTER TABLE games_comment ALTER COLUMN id SET DEFAULT nextval('games_comment_partitioned_id_seq')")
+    execute("ALTER SEQUENCE games_comment_partitioned_id_seq OWNED BY games_comment.id")
+    execute(FOREIGN_KEY)
+    for statement in INDEXES:
+        execute(statement)
+
+    execute("CREATE TABLE games_comment_default PARTITION OF games_comment DEFAULT")
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT COALESCE(min(created_at), now()), now() + make_interval(months => %s) FROM games_comment_plain", [AHEAD])
+        first, last = cursor.fetchone()
+    for year, month in months(first, last):
+        following = (year + 1, 1) if month == 12 else (year, month + 1)
+        execute(
+            f"CREATE TABLE games_comment_p{year:04d}_{month:02d} PARTITION OF games_comment "
+            f"FOR VALUES FROM ('{year:04d}-{month:02d}-01 00:00+00') TO ('{following[0]:04d}-{following[1]:02d}-01 00:00+00')"
+        )
+
+    execute("INSERT INTO games_comment SELECT * FROM games_comment_plain")
+    execute("SELECT setval('games_comment_partitioned_id_seq', COALESCE((SELECT max(id) FROM games_comment), 0) + 1, false)")
+    execute("DROP TABLE games_comment_plain")
+    execute("ALTER SEQUENCE games_comment_partitioned_id_seq RENAME TO games_comment_id_seq")
+
+
+def unpartition(apps, schema_editor):
+    # solo vuelven las particiones adjuntas; las archivadas siguen en sus .csv.gz
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    execute = schema_editor.execute
+    swap_table(schema_editor, "games_comment_partitioned")
+    execute("ALTER SEQUENCE games_comment_id_seq RENAME TO games_comment_partitioned_id_seq")
+    execute("CREATE TABLE games_comment (LIKE games_comment_partitioned INCLUDING CONSTRAINTS)")
+    execute("ALTER TABLE games_comment ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY, ADD PRIMARY KEY (id)")
+    execute(FOREIGN_KEY)
+    for statement in INDEXES:
+        execute(statement)
+    execute("INSERT INTO games_comment SELECT * FROM games_comment_partitioned")
+    execute(
+        "SELECT setval(pg_get_serial_sequence('games_comment', 'id'), "
+        "COALESCE((SELECT max(id) FROM games_comment), 0) + 1, false)"
+    )
+    execute("DROP TABLE games_comment_partitioned")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0011_bulk_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
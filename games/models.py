@@ -1,4 +1,8 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+
+from .storage import get_cover_storage
 
 # Create your models here.
 
@@ -21,23 +25,205 @@ class Game(models.Model):
     description = models.TextField()
     min_requirements = models.TextField(blank=True, null=True)
     max_requirements = models.TextField(blank=True, null=True)
-    cover_image = models.ImageField(upload_to='covers/')
+    cover_image = models.ImageField(upload_to='covers/', storage=get_cover_storage)
+    # derivados de la portada, calculados al subirla (games.images)
+    cover_thumbnail = models.ImageField(upload_to='covers/thumbs/', storage=get_cover_storage, blank=True, editable=False)
+    cover_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    cover_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    cover_placeholder = models.TextField(blank=True, editable=False)
+    cover_color = models.CharField(max_length=7, blank=True, editable=False)
     trailer_url = models.URLField(blank=True, null=True)
     download_link = models.URLField()
     release_date = models.DateField()
 
+    class Meta:
+        indexes = [
+            # portada (últimos lanzamientos) y filtro por fecha del admin
+            models.Index(fields=['-release_date'], name='game_release_date_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
 
 # Modelo para comentarios de usuarios en juegos
 class Comment(models.Model):
+    # Se guardan pendientes; moderate_comments los puntúa y publica o retiene
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pendiente'
+        PUBLISHED = 'published', 'Publicado'
+        HELD = 'held', 'Retenido para revisión'
+        SPAM = 'spam', 'Spam'
+
     game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='comments')
     nickname = models.CharField(max_length=50)
     email = models.EmailField()
+    # Hash (games.credentials), nunca la contraseña en claro
     password = models.CharField(max_length=128)
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    spam_score = models.FloatField(null=True, blank=True)
+    # admin que decidió el estado; vacío si lo decidió el worker (no entrena el clasificador)
+    moderated_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='+'
+    )
+
+    class Meta:
+        indexes = [
+            # game_detail solo lee publicados: el índice parcial no contiene spam ni pendientes
+            models.Index(
+                fields=['game', '-created_at'],
+                name='comment_published_idx',
+                condition=models.Q(status='published'),
+            ),
+            models.Index(fields=['status', 'id'], name='comment_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nickname} - {self.game.title}"
+
+    def set_password(self, raw_password):
+        from .credentials import make
+
+        self.password = make(raw_password)
+
+    def check_password(self, raw_password):
+        """Verifica y, si el hash usa parámetros antiguos, lo actualiza"""
+        from .credentials import verify
+
+        def setter(raw_password):
+            self.set_password(raw_password)
+            if self.pk:
+                self.save(update_fields=["password"])
+
+        return verify(raw_password, self.password, setter)
+
+
+# Blobs de media direccionados por contenido, con conteo de referencias
+class MediaBlobManager(models.Manager):
+    def retain(self, name, sha256="", size=0, count=1):
+        """Sumar referencias al blob (lo crea si no existe)"""
+        blob, created = self.get_or_create(
+            name=name, defaults={"sha256": sha256, "size": size, "ref_count": count}
+        )
+        if not created:
+            self.filter(pk=blob.pk).update(ref_count=F("ref_count") + count)
+
+    def release(self, name, storage, count=1):
+        """Restar referencias; al llegar a cero se borra el archivo"""
+        self.filter(name=name).update(ref_count=F("ref_count") - count)
+        deleted, _ = self.filter(name=name, ref_count__lte=0).delete()
+        if deleted:
+            transaction.on_commit(lambda: storage.delete(name))
+
+
+class MediaBlob(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = MediaBlobManager()
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
+
+
+class RequestProfileManager(models.Manager):
+    def prune(self, keep):
+        """Conservar solo los `keep` perfiles más recientes (y sus archivos)"""
+        from .profiling import profile_path
+
+        old = self.order_by("-created_at", "-pk")[keep:]
+        for profile in old:
+            profile_path(profile.filename).unlink(missing_ok=True)
+            profile.delete()
+
+
+# Perfil de muestreo de una petición (games.profiling)
+class RequestProfile(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view_name = models.CharField(max_length=100, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    samples = models.PositiveIntegerField(default=0)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    filename = models.CharField(max_length=100)
+
+    objects = RequestProfileManager()
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+# Consultas lentas agrupadas por huella (games.slowlog)
+class SlowQuery(models.Model):
+    fingerprint = models.CharField(max_length=16, unique=True)
+    normalized = models.TextField()
+    example = models.TextField()
+    source = models.CharField(max_length=255, blank=True)
+    vendor = models.CharField(max_length=20)
+    calls = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    last_ms = models.FloatField(default=0)
+    plan = models.TextField(blank=True)
+    explained_at = models.DateTimeField(null=True, blank=True)
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-total_ms"]
+        verbose_name_plural = "slow queries"
+
+    def __str__(self):
+        return f"{self.fingerprint} ({self.calls} llamadas, {self.total_ms:.0f} ms)"
+
+    @property
+    def avg_ms(self):
+        return self.total_ms / self.calls if self.calls else 0
+
+
+# Acciones masivas del admin ejecutadas por lotes en segundo plano (games.bulkjobs)
+class BulkJob(models.Model):
+    class Action(models.TextChoices):
+        RECATEGORIZE = "recategorize", "Cambiar categoría"
+        DELETE = "delete", "Borrar"
+        REPROCESS_COVERS = "reprocess_covers", "Reprocesar portadas"
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "En cola"
+        RUNNING = "running", "En curso"
+        DONE = "done", "Terminado"
+        FAILED = "failed", "Fallido"
+
+    action = models.CharField(max_length=20, choices=Action.choices)
+    params = models.JSONField(default=dict, blank=True)
+    object_ids = models.JSONField(default=list)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # latido del worker: un trabajo "en curso" sin cambios se considera abandonado
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "id"], name="bulkjob_status_idx")]
+
+    def __str__(self):
+        return f"{self.get_action_display()} ({self.processed}/{self.total})"
+
+    @property
+    def progress(self):
+        return 100 * self.processed // self.total if self.total else 100
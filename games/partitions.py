@@ -0,0 +1,163 @@
+"""
+Particiones mensuales de games_comment (solo PostgreSQL)
+La migración 0012 convierte games_comment en una tabla particionada por
+rango de created_at: una partición por mes (games_comment_pAAAA_MM) más una
+partición DEFAULT que recoge lo que no tenga mes creado. Los índices del
+modelo se definen en la tabla padre y PostgreSQL los crea en cada partición.
+
+El comando comment_partitions crea por adelantado los meses siguientes
+(COMMENT_PARTITION_AHEAD) y archiva los que superan
+COMMENT_ARCHIVE_AFTER_MONTHS: DETACH, volcado a CSV comprimido en
+COMMENT_ARCHIVE_DIR y DROP. En SQLite la tabla sigue siendo normal.
+
+game_detail solo muestra los COMMENT_PAGE_SIZE comentarios más recientes y
+los busca primero en los últimos COMMENT_RECENT_MONTHS meses: con el filtro
+por created_at el planificador descarta las particiones antiguas. Solo si el
+juego tiene pocos comentarios recientes se consulta el resto.
+"""
+
+import datetime
+import gzip
+import os
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Comment
+
+TABLE = Comment._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_RE = re.compile(rf"^{TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(value):
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def month_bound(month):
+    # los límites de las particiones son instantes UTC (created_at es timestamptz)
+    return datetime.datetime(month.year, month.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def partition_name(month):
+    return f"{TABLE}_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name):
+    match = PARTITION_RE.match(name)
+    return datetime.date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def is_partitioned(using=connection):
+    if using.vendor != "postgresql":
+        return False
+    with using.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [TABLE])
+        return cursor.fetchone() is not None
+
+
+def attached_partitions(using=connection):
+    """Meses con partición adjunta, ordenados"""
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits JOIN pg_class child ON child.oid = inhrelid "
+            "WHERE inhparent = %s::regclass",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    return sorted(month for month in map(partition_month, names) if month)
+
+
+def create_partition(month, using=connection):
+    """
+    Crear la partición de un mes. Las filas de ese mes que hubieran caído en
+    la partición DEFAULT se mueven antes de adjuntarla (ATTACH falla si la
+    DEFAULT contiene filas del rango).
+    """
+    name = partition_name(month)
+    start, end = month_bound(month), month_bound(add_months(month, 1))
+    quote = using.ops.quote_name
+    with transaction.atomic(using=using.alias), using.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {quote(name)} (LIKE {quote(TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {quote(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s "
+            f"RETURNING *) INSERT INTO {quote(name)} SELECT * FROM moved",
+            [start, end],
+        )
+        cursor.execute(
+            f"ALTER TABLE {quote(TABLE)} ATTACH PARTITION {quote(name)} FOR VALUES FROM (%s) TO (%s)", [start, end]
+        )
+    return name
+
+
+def missing_partitions(ahead=None, today=None, using=connection):
+    """Meses sin partición entre el actual y `ahead` meses después"""
+    ahead = settings.COMMENT_PARTITION_AHEAD if ahead is None else ahead
+    current = month_start(today or timezone.now())
+    existing = set(attached_partitions(using))
+    return [month for month in (add_months(current, n) for n in range(ahead + 1)) if month not in existing]
+
+
+def ensure_partitions(ahead=None, today=None, using=connection):
+    """Crear las particiones que falten; devuelve sus nombres"""
+    return [create_partition(month, using) for month in missing_partitions(ahead, today, using)]
+
+
+def archivable(after_months=None, today=None, using=connection):
+    """Meses adjuntos que terminaron hace más de `after_months` meses (0 = nunca)"""
+    after_months = settings.COMMENT_ARCHIVE_AFTER_MONTHS if after_months is None else after_months
+    if not after_months:
+        return []
+    cutoff = add_months(month_start(today or timezone.now()), -after_months)
+    return [month for month in attached_partitions(using) if month < cutoff]
+
+
+def archive_partition(month, directory=None, keep_table=False, using=connection):
+    """
+    DETACH de la partición y volcado a {directory}/{tabla}.csv.gz; la tabla se
+    borra salvo keep_table (queda desadjunta, fuera de las consultas).
+
+    Returns:
+        tuple: (ruta del archivo o None, filas volcadas)
+    """
+    name = partition_name(month)
+    quote = using.ops.quote_name
+    with using.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(name)}")
+    if keep_table:
+        return None, None
+
+    directory = directory or settings.COMMENT_ARCHIVE_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.csv.gz")
+    partial = f"{path}.partial"
+    with using.cursor() as cursor:
+        with gzip.open(partial, "wb") as archive:
+            cursor.copy_expert(f"COPY {quote(name)} TO STDOUT WITH (FORMAT csv, HEADER)", archive)
+        cursor.execute(f"SELECT count(*) FROM {quote(name)}")
+        rows = cursor.fetchone()[0]
+        # la tabla solo se borra con el archivo completo en disco
+        os.replace(partial, path)
+        cursor.execute(f"DROP TABLE {quote(name)}")
+    return path, rows
+
+
+def recent_comments(game, limit=None, months=None):
+    """Los `limit` comentarios publicados más recientes, empezando por los últimos meses"""
+    limit = settings.COMMENT_PAGE_SIZE if limit is None else limit
+    months = settings.COMMENT_RECENT_MONTHS if months is None else months
+    published = game.comments.filter(status=Comment.Status.PUBLISHED).order_by("-created_at")
+    if not months:
+        return list(published[:limit])
+    since = month_bound(add_months(month_start(timezone.now()), -months))
+    comments = list(published.filter(created_at__gte=since)[:limit])
+    if len(comments) < limit:
+        comments += published.filter(created_at__lt=since)[: limit - len(comments)]
+    return comments
@@ -0,0 +1,174 @@
+"""
+Sondeo concurrente de salud y TLS
+Para cada URL mide conexión TCP, handshake TLS, caducidad del certificado,
+código HTTP y latencia hasta la primera línea de respuesta. Todas las URLs
+se sondean a la vez con asyncio, con un semáforo que limita la concurrencia.
+Lo usa el comando probe; sustituye la comprobación en serie de test_ssl.py.
+
+Solo API de asyncio disponible desde Python 3.8 (runtime de vercel.json):
+el socket se conecta con sock_connect y el handshake se hace al pasarlo a
+open_connection(ssl=...), sin StreamWriter.start_tls (3.11+).
+"""
+
+import asyncio
+import datetime
+import socket
+import ssl
+import time
+from urllib.parse import urlsplit
+
+USER_AGENT = "DaveGames Probe/1.0"
+
+
+def ssl_context(cafile=None, insecure=False):
+    context = ssl.create_default_context(cafile=cafile)
+    if insecure:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def cert_expiry(cert):
+    """Fecha de caducidad (UTC) del certificado devuelto por getpeercert()"""
+    if not cert or "notAfter" not in cert:
+        return None
+    return datetime.datetime.fromtimestamp(ssl.cert_time_to_seconds(cert["notAfter"]), datetime.timezone.utc)
+
+
+def elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+async def tcp_connect(host, port):
+    """Socket TCP conectado a la primera dirección de `host` que responda"""
+    loop = asyncio.get_running_loop()
+    error = None
+    for family, type_, proto, _, address in await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+        sock = socket.socket(family, type_, proto)
+        sock.setblocking(False)
+        try:
+            await loop.sock_connect(sock, address)
+            return sock
+        except BaseException as exc:
+            # también al cancelarse por timeout: el socket no debe quedar abierto
+            sock.close()
+            if not isinstance(exc, OSError):
+                raise
+            error = exc
+    raise error or OSError(f"sin direcciones para {host}")
+
+
+async def read_status(reader):
+    line = await reader.readline()
+    parts = line.decode("latin-1").split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+        raise ValueError(f"respuesta HTTP inválida: {line[:80]!r}")
+    # cabeceras hasta la línea vacía; el cuerpo no hace falta
+    while (await reader.readline()).strip():
+        pass
+    return int(parts[1])
+
+
+async def probe_url(url, semaphore, context, timeout, warn_days):
+    """
+    Returns:
+        dict: resultado del sondeo (ok=False con error si algo falla)
+    """
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    secure = parts.scheme == "https"
+    host = parts.hostname
+    port = parts.port or (443 if secure else 80)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    result = {
+        "url": url,
+        "ok": False,
+        "error": None,
+        "connect_ms": None,
+        "tls_ms": None,
+        "tls_version": None,
+        "cert_expires": None,
+        "cert_days_left": None,
+        "status": None,
+        "latency_ms": None,
+    }
+
+    async with semaphore:
+        sock = writer = None
+        try:
+            start = time.perf_counter()
+            sock = await asyncio.wait_for(tcp_connect(host, port), timeout)
+            result["connect_ms"] = elapsed_ms(start)
+
+            if secure:
+                start = time.perf_counter()
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(sock=sock, ssl=context, server_hostname=host), timeout
+                )
+                result["tls_ms"] = elapsed_ms(start)
+                ssl_object = writer.get_extra_info("ssl_object")
+                result["tls_version"] = ssl_object.version()
+                expires = cert_expiry(ssl_object.getpeercert())
+                if expires:
+                    result["cert_expires"] = expires.isoformat()
+                    result["cert_days_left"] = (expires - datetime.datetime.now(datetime.timezone.utc)).days
+            else:
+                reader, writer = await asyncio.open_connection(sock=sock)
+
+            host_header = host if parts.port is None else f"{host}:{port}"
+            request = (
+                f"GET {path} HTTP/1.1\r\nHost: {host_header}\r\nUser-Agent: {USER_AGENT}\r\n"
+                "Accept: */*\r\nConnection: close\r\n\r\n"
+            )
+            start = time.perf_counter()
+            writer.write(request.encode("latin-1"))
+            await writer.drain()
+            result["status"] = await asyncio.wait_for(read_status(reader), timeout)
+            result["latency_ms"] = elapsed_ms(start)
+        except asyncio.TimeoutError:
+            result["error"] = f"timeout ({timeout}s)"
+        except (OSError, ValueError) as exc:
+            result["error"] = str(exc) or exc.__class__.__name__
+        finally:
+            if writer is None and sock is not None:
+                # handshake fallido o cancelado: cerrar el socket aunque el transporte ya lo haya hecho
+                sock.close()
+            if writer is not None:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+
+    if result["error"] is None:
+        if result["status"] >= 500:
+            result["error"] = f"HTTP {result['status']}"
+        elif result["cert_days_left"] is not None and result["cert_days_left"] < warn_days:
+            result["error"] = f"el certificado caduca en {result['cert_days_left']} días"
+        else:
+            result["ok"] = True
+    return result
+
+
+async def probe_all(urls, concurrency=20, timeout=10.0, cafile=None, insecure=False, warn_days=14):
+    semaphore = asyncio.Semaphore(concurrency)
+    context = ssl_context(cafile, insecure)
+    return await asyncio.gather(*(probe_url(url, semaphore, context, timeout, warn_days) for url in urls))
+
+
+def run(urls, **options):
+    """
+    Returns:
+        dict: informe con la hora de generación, los resultados y un resumen
+    """
+    start = time.perf_counter()
+    results = asyncio.run(probe_all(urls, **options))
+    return {
+        "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "seconds": round(time.perf_counter() - start, 3),
+        "summary": {
+            "total": len(results),
+            "ok": sum(1 for result in results if result["ok"]),
+            "failed": sum(1 for result in results if not result["ok"]),
+        },
+        "results": results,
+    }
@@ -0,0 +1,160 @@
+"""
+Perfilado bajo demanda de una petición
+Un profiler de muestreo (hilo que lee la pila del hilo de la petición cada
+PROFILE_INTERVAL segundos) guarda pilas colapsadas en PROFILES_DIR; se
+abren en speedscope o flamegraph.pl y se consultan desde el admin.
+
+Se activa con ?_profile=1 siendo staff o con la cabecera X-Profile firmada
+(python manage.py profile_token), útil para curl y loadtest.
+"""
+
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+
+PROFILE_PARAM = "_profile"
+PROFILE_HEADER = "X-Profile"
+TOKEN_SALT = "games.profiling"
+
+
+def make_token():
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign("profile")
+
+
+def valid_token(value):
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(value, max_age=settings.PROFILE_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def frame_label(code):
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Cuenta las pilas observadas de un hilo (formato de pilas colapsadas)"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def speedscope_json(collapsed, name):
+    """Convertir pilas colapsadas al formato 'sampled' de speedscope"""
+    frames, index, samples, weights = [], {}, [], []
+    for line in collapsed.splitlines():
+        stack, _, count = line.rpartition(" ")
+        sample = []
+        for label in stack.split(";"):
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({"name": label})
+            sample.append(index[label])
+        samples.append(sample)
+        weights.append(int(count))
+    return json.dumps(
+        {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "none",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+    )
+
+
+def profile_path(name):
+    return Path(settings.PROFILES_DIR) / name
+
+
+class ProfilingMiddleware:
+    """Debe ir después de AuthenticationMiddleware (usa request.user)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def wants_profile(self, request):
+        header = request.headers.get(PROFILE_HEADER)
+        if header:
+            return valid_token(header)
+        if PROFILE_PARAM in request.GET:
+            user = getattr(request, "user", None)
+            return bool(user and user.is_staff)
+        return False
+
+    def __call__(self, request):
+        if not self.wants_profile(request):
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with SamplingProfiler(threading.get_ident(), settings.PROFILE_INTERVAL) as profiler:
+            response = self.get_response(request)
+        duration = (time.perf_counter() - start) * 1000
+
+        profile = self.save(request, response, profiler, duration)
+        response["X-Profile-Id"] = str(profile.pk)
+        return response
+
+    def save(self, request, response, profiler, duration):
+        from .models import RequestProfile
+
+        directory = Path(settings.PROFILES_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        filename = f"{uuid.uuid4().hex}.folded"
+        (directory / filename).write_text(profiler.collapsed(), encoding="utf-8")
+
+        match = getattr(request, "resolver_match", None)
+        user = getattr(request, "user", None)
+        profile = RequestProfile.objects.create(
+            method=request.method,
+            path=request.get_full_path()[:500],
+            view_name=match.view_name if match else "",
+            status_code=response.status_code,
+            duration_ms=duration,
+            samples=sum(profiler.stacks.values()),
+            user=user if user and user.is_authenticated else None,
+            filename=filename,
+        )
+        RequestProfile.objects.prune(settings.PROFILE_KEEP)
+        return profile
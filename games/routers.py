@@ -0,0 +1,137 @@
+"""
+Réplicas de lectura para el catálogo
+Las lecturas de Game, Category y Comment que hacen las vistas públicas
+(games.views) en peticiones GET/HEAD van a una réplica de
+DATABASE_REPLICAS; todo lo demás (escrituras, admin, comandos, POST) sigue
+en default.
+
+- Retraso: cada REPLICA_CHECK_INTERVAL segundos se mide el retraso de cada
+  réplica (PostgreSQL: replay pendiente; otros motores: solo que responda).
+  Si ninguna está por debajo de REPLICA_MAX_LAG se lee del primario.
+- Leer lo propio: tras una escritura con éxito el cliente recibe la cookie
+  db_primary y sus lecturas van al primario durante REPLICA_PIN_SECONDS
+  (0 = hasta cerrar el navegador).
+
+Para probarlo en local con SQLite: copiar la base de datos y arrancar con
+DATABASE_URL=sqlite:///primary.sqlite3 DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3
+"""
+
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from .metrics import registry
+
+PIN_COOKIE = "db_primary"
+SAFE_METHODS = ("GET", "HEAD")
+ROUTED_MODELS = {"game", "category", "comment"}
+
+# PostgreSQL en recuperación: segundos desde la última transacción aplicada,
+# o 0 si ya aplicó todo lo recibido (un primario sin escrituras no es retraso)
+POSTGRES_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+_use_replicas = ContextVar("use_replicas", default=False)
+_lag = {}
+_lag_lock = threading.Lock()
+
+replica_reads = registry.counter(
+    "davegames_replica_reads_total", "Vistas del catálogo por base de datos elegida y motivo"
+)
+
+
+def measure_lag(alias):
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        connection.ensure_connection()
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(POSTGRES_LAG_SQL)
+        return float(cursor.fetchone()[0])
+
+
+def replica_lag(alias):
+    """Retraso en segundos (cacheado REPLICA_CHECK_INTERVAL), o None si no responde"""
+    now = time.monotonic()
+    with _lag_lock:
+        cached = _lag.get(alias)
+    if cached and now - cached[0] < settings.REPLICA_CHECK_INTERVAL:
+        return cached[1]
+    try:
+        lag = measure_lag(alias)
+    except DatabaseError:
+        lag = None
+    with _lag_lock:
+        _lag[alias] = (now, lag)
+    return lag
+
+
+def healthy_replicas():
+    return [
+        alias for alias in settings.DATABASE_REPLICAS
+        if (lag := replica_lag(alias)) is not None and lag <= settings.REPLICA_MAX_LAG
+    ]
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _use_replicas.get() or model._meta.app_label != "games" or model._meta.model_name not in ROUTED_MODELS:
+            return None
+        # dentro de una transacción del primario se lee lo que ella ve
+        if connections["default"].in_atomic_block:
+            return "default"
+        replicas = healthy_replicas()
+        if not replicas:
+            _use_replicas.set(False)
+            replica_reads.inc(database="default", reason="lag")
+            return "default"
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # las réplicas tienen los mismos datos que el primario
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # el esquema llega a las réplicas por replicación
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        token = _use_replicas.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replicas.reset(token)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            max_age = settings.REPLICA_PIN_SECONDS or None
+            response.set_cookie(PIN_COOKIE, "1", max_age=max_age, httponly=True, samesite="Lax")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not settings.DATABASE_REPLICAS or view_func.__module__ != "games.views":
+            return None
+        if request.method not in SAFE_METHODS:
+            return None
+        if PIN_COOKIE in request.COOKIES:
+            replica_reads.inc(database="default", reason="pinned")
+            return None
+        _use_replicas.set(True)
+        replica_reads.inc(database="replica", reason="catalog")
+        return None
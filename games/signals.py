@@ -0,0 +1,103 @@
+# señales de los modelos de juegos
+import logging
+import posixpath
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .images import process_cover
+from .media import is_content_hashed
+from .cache import bump_catalog, bump_game
+from .edge import NAV, game_key, purge, purge_games
+from .models import Category, Comment, Game, MediaBlob
+
+logger = logging.getLogger(__name__)
+
+# campos de Game guardados en el storage direccionado por contenido
+MEDIA_FIELDS = ("cover_image", "cover_thumbnail")
+
+
+def _storage(field):
+    return Game._meta.get_field(field).storage
+
+
+def retain_media(field, name, count=1):
+    """Sumar referencias a un archivo de `field` (también desde bulk_update, sin señales)"""
+    storage = _storage(field)
+    size = storage.size(name) if storage.exists(name) else 0
+    stem = posixpath.splitext(posixpath.basename(name))[0]
+    sha256 = stem if len(stem) == 64 and is_content_hashed(name) else ""
+    MediaBlob.objects.retain(name, sha256=sha256, size=size, count=count)
+
+
+# Guardar las portadas anteriores y procesar la nueva si cambió
+@receiver(pre_save, sender=Game)
+def prepare_cover(sender, instance, raw=False, **kwargs):
+    instance._previous_media = {}
+    instance._previous_category_id = None
+    if raw:
+        return
+    if instance.pk:
+        instance._previous_media = (
+            Game.objects.filter(pk=instance.pk).values(*MEDIA_FIELDS, "category_id").first() or {}
+        )
+        instance._previous_category_id = instance._previous_media.pop("category_id", None)
+    cover = instance.cover_image
+    changed = cover.name != instance._previous_media.get("cover_image")
+    if changed or (cover and not instance.cover_width):
+        try:
+            process_cover(instance)
+        except OSError:
+            # Portada ilegible o ausente: se guarda el juego sin derivados
+            logger.warning("No se pudo procesar la portada %s", cover.name, exc_info=True)
+
+
+@receiver(post_save, sender=Game)
+def update_cover_references(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous_media = getattr(instance, "_previous_media", {})
+    for field in MEDIA_FIELDS:
+        previous = previous_media.get(field)
+        current = getattr(instance, field).name
+        if current == previous:
+            continue
+        if current:
+            retain_media(field, current)
+        if previous:
+            MediaBlob.objects.release(previous, _storage(field))
+
+
+@receiver(post_delete, sender=Game)
+def release_cover_reference(sender, instance, **kwargs):
+    for field in MEDIA_FIELDS:
+        name = getattr(instance, field).name
+        if name:
+            MediaBlob.objects.release(name, _storage(field))
+
+
+# Invalidar la cache de páginas, navegación y fragmentos (y el CDN, games.edge)
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def invalidate_game(sender, instance, **kwargs):
+    bump_catalog()
+    previous = getattr(instance, "_previous_category_id", None)
+    purge_games([instance.pk], {instance.category_id, previous} - {None})
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, **kwargs):
+    bump_catalog()
+    # el menú de categorías está en todas las páginas
+    purge(NAV)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_game_comments(sender, instance, created=False, **kwargs):
+    # un comentario nuevo queda pendiente: no cambia lo que se muestra
+    if created and instance.status == Comment.Status.PENDING:
+        return
+    bump_game(instance.game_id)
+    purge(game_key(instance.game_id))
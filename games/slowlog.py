@@ -0,0 +1,188 @@
+"""
+Registro de consultas lentas
+Un execute_wrapper instalado en cada conexión cronometra todas las consultas.
+Las que superan SLOW_QUERY_MS se agrupan por huella (SQL normalizado, sin
+literales) en SlowQuery, con el plan de EXPLAIN y el punto del código de la
+app que las lanzó. Se consultan con el comando slow_queries y en el admin.
+
+El registro (y el EXPLAIN) se hace al terminar la petición, no dentro del
+wrapper: así no se interfiere con cursores abiertos ni con la transacción.
+Fuera de una petición (comandos, workers) no llega request_finished: los
+workers vacían la cola al terminar cada lote, fuera de su transacción, y
+atexit lo pendiente al salir. Entre vaciados la cola guarda como mucho las
+últimas MAX_PENDING consultas.
+El EXPLAIN va a la conexión que lanzó la consulta (también una réplica);
+SlowQuery se escribe siempre en la base de datos de escritura.
+"""
+
+import atexit
+import hashlib
+import logging
+import re
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connections, router, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+logger = logging.getLogger("games.perf")
+
+APP_DIR = str(Path(__file__).resolve().parent)
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+PARAM_RE = re.compile(r"%s|\?|\$\d+")
+IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+SPACE_RE = re.compile(r"\s+")
+
+# consultas lentas en cola por hilo; las más antiguas se descartan si no se vacía
+MAX_PENDING = 100
+
+_state = threading.local()
+
+
+def normalize(sql):
+    """SQL sin literales ni parámetros: consultas iguales salvo valores coinciden"""
+    sql = STRING_RE.sub("?", sql)
+    sql = PARAM_RE.sub("?", sql)
+    sql = NUMBER_RE.sub("?", sql)
+    sql = IN_LIST_RE.sub("(...)", sql)
+    return SPACE_RE.sub(" ", sql).strip()
+
+
+def fingerprint(sql):
+    return hashlib.sha1(normalize(sql).encode()).hexdigest()[:16]
+
+
+def call_site():
+    """Primer marco de la pila que pertenece a la app (views.py, admin.py...)"""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(APP_DIR) and not frame.filename.endswith(("slowlog.py", "instrumentation.py")):
+            return f"{Path(frame.filename).relative_to(Path(APP_DIR).parent)}:{frame.lineno} ({frame.name})"
+    return ""
+
+
+def explain(connection, sql, params):
+    """
+    Plan de la consulta. En PostgreSQL, EXPLAIN (ANALYZE, BUFFERS) solo para
+    SELECT: ANALYZE ejecuta la sentencia y no debe repetir escrituras.
+    """
+    is_select = sql.lstrip().upper().startswith(("SELECT", "WITH"))
+    if connection.vendor == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if is_select else "EXPLAIN "
+    elif connection.vendor == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        prefix = "EXPLAIN "
+    try:
+        # savepoint: un EXPLAIN fallido no debe abortar la transacción en curso
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+    except DatabaseError as exc:
+        return f"EXPLAIN no disponible: {exc}"
+    return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+
+
+def record(connection, sql, params, duration_ms, source=""):
+    from .models import SlowQuery
+
+    fp = fingerprint(sql)
+    now = timezone.now()
+    updates = {
+        "calls": F("calls") + 1,
+        "total_ms": F("total_ms") + duration_ms,
+        "max_ms": Greatest(F("max_ms"), duration_ms),
+        "last_ms": duration_ms,
+        "last_seen": now,
+    }
+    # las réplicas son de solo lectura: el registro va al primario
+    using = router.db_for_write(SlowQuery)
+    queryset = SlowQuery.objects.using(using).filter(fingerprint=fp)
+    stale = now - timedelta(seconds=settings.SLOW_QUERY_EXPLAIN_INTERVAL)
+    needs_plan = not queryset.filter(explained_at__gte=stale).exists()
+    if needs_plan:
+        updates.update(plan=explain(connection, sql, params), explained_at=now, example=sql[:10000])
+
+    if queryset.update(**updates):
+        return
+    try:
+        with transaction.atomic(using=using):
+            SlowQuery.objects.using(using).create(
+                fingerprint=fp,
+                normalized=normalize(sql)[:10000],
+                example=sql[:10000],
+                source=source,
+                vendor=connection.vendor,
+                calls=1,
+                total_ms=duration_ms,
+                max_ms=duration_ms,
+                last_ms=duration_ms,
+                plan=updates.get("plan", ""),
+                explained_at=now if needs_plan else None,
+                first_seen=now,
+                last_seen=now,
+            )
+    except IntegrityError:
+        # otro proceso la creó entre el update y el create
+        queryset.update(**updates)
+
+
+class SlowQueryWrapper:
+    """execute_wrapper permanente; se instala al abrir cada conexión"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_state, "active", False):
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - start) * 1000
+        if duration_ms >= settings.SLOW_QUERY_MS and not many:
+            pending().append((self.connection.alias, sql, params, duration_ms, call_site()))
+        return result
+
+
+def pending():
+    if not hasattr(_state, "pending"):
+        _state.pending = deque(maxlen=MAX_PENDING)
+    return _state.pending
+
+
+def flush(**kwargs):
+    """
+    Registrar las consultas lentas pendientes del hilo. Receptor de
+    request_finished; los workers lo llaman tras cada lote, fuera de atomic().
+    """
+    queue, _state.pending = pending(), deque(maxlen=MAX_PENDING)
+    if not queue:
+        return
+    _state.active = True
+    try:
+        for alias, sql, params, duration_ms, source in queue:
+            try:
+                record(connections[alias], sql, params, duration_ms, source)
+            except DatabaseError:
+                logger.warning("No se pudo registrar la consulta lenta", exc_info=True)
+    finally:
+        _state.active = False
+
+
+atexit.register(flush)
+
+
+def install(sender, connection, **kwargs):
+    """Receptor de connection_created"""
+    if settings.SLOW_QUERY_MS <= 0:
+        return
+    if not any(isinstance(wrapper, SlowQueryWrapper) for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.append(SlowQueryWrapper(connection))
@@ -0,0 +1,128 @@
+"""
+Build incremental de estáticos
+collectstatic con WhiteNoise copia, hashea y comprime cada archivo en serie en
+cada build. Aquí se guarda en STATIC_ROOT un registro con el sha256 de cada
+origen copiado y de cada archivo comprimido:
+
+- build_static no vuelve a copiar un archivo cuyo contenido no cambió (no se
+  fía de las fechas, que un checkout nuevo reescribe).
+- ParallelCompressedManifestStorage solo comprime lo nuevo, repartido en un
+  pool de procesos (gzip/brotli son CPU pura).
+
+Con STATIC_ROOT=staticfiles_build el build escribe directamente en el
+directorio que publica Vercel, sin segunda copia.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+BUILD_CACHE_NAME = ".staticbuild.json"
+
+
+def file_digest(handle):
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: handle.read(1 << 16), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def path_digest(path):
+    with open(path, "rb") as handle:
+        return file_digest(handle)
+
+
+def build_workers():
+    return settings.STATIC_BUILD_WORKERS or os.cpu_count() or 1
+
+
+class BuildCache:
+    """
+    Registro del último build: {"sources": {ruta: sha256},
+    "compressed": {nombre: [sha256, [salidas]]}}
+    """
+
+    def __init__(self, root):
+        self.path = Path(root) / BUILD_CACHE_NAME
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.sources = data.get("sources", {})
+        self.compressed = data.get("compressed", {})
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"sources": self.sources, "compressed": self.compressed}
+        self.path.write_text(json.dumps(data, sort_keys=True), encoding="utf-8")
+
+
+def compress_path(path, extensions):
+    """Se ejecuta en el pool: devuelve las rutas .gz/.br escritas"""
+    from whitenoise.compress import Compressor
+
+    return list(Compressor(extensions=extensions, quiet=True).compress(path))
+
+
+class ParallelCompressedManifestStorage(CompressedManifestStaticFilesStorage):
+    """
+    Igual que el storage de WhiteNoise, pero la compresión salta los archivos
+    ya comprimidos en un build anterior y reparte el resto entre procesos.
+    """
+
+    build_cache = None
+    compress_stats = None
+
+    def compress_files(self, names):
+        extensions = getattr(settings, "WHITENOISE_SKIP_COMPRESS_EXTENSIONS", None)
+        compressor = self.create_compressor(extensions=extensions, quiet=True)
+        cache = self.build_cache or BuildCache(self.location)
+        stats = self.compress_stats = {"compressed": 0, "reused": 0, "workers": 0}
+
+        pending = []
+        for name in sorted(names):
+            if not compressor.should_compress(name):
+                continue
+            path = self.path(name)
+            digest = path_digest(path)
+            previous = cache.compressed.get(name)
+            if previous and previous[0] == digest and all(
+                os.path.exists(self.path(output)) for output in previous[1]
+            ):
+                stats["reused"] += 1
+                continue
+            pending.append((name, path, digest))
+
+        if not pending:
+            return
+        workers = min(build_workers(), len(pending))
+        stats["workers"] = workers
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(pending) // (workers * 4))
+                results = list(
+                    pool.map(
+                        compress_path,
+                        [path for _, path, _ in pending],
+                        [extensions] * len(pending),
+                        chunksize=chunksize,
+                    )
+                )
+        else:
+            results = [compress_path(path, extensions) for _, path, _ in pending]
+
+        for (name, path, digest), compressed_paths in zip(pending, results):
+            prefix_len = len(path) - len(name)
+            outputs = [compressed_path[prefix_len:] for compressed_path in compressed_paths]
+            cache.compressed[name] = [digest, outputs]
+            stats["compressed"] += 1
+            for compressed_name in outputs:
+                yield name, compressed_name
+        if self.build_cache is None:
+            cache.save()
@@ -0,0 +1,57 @@
+"""
+Almacenamiento de media direccionado por contenido
+Cada archivo se guarda una sola vez con el nombre <dir>/<ab>/<sha256>.<ext>
+"""
+
+import hashlib
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+CHUNK_SIZE = 64 * 1024
+
+
+def file_digest(fileobj):
+    """SHA-256 del contenido de un archivo (File de Django o archivo abierto)"""
+    sha = hashlib.sha256()
+    if hasattr(fileobj, "chunks"):
+        for chunk in fileobj.chunks(CHUNK_SIZE):
+            sha.update(chunk)
+    else:
+        for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def hashed_name(name, digest):
+    """Nombre direccionado por contenido conservando directorio y extensión"""
+    dirname = posixpath.dirname(name)
+    ext = posixpath.splitext(name)[1].lower()
+    return posixpath.join(dirname, digest[:2], digest + ext)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage que deduplica por SHA-256: si el contenido ya existe
+    devuelve el nombre existente en vez de escribir una copia renombrada.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = hashed_name(name, file_digest(content))
+        if self.exists(name):
+            return name
+        content.seek(0)
+        return self._save(name, content)
+
+
+def get_cover_storage():
+    """Storage de portadas (callable para que la migración no serialice la instancia)"""
+    return cover_storage
+
+
+cover_storage = ContentAddressedStorage()
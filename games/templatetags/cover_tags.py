@@ -0,0 +1,51 @@
+from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+
+from ..images import cover_sources
+
+register = template.Library()
+
+# tarjetas de la primera fila: visibles sin hacer scroll, no se difieren
+EAGER_COVERS = 3
+
+# tamaños por defecto de las tarjetas: 3 columnas en lg, 2 en md, 1 en móvil
+GRID_SIZES = "(min-width: 992px) 33vw, (min-width: 768px) 50vw, 100vw"
+
+# portada del detalle (lazy=False): media columna en lg; el preload de la vista usa los mismos
+DETAIL_SIZES = "(min-width: 992px) 50vw, 100vw"
+
+
+@register.simple_tag
+def cover_img(game, css_class="", style="", lazy=True, position=None, sizes=None):
+    """
+    <img> de la portada con loading="lazy", dimensiones explícitas,
+    srcset con la miniatura y el placeholder borroso como fondo.
+    """
+    attrs = {"alt": game.title, "class": css_class, "decoding": "async"}
+
+    attrs["src"], srcset = cover_sources(game)
+    if srcset:
+        attrs["srcset"] = srcset
+        attrs["sizes"] = sizes or (GRID_SIZES if lazy else DETAIL_SIZES)
+
+    if game.cover_width and game.cover_height:
+        attrs["width"] = game.cover_width
+        attrs["height"] = game.cover_height
+
+    if lazy:
+        if position is None or position > EAGER_COVERS:
+            attrs["loading"] = "lazy"
+    else:
+        # portada principal (LCP): pedirla antes que el resto
+        attrs["fetchpriority"] = "high"
+
+    if game.cover_placeholder:
+        style = (
+            f"{style} background: {game.cover_color or 'transparent'} "
+            f"url({game.cover_placeholder}) center / cover no-repeat;"
+        ).strip()
+    if style:
+        attrs["style"] = style
+
+    return format_html("<img{}>", flatatt({key: value for key, value in attrs.items() if value != ""}))
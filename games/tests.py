@@ -1,3 +1,1671 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import io
+import json
+import os
+import shutil
+import tempfile
+from unittest import skipUnless
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.http import Http404
+from django.template import Context, Template
+from PIL import Image
+from django.test import LiveServerTestCase, RequestFactory, TestCase, override_settings
+
+from .media import serve_media
+from .models import Category, Game, MediaBlob
 
 # Create your tests here.
+
+
+def new_game(title, release_date, category=None, **fields):
+    """Game sin guardar con los campos obligatorios; categoría "Aventura" si no se indica"""
+    fields.setdefault("description", "desc")
+    fields.setdefault("download_link", "https://example.com/descarga")
+    if category is None:
+        category = Category.objects.create(name="Aventura")
+    return Game(title=title, category=category, release_date=release_date, **fields)
+
+
+def jpeg(size=(8, 8), color=(0, 0, 0)):
+    """Bytes de una portada JPEG válida"""
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def create_game(title, release_date, category=None, **fields):
+    game = new_game(title, release_date, category, **fields)
+    game.save()
+    return game
+
+
+class MediaServeTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.data = bytes(range(256)) * 4
+        for name in ("cover.jpg", "0123456789abcdef.jpg"):
+            with open(os.path.join(self.tmp.name, name), "wb") as fh:
+                fh.write(self.data)
+        settings_override = override_settings(MEDIA_ROOT=self.tmp.name, MEDIA_ACCEL_REDIRECT="")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_full_file(self):
+        response = self.client.get("/media/cover.jpg")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.data)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["Cache-Control"], "public, max-age=3600")
+
+    def test_hashed_name_is_immutable(self):
+        response = self.client.get("/media/0123456789abcdef.jpg")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_range(self):
+        response = self.client.get("/media/cover.jpg", HTTP_RANGE="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 10-19/1024")
+        self.assertEqual(response["Content-Length"], "10")
+        self.assertEqual(b"".join(response.streaming_content), self.data[10:20])
+
+    def test_suffix_range(self):
+        response = self.client.get("/media/cover.jpg", HTTP_RANGE="bytes=-4")
+        self.assertEqual(b"".join(response.streaming_content), self.data[-4:])
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get("/media/cover.jpg", HTTP_RANGE="bytes=5000-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */1024")
+
+    def test_if_range_mismatch_sends_full_file(self):
+        response = self.client.get(
+            "/media/cover.jpg", HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_none_match(self):
+        etag = self.client.get("/media/cover.jpg")["ETag"]
+        response = self.client.get("/media/cover.jpg", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_path_traversal(self):
+        request = RequestFactory().get("/media/x")
+        with self.assertRaises(Http404):
+            serve_media(request, "../settings.py")
+
+    def test_accel_redirect(self):
+        with override_settings(MEDIA_ACCEL_REDIRECT="/protected-media/"):
+            response = self.client.get("/media/cover.jpg")
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/cover.jpg")
+        self.assertEqual(response.content, b"")
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=self.tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.category = Category.objects.create(name="Acción")
+
+    def make_game(self, filename, content):
+        game = new_game(filename, datetime.date(2024, 1, 1), self.category)
+        game.cover_image.save(filename, ContentFile(content), save=False)
+        game.save()
+        return game
+
+    def test_same_content_is_stored_once(self):
+        first = self.make_game("a.jpg", jpeg())
+        second = self.make_game("b.JPG", jpeg())
+        self.assertEqual(first.cover_image.name, second.cover_image.name)
+        self.assertRegex(first.cover_image.name, r"^covers/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$")
+        self.assertEqual(MediaBlob.objects.get(name=first.cover_image.name).ref_count, 2)
+
+    def test_last_reference_deletes_file(self):
+        first = self.make_game("a.jpg", jpeg())
+        second = self.make_game("b.jpg", jpeg())
+        name = first.cover_image.name
+        storage = first.cover_image.storage
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(storage.exists(name))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(storage.exists(name))
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+
+    def test_dedupe_command(self):
+        covers = os.path.join(self.tmp.name, "covers")
+        os.makedirs(covers)
+        for name in ("cover.jpg", "cover_dnDJT4e.jpg"):
+            with open(os.path.join(covers, name), "wb") as fh:
+                fh.write(jpeg())
+        for name in ("covers/cover.jpg", "covers/cover_dnDJT4e.jpg"):
+            create_game(name, datetime.date(2024, 1, 1), self.category, cover_image=name)
+        call_command("dedupe_media", stdout=io.StringIO())
+        names = set(Game.objects.values_list("cover_image", flat=True))
+        self.assertEqual(len(names), 1)
+        name = names.pop()
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, name)))
+        self.assertEqual(len(os.listdir(covers)), 1)
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 2)
+
+    def test_dedupe_command_keeps_thumbnails(self):
+        game = self.make_game("grande.jpg", jpeg((960, 1280), (10, 200, 10)))
+        thumb = game.cover_thumbnail.name
+        self.assertTrue(thumb.startswith("covers/thumbs/"))
+        # copia heredada de la misma miniatura con nombre sin hash
+        legacy = "covers/thumbs/grande.jpg"
+        shutil.copy(os.path.join(self.tmp.name, thumb), os.path.join(self.tmp.name, legacy))
+        other = self.make_game("otra.jpg", jpeg(color=(1, 2, 3)))
+        Game.objects.filter(pk=other.pk).update(cover_thumbnail=legacy)
+
+        call_command("dedupe_media", stdout=io.StringIO())
+        self.assertEqual(
+            set(Game.objects.filter(pk__in=[game.pk, other.pk]).values_list("cover_thumbnail", flat=True)), {thumb}
+        )
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, thumb)))
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, legacy)))
+        self.assertEqual(MediaBlob.objects.get(name=thumb).ref_count, 2)
+        self.assertEqual(Game.objects.get(pk=game.pk).cover_image.name, game.cover_image.name)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, game.cover_image.name)))
+
+
+class CoverRenditionTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=self.tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.game = new_game("Tekken 3", datetime.date(1998, 3, 26), Category.objects.create(name="Lucha"))
+        self.game.cover_image.save("tekken.jpg", ContentFile(jpeg((960, 1280), (200, 10, 10))), save=False)
+        self.game.save()
+
+    def test_derived_fields(self):
+        game = Game.objects.get(pk=self.game.pk)
+        self.assertEqual((game.cover_width, game.cover_height), (960, 1280))
+        self.assertTrue(game.cover_placeholder.startswith("data:image/jpeg;base64,"))
+        self.assertLess(len(game.cover_placeholder), 1500)
+        self.assertRegex(game.cover_color, r"^#[0-9a-f]{6}$")
+        with Image.open(game.cover_thumbnail) as thumb:
+            self.assertEqual(thumb.size, (480, 640))
+
+    def render(self, tag):
+        template = Template("{% load cover_tags %}" + tag)
+        return template.render(Context({"game": Game.objects.get(pk=self.game.pk)}))
+
+    def test_grid_cover_is_lazy_with_dimensions(self):
+        html = self.render("{% cover_img game position=4 %}")
+        self.assertIn('loading="lazy"', html)
+        self.assertIn('width="960"', html)
+        self.assertIn('height="1280"', html)
+        self.assertIn("480w", html)
+        self.assertIn("data:image/jpeg;base64,", html)
+
+    def test_first_row_and_detail_cover_are_eager(self):
+        self.assertNotIn("loading=", self.render("{% cover_img game position=1 %}"))
+        self.assertIn('fetchpriority="high"', self.render("{% cover_img game lazy=False %}"))
+
+    def test_home_first_row_is_eager(self):
+        html = self.client.get("/").content.decode()
+        self.assertIn(self.game.cover_thumbnail.url, html)
+        self.assertNotIn('loading="lazy"', html)
+
+    def test_detail_preload_matches_srcset(self):
+        game = Game.objects.get(pk=self.game.pk)
+        thumb, cover = game.cover_thumbnail.url, game.cover_image.url
+        response = self.client.get(f"/game/{game.id}/")
+        self.assertIn(
+            f'<{thumb}>; rel=preload; as=image; imagesrcset="{thumb} 480w, {cover} 960w"; '
+            f'imagesizes="(min-width: 992px) 50vw, 100vw"; fetchpriority=high',
+            response["Link"],
+        )
+        self.assertNotIn(f"<{cover}>", response["Link"])
+        self.assertContains(response, 'sizes="(min-width: 992px) 50vw, 100vw"')
+
+
+class PreloadHintsTests(TestCase):
+    def test_link_header_on_catalogue_pages(self):
+        link = self.client.get("/")["Link"]
+        self.assertIn("<https://fonts.gstatic.com>; rel=preconnect; crossorigin", link)
+        self.assertIn("bootstrap.min.css>; rel=preload; as=style", link)
+
+    def test_no_link_header_outside_catalogue(self):
+        self.assertNotIn("Link", self.client.get("/admin/"))
+
+    def test_detail_preloads_cover(self):
+        category = Category.objects.create(name="Lucha")
+        # la portada no existe en disco: se guarda sin derivados y queda el aviso
+        with self.assertLogs("games.signals", "WARNING") as logs:
+            game = create_game("Tekken 3", datetime.date(1998, 3, 26), category, cover_image="covers/tekken.jpg")
+        self.assertIn("No se pudo procesar la portada covers/tekken.jpg", logs.output[0])
+        link = self.client.get(f"/game/{game.id}/")["Link"]
+        self.assertIn("</media/covers/tekken.jpg>; rel=preload; as=image; fetchpriority=high", link)
+
+    def test_early_hints_sent_before_response(self):
+        from .hints import EarlyHintsMiddleware
+
+        messages = []
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+
+        async def send(message):
+            messages.append(message["type"])
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "extensions": {"http.response.early_hint": {}},
+        }
+        asyncio.run(EarlyHintsMiddleware(app)(scope, None, send))
+        self.assertEqual(messages, ["http.response.early_hint", "http.response.start"])
+
+        messages.clear()
+        asyncio.run(EarlyHintsMiddleware(app)(dict(scope, extensions={}), None, send))
+        self.assertEqual(messages, ["http.response.start"])
+
+
+class VendoringTests(TestCase):
+    def test_rewrite_base_template(self):
+        from . import vendoring
+
+        source = (
+            "<head>\n"
+            "    <!-- Bootstrap CSS -->\n"
+            f'    <link href="{vendoring.BOOTSTRAP_CSS}" rel="stylesheet">\n'
+            "    <!-- Font Awesome -->\n"
+            f'    <link rel="stylesheet" href="{vendoring.FONTAWESOME_CSS}">\n'
+            f'    <link href="{vendoring.GOOGLE_FONTS_CSS}" rel="stylesheet">\n'
+            "</head>\n"
+            f'<script src="{vendoring.BOOTSTRAP_JS}"></script>\n'
+        )
+        rewritten = vendoring.rewrite_base_template(source)
+        self.assertTrue(rewritten.startswith("{% load static %}"))
+        self.assertNotIn("https://", rewritten)
+        self.assertEqual(rewritten.count("<link"), 1)
+        self.assertIn("{% static 'games/vendor/css/vendor.css' %}", rewritten)
+        self.assertIn("{% static 'games/vendor/js/bootstrap.bundle.min.js' %}", rewritten)
+        self.assertEqual(vendoring.rewrite_base_template(rewritten), rewritten)
+
+    def test_subset_fontawesome_css(self):
+        from . import vendoring
+
+        css = (
+            '.fa-gamepad:before{content:"\\f11b"}'
+            '.fa-house:before,.fa-home:before{content:"\\f015"}'
+            '.fa-unused:before{content:"\\f000"}'
+            '@font-face{font-family:"Font Awesome 6 Free";src:url(../webfonts/fa-solid-900.woff2) '
+            'format("woff2"),url(../webfonts/fa-solid-900.ttf) format("truetype")}'
+            '@font-face{font-family:"Font Awesome 6 Brands";src:url(../webfonts/fa-brands-400.woff2) '
+            'format("woff2")}'
+        )
+        subset, fonts = vendoring.subset_fontawesome_css(css, {"fas", "fa-gamepad", "fa-home"})
+        self.assertNotIn("fa-unused", subset)
+        self.assertNotIn(".ttf", subset)
+        self.assertNotIn("Brands", subset)
+        self.assertIn("url(../fonts/fa-solid-900.woff2)", subset)
+        self.assertEqual(fonts, {"fa-solid-900": {0xF11B, 0xF015}})
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=0)
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        from .instrumentation import view_timings
+
+        view_timings.histograms.clear()
+        self.category = Category.objects.create(name="Plataformas")
+
+    def test_server_timing_header(self):
+        response = self.client.get(f"/category/{self.category.id}/")
+        timing = response["Server-Timing"]
+        for metric in ("db;dur=", "tpl;dur=", "mw;dur=", "view;dur=", "total;dur="):
+            self.assertIn(metric, timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    def test_structured_log_line(self):
+        import json
+
+        with self.assertLogs("games.perf", level="INFO") as logs:
+            self.client.get("/")
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["view"], "home")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["queries"], 0)
+        self.assertGreater(record["tpl_ms"], 0)
+        self.assertGreaterEqual(record["total_ms"], record["tpl_ms"])
+
+    def test_rolling_histograms_per_view(self):
+        from .instrumentation import RollingHistogram, view_timings
+
+        for _ in range(3):
+            self.client.get("/")
+        self.client.get(f"/category/{self.category.id}/")
+        snapshot = view_timings.snapshot()
+        self.assertEqual(snapshot["home"]["total"]["count"], 3)
+        self.assertEqual(snapshot["category_games"]["total"]["count"], 1)
+        self.assertEqual(set(snapshot["home"]["db"]), {"p50", "p95", "p99", "count"})
+
+        histogram = RollingHistogram(size=100)
+        for value in range(1, 201):
+            histogram.observe(value)
+        self.assertEqual(histogram.count, 200)
+        self.assertEqual(histogram.percentiles(), {"p50": 151, "p95": 195, "p99": 199})
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_header_can_be_disabled(self):
+        self.assertNotIn("Server-Timing", self.client.get("/"))
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        override = override_settings(METRICS_DIR=self.tmp.name, METRICS_TOKEN="")
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_metrics_endpoint_exposes_views_and_queue(self):
+        category = Category.objects.create(name="Carreras")
+        with self.assertLogs("games.signals", "WARNING"):
+            create_game("Gran Turismo", datetime.date(1997, 12, 23), category, cover_image="covers/gt.jpg")
+        self.client.get("/")
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn("# TYPE davegames_request_duration_seconds histogram", body)
+        self.assertIn('davegames_request_duration_seconds_bucket{le="+Inf",view="home"}', body)
+        self.assertIn('davegames_requests_total{status="200",view="home"}', body)
+        self.assertIn('davegames_db_queries_per_request_count{view="home"}', body)
+        self.assertIn('davegames_cache_requests_total{cache="template_links",result=', body)
+        self.assertIn("davegames_image_processing_queue_depth 1", body)
+
+    def test_aggregates_worker_files(self):
+        import json
+
+        from . import metrics
+
+        worker = {
+            "pid": 999999999,
+            "metrics": {
+                "davegames_comment_submissions_total": {
+                    "type": "counter",
+                    "help": "Comentarios enviados por resultado",
+                    "samples": {'{"result": "accepted"}': 4},
+                },
+                "davegames_db_connections_open": {
+                    "type": "gauge",
+                    "help": "Conexiones abiertas por proceso",
+                    "samples": {'{"alias": "default"}': 1},
+                },
+            },
+        }
+        with open(os.path.join(self.tmp.name, "999999999.json"), "w") as handle:
+            json.dump(worker, handle)
+        metrics.comment_submissions.inc(result="accepted")
+        before = metrics.comment_submissions.samples['{"result": "accepted"}']
+
+        merged = metrics.collect()
+        samples = merged["davegames_comment_submissions_total"]["samples"]
+        # el proceso terminado conserva sus contadores, pero no sus gauges
+        self.assertEqual(samples['{"result": "accepted"}'], before + 4)
+        self.assertLessEqual(merged["davegames_db_connections_open"]["samples"]['{"alias": "default"}'], 1)
+
+    def test_dead_and_reused_pid_files_are_archived(self):
+        import json
+
+        from . import metrics
+
+        def write(name, pid, start, accepted):
+            data = {
+                "pid": pid,
+                "start": start,
+                "metrics": {
+                    "davegames_comment_submissions_total": {
+                        "type": "counter",
+                        "help": "Comentarios enviados por resultado",
+                        "samples": {'{"result": "archived"}': accepted},
+                    },
+                    "davegames_db_connections_open": {
+                        "type": "gauge",
+                        "help": "Conexiones abiertas por proceso",
+                        "samples": {'{"alias": "archived"}': 1},
+                    },
+                },
+            }
+            with open(os.path.join(self.tmp.name, name), "w") as handle:
+                json.dump(data, handle)
+
+        metrics.registry.flush(force=True)
+        own = f"{os.getpid()}-{metrics.registry.token}.json"
+        self.assertIn(own, os.listdir(self.tmp.name))
+        write("999999999-1.json", 999999999, 1, 4)
+        # mismo PID que este proceso pero otro arranque: el worker anterior murió
+        write(f"{os.getpid()}-old.json", os.getpid(), -1, 3)
+
+        self.assertEqual(metrics.archive_dead(self.tmp.name), 2)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), sorted([own, metrics.ARCHIVE]))
+        write("999999998-1.json", 999999998, 1, 5)
+        self.assertEqual(metrics.archive_dead(self.tmp.name), 1)
+
+        merged = metrics.collect()
+        self.assertEqual(merged["davegames_comment_submissions_total"]["samples"]['{"result": "archived"}'], 12)
+        self.assertNotIn('{"alias": "archived"}', merged["davegames_db_connections_open"]["samples"])
+
+    def test_token_required_when_configured(self):
+        with override_settings(METRICS_TOKEN="secreto"):
+            self.assertEqual(self.client.get("/metrics").status_code, 403)
+            response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secreto")
+            self.assertEqual(response.status_code, 200)
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=self.tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_seed_is_deterministic_and_clearable(self):
+        from . import benchmark
+        from .models import Comment
+
+        created = benchmark.seed(3, 12, 2, rng_seed=7)
+        self.assertEqual(created, {"categories": 3, "games": 12, "comments": 24})
+        descriptions = list(Game.objects.order_by("id").values_list("description", flat=True))
+        self.assertTrue(all(600 <= len(text) <= 2001 for text in descriptions))
+        # todas las portadas con miniatura y referencias contadas
+        self.assertFalse(Game.objects.filter(cover_width__isnull=True).exists())
+        self.assertEqual(sum(MediaBlob.objects.filter(name__startswith="covers/thumbs/").values_list("ref_count", flat=True)), 12)
+
+        self.assertEqual(benchmark.clear_seeded(), 12)
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(MediaBlob.objects.exists())
+        benchmark.seed(3, 12, 2, rng_seed=7)
+        self.assertEqual(list(Game.objects.order_by("id").values_list("description", flat=True)), descriptions)
+
+    def test_compare_flags_regressions(self):
+        from . import benchmark
+
+        baseline = {"home": {"rps": 100.0, "p95_ms": 20.0, "queries": 3.0}}
+        ok = {"home": {"rps": 95.0, "p95_ms": 21.0, "queries": 3.0}}
+        self.assertEqual(benchmark.compare(ok, baseline, 0.15), [])
+        slow = {"home": {"rps": 50.0, "p95_ms": 40.0, "queries": 5.0}}
+        self.assertEqual(len(benchmark.compare(slow, baseline, 0.15)), 3)
+
+
+# el live server comparte la conexión SQLite en memoria entre hilos: sin el
+# limitador (DatabaseCache) los POST concurrentes no abren transacciones anidadas
+@override_settings(COMMENT_RATE_BURST=0)
+class LoadTestCommandTests(LiveServerTestCase):
+    def test_scenarios_against_live_server(self):
+        from . import benchmark
+
+        category = Category.objects.create(name="Acción")
+        with self.assertLogs("games.signals", "WARNING"):
+            game = create_game(
+                "Doom", datetime.date(1993, 12, 10), category, cover_image="covers/doom.jpg", cover_width=600
+            )
+        baseline = os.path.join(tempfile.mkdtemp(), "baseline.json")
+        out = io.StringIO()
+        call_command(
+            "loadtest", url=self.live_server_url, requests=4, concurrency=2, warmup=0,
+            baseline=baseline, save_baseline=True, stdout=out,
+        )
+        results = benchmark.load_baseline(baseline)
+        self.assertEqual(set(results), set(benchmark.SCENARIOS))
+        for result in results.values():
+            self.assertEqual(result["errors"], 0)
+            self.assertGreater(result["queries"], 0)
+        self.assertEqual(game.comments.count(), 4)
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(PROFILES_DIR=self.tmp.name, PROFILE_KEEP=2)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def staff_client(self):
+        from django.contrib.auth.models import User
+
+        user = User.objects.create_user("admin", password="x", is_staff=True, is_superuser=True)
+        self.client.force_login(user)
+        return user
+
+    def test_query_param_requires_staff(self):
+        from .models import RequestProfile
+
+        self.assertNotIn("X-Profile-Id", self.client.get("/?_profile=1"))
+        self.staff_client()
+        response = self.client.get("/?_profile=1")
+        profile = RequestProfile.objects.get(pk=response["X-Profile-Id"])
+        self.assertEqual(profile.view_name, "home")
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, profile.filename)))
+
+    def test_signed_header(self):
+        from .profiling import make_token
+
+        self.assertNotIn("X-Profile-Id", self.client.get("/", HTTP_X_PROFILE="falso"))
+        self.assertIn("X-Profile-Id", self.client.get("/", HTTP_X_PROFILE=make_token()))
+
+    def test_sampler_collects_collapsed_stacks(self):
+        import json
+        import threading
+        import time
+
+        from .profiling import SamplingProfiler, speedscope_json
+
+        def busy_wait():
+            end = time.perf_counter() + 0.05
+            while time.perf_counter() < end:
+                pass
+
+        with SamplingProfiler(threading.get_ident(), 0.001) as profiler:
+            busy_wait()
+        collapsed = profiler.collapsed()
+        self.assertIn("busy_wait (tests.py:", collapsed)
+        stack, _, count = collapsed.splitlines()[0].rpartition(" ")
+        self.assertGreater(int(count), 0)
+
+        data = json.loads(speedscope_json(collapsed, "prueba"))
+        profile = data["profiles"][0]
+        self.assertEqual(profile["type"], "sampled")
+        self.assertEqual(sum(profile["weights"]), sum(profiler.stacks.values()))
+
+    @override_settings(STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage")
+    def test_admin_lists_and_downloads_recent_profiles(self):
+        from .models import RequestProfile
+
+        self.staff_client()
+        ids = [self.client.get("/?_profile=1")["X-Profile-Id"] for _ in range(3)]
+        # PROFILE_KEEP=2: el más antiguo se borra junto con su archivo
+        self.assertEqual(RequestProfile.objects.count(), 2)
+        self.assertFalse(RequestProfile.objects.filter(pk=ids[0]).exists())
+        self.assertEqual(len(os.listdir(self.tmp.name)), 2)
+
+        self.assertEqual(self.client.get("/admin/games/requestprofile/").status_code, 200)
+        response = self.client.get(f"/admin/games/requestprofile/{ids[-1]}/download/speedscope/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("speedscope", response["Content-Disposition"])
+
+
+class SlowQueryLogTests(TestCase):
+    def setUp(self):
+        from . import slowlog
+
+        # lo que quede en cola se registra dentro del test, no en el atexit con la BD de tests ya borrada
+        self.addCleanup(slowlog.flush)
+
+    def test_fingerprint_ignores_literals(self):
+        from .slowlog import fingerprint, normalize
+
+        self.assertEqual(
+            normalize("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'x''y'"),
+            "SELECT * FROM t WHERE id IN (...) AND name = ?",
+        )
+        self.assertEqual(
+            fingerprint('SELECT "a" FROM "t" WHERE "id" = %s LIMIT 21'),
+            fingerprint('SELECT "a" FROM "t"  WHERE "id" = 7 LIMIT 5'),
+        )
+
+    @override_settings(SLOW_QUERY_MS=0.0001, SLOW_QUERY_EXPLAIN_INTERVAL=3600, PAGE_CACHE_TIMEOUT=0)
+    def test_slow_queries_grouped_with_plan_and_source(self):
+        from .models import SlowQuery
+
+        category = Category.objects.create(name="Acción")
+        for _ in range(2):
+            self.client.get(f"/category/{category.id}/")
+
+        query = SlowQuery.objects.get(normalized__contains='FROM "games_category" WHERE "games_category"."id" = ?')
+        self.assertEqual(query.calls, 2)
+        self.assertIn("games/views.py", query.source)
+        self.assertTrue(query.plan)
+        self.assertGreaterEqual(query.max_ms, query.last_ms)
+        # el registro no se registra a sí mismo
+        self.assertFalse(SlowQuery.objects.filter(normalized__contains="games_slowquery").exists())
+
+        out = io.StringIO()
+        call_command("slow_queries", plans=True, stdout=out)
+        self.assertIn(query.fingerprint, out.getvalue())
+
+    @override_settings(SLOW_QUERY_EXPLAIN_INTERVAL=3600)
+    def test_replica_reads_are_recorded_on_primary(self):
+        from unittest import mock
+
+        from . import slowlog
+        from .models import SlowQuery
+
+        replica = mock.Mock(alias="replica_1", vendor="sqlite")
+        with mock.patch.object(slowlog, "explain", return_value="SCAN games_game") as explain:
+            slowlog.record(replica, 'SELECT * FROM "games_game"', (), 12.5)
+        explain.assert_called_once_with(replica, 'SELECT * FROM "games_game"', ())
+        query = SlowQuery.objects.using("default").get()
+        self.assertEqual((query.plan, query.vendor, query.calls), ("SCAN games_game", "sqlite", 1))
+
+    @override_settings(SLOW_QUERY_MS=0.0001)
+    def test_queue_is_bounded_and_flushed_by_workers(self):
+        from unittest import mock
+
+        from . import slowlog
+        from .models import SlowQuery
+
+        with mock.patch.object(slowlog, "MAX_PENDING", 3):
+            slowlog.flush()
+            for _ in range(7):
+                Category.objects.filter(name="Acción").exists()
+            # el wrapper solo encola: nada se registra a mitad de la transacción
+            self.assertEqual(len(slowlog.pending()), 3)
+            self.assertFalse(SlowQuery.objects.exists())
+            # el worker vacía la cola al terminar el lote (las 3 últimas son ya suyas)
+            call_command("moderate_comments", stdout=io.StringIO())
+            self.assertEqual(len(slowlog.pending()), 0)
+            self.assertTrue(SlowQuery.objects.filter(normalized__contains='FROM "games_comment"').exists())
+        slowlog.flush()
+
+
+class FastStartTests(TestCase):
+    def fresh_interpreter(self, code, **environ):
+        import subprocess
+        import sys
+
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, django; django.setup(); " + code],
+            capture_output=True, text=True, check=True,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE="davegames_project.settings", **environ),
+        )
+        return result.stdout.strip()
+
+    def test_admin_urlconf_loaded_on_demand(self):
+        output = self.fresh_interpreter(
+            "from django.urls import resolve, reverse; "
+            "resolve('/'); reverse('game_detail', args=[1]); "
+            "print('davegames_project.admin_urls' in sys.modules, end=' '); "
+            "resolve('/admin/'); print('davegames_project.admin_urls' in sys.modules)"
+        )
+        self.assertEqual(output, "False True")
+
+    def test_admin_reverse_after_root_resolver_is_populated(self):
+        # LazyURLResolver sobrescribe internos de URLResolver: fija su comportamiento con el Django instalado
+        output = self.fresh_interpreter(
+            "from django.urls import get_resolver, resolve, reverse; "
+            "get_resolver().reverse_dict; reverse('home'); "
+            "print('davegames_project.admin_urls' in sys.modules, end=' '); "
+            "print(reverse('admin:index'), reverse('admin:games_game_changelist'), end=' '); "
+            "print(resolve('/admin/').view_name, resolve('/admin/games/game/').url_name)",
+            FAST_START="True",
+        )
+        self.assertEqual(output, "False /admin/ /admin/games/game/ admin:index games_game_changelist")
+
+    def test_templates_do_not_load_pillow(self):
+        output = self.fresh_interpreter(
+            "from django.template.loader import get_template; "
+            "get_template('games/home.html'); print('PIL' in sys.modules)"
+        )
+        self.assertEqual(output, "False")
+
+
+class PageCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.category = Category.objects.create(name="Aventura")
+        self.game = create_game("Grim Fandango", datetime.date(1998, 10, 30), self.category)
+
+    def test_public_pages_served_from_cache_until_catalog_changes(self):
+        first = self.client.get("/")
+        with self.assertNumQueries(0):
+            cached = self.client.get("/")
+        self.assertEqual(cached.content, first.content)
+
+        create_game("Full Throttle", datetime.date(1995, 4, 30), self.category)
+        self.assertContains(self.client.get("/"), "Full Throttle")
+        # con query string no se usa la cache
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/?ref=1")
+        self.assertGreater(len(queries), 0)
+
+    def test_detail_fragments_invalidated_by_comments(self):
+        from .models import Comment
+
+        self.client.get(f"/game/{self.game.id}/")
+        with self.assertNumQueries(0):
+            # perfil ligero: sin token en el HTML, la página entera sale de la cache
+            response = self.client.get(f"/game/{self.game.id}/")
+        self.assertContains(response, "csrfmiddlewaretoken")
+        with override_settings(LEAN_PUBLIC_PAGES=False), self.assertNumQueries(1):
+            # solo el juego: navegación y fragmentos salen de la cache
+            response = self.client.get(f"/game/{self.game.id}/")
+        self.assertContains(response, "csrfmiddlewaretoken")
+
+        Comment.objects.create(
+            game=self.game, nickname="guybrush", email="g@example.com", password="x", text="Genial",
+            status=Comment.Status.PUBLISHED,
+        )
+        self.assertContains(self.client.get(f"/game/{self.game.id}/"), "guybrush")
+
+    @override_settings(WARMUP_SNAPSHOT="/nonexistent/warmup.json")
+    def test_warm_up_renders_popular_pages_within_budget(self):
+        from .warmup import popular_paths, warm_up
+
+        self.assertEqual(popular_paths(10), ["/", f"/game/{self.game.id}/", f"/category/{self.category.id}/"])
+        stats = warm_up(budget=5, top=10)
+        self.assertEqual(stats["pages"], 3)
+        self.assertTrue(stats["nav"])
+        with self.assertNumQueries(0):
+            self.client.get(f"/category/{self.category.id}/")
+
+        self.assertEqual(warm_up(budget=0, top=10)["pages"], 0)
+
+    @override_settings(WARMUP_ON_BOOT=True, WARMUP_BUDGET=0.1)
+    def test_boot_warm_up_does_not_outlive_budget(self):
+        import threading
+        import time
+        from unittest import mock
+
+        from . import warmup
+
+        release = threading.Event()
+        self.addCleanup(release.set)
+        # base de datos que no responde: ensure_connection() se queda bloqueado
+        with mock.patch.object(warmup, "warm_up", side_effect=lambda: release.wait(5) and {}):
+            start = time.monotonic()
+            with self.assertLogs("games.perf", "WARNING") as logs:
+                warmup.warm_up_on_boot()
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertIn('"timeout": 0.1', logs.output[0])
+
+
+class StaticBuildTests(TestCase):
+    def setUp(self):
+        self.sources = tempfile.TemporaryDirectory()
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.sources.cleanup)
+        self.addCleanup(self.root.cleanup)
+        self.css = os.path.join(self.sources.name, "site.css")
+        with open(self.css, "w") as handle:
+            handle.write("body { color: #111; }\n" * 200)
+
+    def build(self):
+        with override_settings(
+            STATIC_ROOT=self.root.name,
+            STATICFILES_DIRS=[self.sources.name],
+            STATICFILES_STORAGE="games.staticbuild.ParallelCompressedManifestStorage",
+            STATIC_BUILD_WORKERS=2,
+        ):
+            from django.contrib.staticfiles.storage import staticfiles_storage
+
+            out = io.StringIO()
+            call_command("build_static", interactive=False, verbosity=1, stdout=out)
+            return out.getvalue(), dict(staticfiles_storage.compress_stats)
+
+    def test_second_build_skips_unchanged_files(self):
+        output, stats = self.build()
+        self.assertIn("0 sin cambios", output)
+        self.assertGreater(stats["compressed"], 0)
+        self.assertTrue(os.path.exists(os.path.join(self.root.name, "site.css.gz")))
+
+        output, stats = self.build()
+        self.assertIn("0 copiados", output)
+        self.assertEqual(stats["compressed"], 0)
+
+        # cambia el contenido: solo se copia y comprime site.css (y su versión hasheada)
+        with open(self.css, "a") as handle:
+            handle.write("a { color: red; }\n")
+        output, stats = self.build()
+        self.assertIn("1 copiados", output)
+        self.assertEqual(stats["compressed"], 2)
+
+
+@skipUnless(shutil.which("openssl"), "OpenSSL no disponible")
+class ProbeTests(TestCase):
+    """Sondeo contra un servidor HTTPS local con el certificado de generate_ssl_cert.py"""
+
+    def setUp(self):
+        import contextlib
+        import http.server
+        import ssl
+        import threading
+
+        import generate_ssl_cert
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertTrue(generate_ssl_cert.generate_advanced_certificate())
+        finally:
+            os.chdir(cwd)
+        self.cafile = os.path.join(tmp.name, "davegames_ssl_advanced.crt")
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(503 if self.path == "/down" else 200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.cafile, os.path.join(tmp.name, "davegames_ssl_advanced.key"))
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base = f"https://localhost:{server.server_address[1]}"
+
+    def test_report_for_healthy_failing_and_unreachable_hosts(self):
+        from . import probe
+
+        closed = f"http://127.0.0.1:{self.unused_port()}/"
+        report = probe.run(
+            [f"{self.base}/", f"{self.base}/down", closed], concurrency=2, timeout=5, cafile=self.cafile
+        )
+        healthy, down, unreachable = report["results"]
+        self.assertEqual(report["summary"], {"total": 3, "ok": 1, "failed": 2})
+
+        self.assertTrue(healthy["ok"])
+        self.assertEqual(healthy["status"], 200)
+        self.assertTrue(healthy["tls_version"].startswith("TLS"))
+        self.assertGreater(healthy["tls_ms"], 0)
+        self.assertIn(healthy["cert_days_left"], (364, 365))
+
+        self.assertEqual(down["status"], 503)
+        self.assertEqual(down["error"], "HTTP 503")
+        self.assertIsNone(unreachable["status"])
+        self.assertTrue(unreachable["error"])
+
+        # sin la CA el handshake falla; con un umbral de 400 días el certificado avisa
+        self.assertIn("CERTIFICATE_VERIFY_FAILED", probe.run([f"{self.base}/"], timeout=5)["results"][0]["error"])
+        expiring = probe.run([f"{self.base}/"], timeout=5, cafile=self.cafile, warn_days=400)["results"][0]
+        self.assertFalse(expiring["ok"])
+        self.assertIn("caduca", expiring["error"])
+
+    def test_command_writes_json_report_and_fails_on_problems(self):
+        from django.core.management.base import CommandError
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "probe.json")
+            call_command("probe", f"{self.base}/", cafile=self.cafile, output=output, stdout=io.StringIO())
+            with open(output) as handle:
+                self.assertEqual(json.load(handle)["summary"]["ok"], 1)
+        with self.assertRaises(CommandError):
+            call_command("probe", f"{self.base}/down", cafile=self.cafile, stdout=io.StringIO())
+
+    def unused_port(self):
+        import socket
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+
+class SettingsLoaderTests(TestCase):
+    def test_layers_and_validation(self):
+        from types import MappingProxyType
+
+        from django.core.exceptions import ImproperlyConfigured
+
+        from davegames_project import settings_loader
+
+        development = settings_loader.resolve("development", ())
+        self.assertIsInstance(development, MappingProxyType)
+        self.assertIs(settings_loader.resolve("development", ()), development)
+        with self.assertRaises(TypeError):
+            development["DEBUG"] = False
+        self.assertFalse(development["SECURE_SSL_REDIRECT"])
+        self.assertNotIn("DB_PASSWORD", development)
+
+        # DEBUG=False aplica la capa SSL de producción; el entorno gana al perfil
+        production = settings_loader.resolve("development", (("ALLOWED_HOSTS", "a.com, b.com"), ("DEBUG", "false")))
+        self.assertTrue(production["SECURE_SSL_REDIRECT"])
+        self.assertEqual(production["ALLOWED_HOSTS"], ("a.com", "b.com"))
+
+        vercel = settings_loader.thaw(settings_loader.resolve("vercel", (("WARMUP_TOP", "7"),)))
+        self.assertEqual(vercel["WARMUP_TOP"], 7)
+        self.assertEqual(vercel["DATABASES"]["default"]["ENGINE"], "django.db.backends.sqlite3")
+        self.assertNotIn(settings_loader.WHITENOISE_MIDDLEWARE, vercel["MIDDLEWARE"])
+        self.assertIsInstance(vercel["MIDDLEWARE"], list)
+        self.assertIsInstance(vercel["SECURE_PROXY_SSL_HEADER"], tuple)
+        self.assertEqual(
+            settings_loader.resolve("gcp", (("CLOUD_SQL_CONNECTION_NAME", "p:r:i"),))["DATABASES"]["default"]["HOST"],
+            "/cloudsql/p:r:i",
+        )
+
+        with self.assertRaises(ImproperlyConfigured) as error:
+            settings_loader.resolve("development", (("DEBUG", "quizás"), ("PAGE_CACHE_TIMEOUT", "-1")))
+        self.assertIn("DEBUG", str(error.exception))
+        self.assertIn("PAGE_CACHE_TIMEOUT", str(error.exception))
+        self.assertEqual(
+            settings_loader.resolve("development", (("COMMENT_SCRYPT_WORK_FACTOR", "65536"),))[
+                "COMMENT_SCRYPT_WORK_FACTOR"
+            ],
+            2**16,
+        )
+        with self.assertRaises(ImproperlyConfigured) as error:
+            settings_loader.resolve("development", (("COMMENT_SCRYPT_WORK_FACTOR", "131072"),))
+        self.assertIn("COMMENT_SCRYPT_WORK_FACTOR", str(error.exception))
+        with self.assertRaises(ImproperlyConfigured):
+            settings_loader.resolve("mainframe", ())
+
+    def test_vercel_settings_is_a_deprecated_shim(self):
+        import importlib
+        import sys
+
+        from davegames_project import settings_loader
+
+        sys.modules.pop("vercel_settings", None)
+        self.addCleanup(sys.modules.pop, "vercel_settings", None)
+        with self.assertWarns(DeprecationWarning):
+            module = importlib.import_module("vercel_settings")
+        self.assertEqual(module.ALLOWED_HOSTS, settings_loader.load("vercel")["ALLOWED_HOSTS"])
+
+    def test_settings_diff_command_masks_secrets(self):
+        out = io.StringIO()
+        call_command(
+            "settings_diff", provider=["docker", "vercel"], set=["DEBUG=False", "DATABASE_URL="], json=True, stdout=out
+        )
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["docker"]["changed"]["ALLOWED_HOSTS"][1], ["*"])
+        self.assertEqual(report["docker"]["changed"]["DATABASES"][1]["default"]["HOST"], "db")
+        self.assertNotIn("django-insecure", out.getvalue())
+        self.assertEqual(report["vercel"]["changed"]["LANGUAGE_CODE"], ["en-us", "es-es"])
+
+
+@override_settings(COMMENT_PASSWORD_HASHER="scrypt", COMMENT_SCRYPT_WORK_FACTOR=2**10, COMMENT_HASH_WORKERS=1)
+class CommentCredentialTests(TestCase):
+    def setUp(self):
+        self.game = create_game("Monkey Island", datetime.date(1990, 10, 1))
+
+    def post_comment(self):
+        return self.client.post(
+            f"/game/{self.game.id}/",
+            {"nickname": "guybrush", "email": "g@example.com", "password": "threepwood", "text": "Genial"},
+        )
+
+    def test_post_stores_hash_and_rehashes_on_verify(self):
+        from .models import Comment
+
+        self.assertEqual(self.post_comment().status_code, 302)
+        comment = Comment.objects.get()
+        self.assertTrue(comment.password.startswith("scrypt$"))
+        self.assertNotIn("threepwood", comment.password)
+        self.assertFalse(comment.check_password("elaine"))
+        self.assertTrue(comment.check_password("threepwood"))
+
+        # parámetros nuevos: la próxima verificación correcta guarda un hash actualizado
+        with override_settings(COMMENT_SCRYPT_WORK_FACTOR=2**11):
+            self.assertTrue(comment.check_password("threepwood"))
+        self.assertIn("$2048$", Comment.objects.get().password)
+        with override_settings(COMMENT_PASSWORD_HASHER="pbkdf2_sha256", COMMENT_PBKDF2_ITERATIONS=1000):
+            self.assertTrue(Comment.objects.get().check_password("threepwood"))
+        self.assertTrue(Comment.objects.get().password.startswith("pbkdf2_sha256$1000$"))
+
+    def test_saturated_pool_returns_503(self):
+        from unittest import mock
+
+        from . import credentials
+        from .models import Comment
+
+        with mock.patch.object(credentials, "make", side_effect=credentials.HashingBusy):
+            response = self.post_comment()
+        self.assertEqual(response.status_code, 503)
+        self.assertContains(response, "Servidor ocupado", status_code=503)
+        self.assertFalse(Comment.objects.exists())
+
+    def test_migration_hashes_plaintext(self):
+        import importlib
+        from types import SimpleNamespace
+
+        from django.apps import apps
+        from django.db import connection
+
+        from .models import Comment
+
+        plain = Comment.objects.create(game=self.game, nickname="a", email="a@example.com", password="x", text="t")
+        Comment.objects.create(game=self.game, nickname="b", email="b@example.com", password="x", text="t")
+        migration = importlib.import_module("games.migrations.0007_hash_comment_passwords")
+        migration.hash_passwords(apps, SimpleNamespace(connection=connection))
+
+        hashes = set(Comment.objects.values_list("password", flat=True))
+        self.assertEqual(len(hashes), 2)  # una sal por comentario
+        plain.refresh_from_db()
+        self.assertTrue(plain.check_password("x"))
+
+
+@override_settings(COMMENT_SCRYPT_WORK_FACTOR=2**10, COMMENT_RATE_BURST=2, COMMENT_RATE_PER_MINUTE=1.0)
+class RateLimitTests(TestCase):
+    def test_token_bucket_refills(self):
+        from django.core.cache.backends.locmem import LocMemCache
+
+        from .ratelimit import take
+
+        cache = LocMemCache("test-ratelimit", {})
+        self.assertEqual(take("t", "1.2.3.4", 1.0, 2, cache=cache, now=100.0), 0)
+        self.assertEqual(take("t", "1.2.3.4", 1.0, 2, cache=cache, now=100.0), 0)
+        self.assertAlmostEqual(take("t", "1.2.3.4", 1.0, 2, cache=cache, now=100.25), 0.75)
+        self.assertEqual(take("t", "5.6.7.8", 1.0, 2, cache=cache, now=100.25), 0)
+        self.assertEqual(take("t", "1.2.3.4", 1.0, 2, cache=cache, now=101.0), 0)
+
+    def test_comment_flood_gets_429(self):
+        from .models import Comment
+
+        game = create_game("Loom", datetime.date(1990, 3, 1))
+
+        def post(email, ip="203.0.113.7"):
+            data = {"nickname": "bobbin", "email": email, "password": "x", "text": "Hola"}
+            return self.client.post(f"/game/{game.id}/", data, REMOTE_ADDR=ip)
+
+        self.assertEqual(post("a@example.com").status_code, 302)
+        self.assertEqual(post("b@example.com").status_code, 302)
+        response = post("c@example.com")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "60")
+        self.assertContains(response, "Demasiados comentarios", status_code=429)
+        # el email también tiene su propio cubo, aunque cambie la IP
+        self.assertEqual(post("a@example.com", ip="198.51.100.1").status_code, 302)
+        self.assertEqual(post("A@example.com ", ip="198.51.100.2").status_code, 429)
+        self.assertEqual(Comment.objects.count(), 3)
+
+    @override_settings(RATELIMIT_TRUSTED_PROXIES=1)
+    def test_client_ip_behind_proxy(self):
+        from .ratelimit import client_ip
+
+        request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="6.6.6.6, 203.0.113.7")
+        self.assertEqual(client_ip(request), "203.0.113.7")
+        self.assertEqual(client_ip(RequestFactory().post("/", REMOTE_ADDR="10.0.0.1")), "10.0.0.1")
+
+
+@override_settings(COMMENT_SCRYPT_WORK_FACTOR=2**10, COMMENT_SPAM_HOLD=0.5, COMMENT_SPAM_REJECT=0.99)
+class ModerationTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.game = create_game("The Dig", datetime.date(1995, 11, 30))
+
+    def post(self, email, text):
+        data = {"nickname": email.split("@")[0], "email": email, "password": "x", "text": text}
+        return self.client.post(f"/game/{self.game.id}/", data, follow=True)
+
+    def test_comments_wait_for_worker_and_spam_is_kept_out(self):
+        from .models import Comment
+
+        response = self.post("boston@example.com", "Gran juego, la historia y la banda sonora son increíbles")
+        self.assertContains(response, "pase la moderación")
+        self.assertNotContains(response, "la banda sonora son")
+        self.post("bot@example.com", "Gana dinero fácil casino bonos gratis haz clic aquí http://casino.example")
+        self.assertEqual(Comment.objects.filter(status=Comment.Status.PENDING).count(), 2)
+
+        out = io.StringIO()
+        call_command("moderate_comments", stdout=out)
+        self.assertIn("2 comentarios", out.getvalue())
+        ham = Comment.objects.get(email="boston@example.com")
+        spam = Comment.objects.get(email="bot@example.com")
+        self.assertEqual(ham.status, Comment.Status.PUBLISHED)
+        self.assertLess(ham.spam_score, 0.5)
+        self.assertNotEqual(spam.status, Comment.Status.PUBLISHED)
+        self.assertGreater(spam.spam_score, 0.5)
+
+        page = self.client.get(f"/game/{self.game.id}/")
+        self.assertContains(page, "la banda sonora son")
+        self.assertNotContains(page, "casino")
+
+    def test_only_admin_decisions_train_the_classifier(self):
+        from django.contrib.auth.models import User
+
+        from .models import Comment
+        from .moderation import train_from_db
+
+        comment = Comment.objects.create(
+            game=self.game,
+            nickname="bot",
+            email="bot@example.com",
+            password="x",
+            text="zorblax zorblax",
+            status=Comment.Status.PUBLISHED,
+        )
+        # decisión del worker: no entrena
+        self.assertNotIn("zorblax", train_from_db().weights)
+
+        admin = User.objects.create_superuser("admin", "a@example.com", "x")
+        self.client.force_login(admin)
+        response = self.client.post("/admin/games/comment/", {"action": "mark_spam", "_selected_action": [comment.pk]})
+        self.assertEqual(response.status_code, 302)
+        comment.refresh_from_db()
+        self.assertEqual((comment.status, comment.moderated_by), (Comment.Status.SPAM, admin))
+        self.assertGreater(train_from_db().weights["zorblax"], 0)
+
+    def test_published_query_uses_partial_index(self):
+        from django.db import connection
+
+        from .models import Comment
+
+        if connection.vendor not in ("sqlite", "postgresql"):
+            self.skipTest("índices parciales no soportados")
+        query = self.game.comments.filter(status=Comment.Status.PUBLISHED).order_by("-created_at")
+        self.assertIn("comment_published_idx", query.explain())
+
+
+@override_settings(STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage")
+class AdminPerformanceTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+
+        self.client.force_login(User.objects.create_superuser("admin", "a@example.com", "x"))
+        category = Category.objects.create(name="Estrategia")
+        for index, title in enumerate(("Dune II", "Warcraft", "Age of Empires")):
+            description = "arena y especia" if index == 0 else "desc"
+            create_game(title, datetime.date(1992 + index, 1, 1), category, description=description)
+
+    def test_game_changelist_modes(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        response = self.client.get("/admin/games/game/?q=especia")
+        self.assertContains(response, "Dune II")
+        self.assertIsNotNone(response.context["cl"].date_hierarchy)
+
+        with override_settings(ADMIN_PERFORMANCE_MODE=True):
+            response = self.client.get("/admin/games/game/?q=especia")
+            # solo se busca en el título (indexado) y no hay date_hierarchy
+            self.assertNotContains(response, "Dune II")
+            self.assertIsNone(response.context["cl"].date_hierarchy)
+            self.assertIsNone(response.context["cl"].full_result_count)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertContains(self.client.get("/admin/games/game/"), "Warcraft")
+        # categoría con select_related: solo el filtro lateral y el selector de acciones, ninguna por fila
+        self.assertEqual(len([query for query in queries if query["sql"].startswith('SELECT "games_category"')]), 2)
+
+    def test_estimated_paginator_counts_exactly_below_threshold(self):
+        from .pagination import EstimatedCountPaginator
+
+        paginator = EstimatedCountPaginator(Game.objects.order_by("id"), 2)
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 2)
+
+    def test_comment_admin_actions_publish(self):
+        from .models import Comment
+
+        game = Game.objects.get(title="Warcraft")
+        comment = Comment.objects.create(game=game, nickname="orc", email="o@example.com", password="x", text="Zug")
+        response = self.client.get("/admin/games/comment/")
+        self.assertContains(response, "orc")
+        self.client.post(
+            "/admin/games/comment/", {"action": "publish", "_selected_action": [comment.pk]}
+        )
+        comment.refresh_from_db()
+        self.assertEqual(comment.status, Comment.Status.PUBLISHED)
+        self.assertContains(self.client.get(f"/game/{game.id}/"), "Zug")
+
+
+@override_settings(
+    STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage", BULK_JOB_BATCH=2,
+)
+class BulkJobTests(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import User
+
+        self.client.force_login(User.objects.create_superuser("admin", "a@example.com", "x"))
+        self.old = Category.objects.create(name="Arcade")
+        self.new = Category.objects.create(name="Retro")
+        self.games = [
+            create_game(f"Pac-Man {index}", datetime.date(1980, 5, 22), self.old)
+            for index in range(5)
+        ]
+
+    def run_action(self, action, **extra):
+        data = {"action": action, "_selected_action": [game.pk for game in self.games], **extra}
+        return self.client.post("/admin/games/game/", data, follow=True)
+
+    def test_recategorize_runs_in_batches_with_one_bump_per_batch(self):
+        from unittest import mock
+
+        from . import cache
+        from .models import BulkJob
+
+        response = self.run_action("recategorize_in_background", category=self.new.pk)
+        self.assertContains(response, "5 juegos en cola")
+        job = BulkJob.objects.get()
+        self.assertEqual((job.status, job.total, job.processed), (BulkJob.Status.QUEUED, 5, 0))
+        # nada cambia hasta que corre el worker
+        self.assertEqual(Game.objects.filter(category=self.new).count(), 0)
+
+        with mock.patch.object(cache.cache, "incr", wraps=cache.cache.incr) as incr:
+            call_command("run_bulk_jobs", stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.progress), (BulkJob.Status.DONE, 5, 100))
+        self.assertEqual(Game.objects.filter(category=self.new).count(), 5)
+        self.assertEqual(incr.call_count, 3)  # 3 lotes de 2, no 5 filas
+        self.assertContains(self.client.get(f"/admin/games/bulkjob/{job.pk}/change/"), 'value="100"')
+
+    def test_delete_resumes_after_deadline(self):
+        from .bulkjobs import claim, run
+        from .models import BulkJob
+
+        self.run_action("delete_in_background")
+        job = claim()
+        self.assertFalse(run(job, deadline=0))
+        job.refresh_from_db()
+        self.assertEqual(job.status, BulkJob.Status.QUEUED)
+        call_command("run_bulk_jobs", stdout=io.StringIO())
+        self.assertFalse(Game.objects.exists())
+        self.assertEqual(BulkJob.objects.get().status, BulkJob.Status.DONE)
+
+    def test_reprocess_covers_moves_thumbnail_references(self):
+        from unittest import mock
+
+        from . import images
+        from .bulkjobs import enqueue, run_batch
+        from .models import BulkJob
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        with override_settings(MEDIA_ROOT=tmp.name):
+            game = self.games[0]
+            game.cover_image.save("pacman.jpg", ContentFile(jpeg((800, 600), (200, 30, 30))))
+            old_thumb = Game.objects.get(pk=game.pk).cover_thumbnail.name
+            self.assertEqual(MediaBlob.objects.get(name=old_thumb).ref_count, 1)
+
+            job = enqueue(BulkJob.Action.REPROCESS_COVERS, Game.objects.filter(pk=game.pk))
+            job.status = BulkJob.Status.RUNNING
+            with mock.patch.object(images, "THUMBNAIL_WIDTH", 120), self.captureOnCommitCallbacks(execute=True):
+                run_batch(job)
+            game.refresh_from_db()
+            self.assertNotEqual(game.cover_thumbnail.name, old_thumb)
+            self.assertEqual(MediaBlob.objects.get(name=game.cover_thumbnail.name).ref_count, 1)
+            self.assertFalse(MediaBlob.objects.filter(name=old_thumb).exists())
+            self.assertFalse(game.cover_thumbnail.storage.exists(old_thumb))
+
+    def test_recategorize_requires_category(self):
+        from .models import BulkJob
+
+        self.assertContains(self.run_action("recategorize_in_background"), "Elige la categoría")
+        self.assertFalse(BulkJob.objects.exists())
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1", "replica_2"], REPLICA_MAX_LAG=5.0)
+class ReplicaRoutingTests(TestCase):
+    def route(self, lags, enabled=True, atomic=False):
+        from unittest import mock
+
+        from . import routers
+
+        # TestCase envuelve cada test en una transacción: se simula la de la vista
+        default = mock.Mock(in_atomic_block=atomic)
+        token = routers._use_replicas.set(enabled)
+        try:
+            with mock.patch.object(routers, "replica_lag", side_effect=lambda alias: lags[alias]):
+                with mock.patch.object(routers, "connections", {"default": default}):
+                    return routers.ReplicaRouter().db_for_read(Game)
+        finally:
+            routers._use_replicas.reset(token)
+
+    def test_reads_go_to_fresh_replicas_and_fall_back_on_lag(self):
+        self.assertIsNone(self.route({"replica_1": 0.0, "replica_2": 0.0}, enabled=False))
+        self.assertEqual(self.route({"replica_1": None, "replica_2": 1.0}), "replica_2")
+        self.assertEqual(self.route({"replica_1": 30.0, "replica_2": None}), "default")
+        self.assertEqual(self.route({"replica_1": 0.0, "replica_2": 0.0}, atomic=True), "default")
+
+    def test_settings_add_replica_aliases(self):
+        from davegames_project import settings_loader
+
+        values = settings_loader.resolve("development", (("DATABASE_REPLICA_URLS", "sqlite:///r1.db,sqlite:///r2.db"),))
+        self.assertEqual(values["DATABASE_REPLICAS"], ("replica_1", "replica_2"))
+        self.assertEqual(values["DATABASES"]["replica_2"]["NAME"], "r2.db")
+        self.assertNotIn("DATABASE_REPLICA_URLS", values)
+
+    @override_settings(COMMENT_SCRYPT_WORK_FACTOR=2**10, COMMENT_RATE_BURST=0)
+    def test_comment_post_pins_client_to_primary(self):
+        from unittest import mock
+
+        from . import routers
+
+        game = create_game("Grim Fandango", datetime.date(1998, 10, 30))
+        data = {"nickname": "manny", "email": "manny@example.com", "password": "x", "text": "Hola"}
+        response = self.client.post(f"/game/{game.id}/", data)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(routers.PIN_COOKIE, response.cookies)
+        self.assertEqual(response.cookies[routers.PIN_COOKIE]["max-age"], "")
+
+        # con la cookie la vista no habilita las réplicas
+        with mock.patch.object(routers, "healthy_replicas") as healthy:
+            self.assertEqual(self.client.get(f"/game/{game.id}/").status_code, 200)
+        healthy.assert_not_called()
+
+
+@override_settings(COMMENT_PAGE_SIZE=3, COMMENT_RECENT_MONTHS=3)
+class CommentPartitionTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.game = create_game("Full Throttle", datetime.date(1995, 4, 30))
+
+    def comment(self, text, days_ago):
+        from django.utils import timezone
+
+        from .models import Comment
+
+        comment = Comment.objects.create(
+            game=self.game, nickname="ben", email="ben@example.com", password="x", text=text,
+            status=Comment.Status.PUBLISHED,
+        )
+        Comment.objects.filter(pk=comment.pk).update(created_at=timezone.now() - datetime.timedelta(days=days_ago))
+
+    def test_month_arithmetic(self):
+        from . import partitions
+
+        self.assertEqual(partitions.add_months(datetime.date(2026, 11, 1), 3), datetime.date(2027, 2, 1))
+        self.assertEqual(partitions.add_months(datetime.date(2026, 1, 1), -1), datetime.date(2025, 12, 1))
+        self.assertEqual(partitions.partition_name(datetime.date(2026, 3, 1)), "games_comment_p2026_03")
+        self.assertEqual(partitions.partition_month("games_comment_p2026_03"), datetime.date(2026, 3, 1))
+        self.assertIsNone(partitions.partition_month("games_comment_default"))
+
+    def test_detail_reads_recent_window_first(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for index in range(4):
+            self.comment(f"Reciente {index}", days_ago=index)
+        self.comment("Antiguo", days_ago=400)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/game/{self.game.id}/")
+        self.assertContains(response, "Reciente 0")
+        self.assertContains(response, "Reciente 2")
+        self.assertNotContains(response, "Reciente 3")
+        # la página se llena con los recientes: no se consulta nada anterior
+        comment_queries = [query["sql"] for query in queries if 'FROM "games_comment"' in query["sql"]]
+        self.assertEqual(len(comment_queries), 1)
+        self.assertIn('"created_at" >=', comment_queries[0])
+
+    def test_detail_falls_back_to_older_comments(self):
+        from .partitions import recent_comments
+
+        self.comment("Reciente", days_ago=1)
+        self.comment("Antiguo", days_ago=400)
+        self.assertEqual([comment.text for comment in recent_comments(self.game)], ["Reciente", "Antiguo"])
+
+    def test_command_on_unpartitioned_table(self):
+        from django.db import connection
+
+        if connection.vendor == "postgresql":
+            self.skipTest("en PostgreSQL la tabla está particionada")
+        out = io.StringIO()
+        call_command("comment_partitions", stdout=out)
+        self.assertIn("no está particionada", out.getvalue())
+
+    def test_postgres_partitions_are_created_and_archived(self):
+        import gzip
+
+        from django.db import connection
+
+        from . import partitions
+
+        if connection.vendor != "postgresql":
+            self.skipTest("particiones solo en PostgreSQL")
+        self.comment("Viejo", days_ago=800)
+        today = datetime.date.today()
+        old = partitions.month_start(datetime.date.today() - datetime.timedelta(days=800))
+        partitions.create_partition(old)
+        self.assertIn(old, partitions.archivable(after_months=12, today=today))
+        self.assertFalse(partitions.missing_partitions(ahead=2, today=today))
+        with tempfile.TemporaryDirectory() as directory:
+            path, rows = partitions.archive_partition(old, directory)
+            self.assertEqual(rows, 1)
+            with gzip.open(path, "rt") as archive:
+                self.assertIn("Viejo", archive.read())
+        self.assertNotIn(old, partitions.attached_partitions())
+        self.assertFalse(self.game.comments.exists())
+
+
+@override_settings(LEAN_PUBLIC_PAGES=True, PUBLIC_CACHE_MAX_AGE=60, COMMENT_SCRYPT_WORK_FACTOR=2**10, COMMENT_RATE_BURST=0)
+class LeanPublicPageTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.game = create_game("Day of the Tentacle", datetime.date(1993, 6, 25))
+
+    def test_public_pages_are_cookieless_and_cacheable(self):
+        from django.test import Client
+
+        client = Client(enforce_csrf_checks=True)
+        client.cookies["sessionid"] = "caducada"
+        for path in ("/", f"/category/{self.game.category_id}/", f"/game/{self.game.id}/"):
+            response = client.get(path)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.cookies, path)
+            self.assertFalse(response.has_header("Vary"), path)
+            self.assertEqual(response["Cache-Control"], "public, max-age=60")
+        self.assertContains(response, 'data-csrf-url="/csrf-token/"')
+
+        # el formulario pide el token y el POST pasa la comprobación CSRF
+        token = client.get("/csrf-token/")
+        self.assertIn("no-store", token["Cache-Control"])
+        self.assertIn("csrftoken", token.cookies)
+        data = {"nickname": "bernard", "email": "b@example.com", "password": "x", "text": "Hola"}
+        self.assertEqual(client.post(f"/game/{self.game.id}/", data).status_code, 403)
+        data["csrfmiddlewaretoken"] = token.json()["token"]
+        response = client.post(f"/game/{self.game.id}/", data, follow=True)
+        self.assertContains(response, "pase la moderación")
+
+    @override_settings(LEAN_PUBLIC_PAGES=False)
+    def test_full_profile_when_disabled(self):
+        response = self.client.get(f"/game/{self.game.id}/")
+        self.assertContains(response, 'name="csrfmiddlewaretoken" value="')
+        self.assertNotContains(response, 'data-csrf-url="')
+        self.assertIn("csrftoken", response.cookies)
+        self.assertFalse(response.has_header("Cache-Control"))
+
+
+@override_settings(EDGE_CDN="fake", EDGE_CACHE_MAX_AGE=3600, EDGE_PURGE_DELAY=60, COMMENT_SCRYPT_WORK_FACTOR=2**10)
+class EdgeCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        from . import edge
+
+        cache.clear()
+        self.cdn = edge.backend()
+        arcade = Category.objects.create(name="Arcade")
+        self.other = Category.objects.create(name="Plataformas")
+        self.game = create_game("Sam & Max", datetime.date(1993, 11, 1), arcade)
+        self.pages = {
+            "home": "/",
+            "arcade": f"/category/{arcade.id}/",
+            "other": f"/category/{self.other.id}/",
+            "detail": f"/game/{self.game.id}/",
+        }
+
+    def fetch_all(self):
+        return {name: self.cdn.fetch(self.client, path)[1] for name, path in self.pages.items()}
+
+    def commit_and_flush(self, change):
+        from . import edge
+
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        edge.flush()
+
+    def test_pages_are_tagged_and_purged_selectively(self):
+        from .models import Comment
+        from .moderation import SpamClassifier, moderate
+
+        response, _ = self.cdn.fetch(self.client, self.pages["detail"])
+        self.assertEqual(response["Cache-Tag"], f"nav,game-{self.game.id}")
+        self.assertEqual(response["CDN-Cache-Control"], "public, max-age=3600")
+        self.assertEqual(self.fetch_all(), {"home": False, "arcade": False, "other": False, "detail": True})
+        self.assertTrue(all(self.fetch_all().values()))
+
+        # un comentario publicado solo purga la ficha del juego
+        comment = Comment.objects.create(game=self.game, nickname="max", email="m@example.com", password="x", text="Hola")
+        self.assertEqual(self.cdn.purges, [])
+        classifier = SpamClassifier.train(["hola"], ["casino"])
+        self.commit_and_flush(lambda: moderate(classifier))
+        self.assertEqual(Comment.objects.get(pk=comment.pk).status, Comment.Status.PUBLISHED)
+        self.assertEqual(self.cdn.purges, [[f"game-{self.game.id}"]])
+        self.assertEqual(self.fetch_all(), {"home": True, "arcade": True, "other": True, "detail": False})
+
+        # mover el juego de categoría purga ambas categorías, la ficha y la portada
+        def recategorize():
+            self.game.category = self.other
+            self.game.save()
+
+        self.commit_and_flush(recategorize)
+        self.assertEqual(self.fetch_all(), {"home": False, "arcade": False, "other": False, "detail": False})
+
+        # una categoría nueva cambia el menú de todas las páginas
+        self.commit_and_flush(lambda: Category.objects.create(name="Puzzle"))
+        self.assertFalse(any(self.fetch_all().values()))
+
+    def test_dispatcher_deduplicates_and_batches(self):
+        from .edge import PurgeDispatcher
+
+        class Recorder:
+            max_keys = 2
+
+            def __init__(self):
+                self.calls = []
+
+            def purge(self, keys):
+                self.calls.append(keys)
+
+        recorder = Recorder()
+        dispatcher = PurgeDispatcher(recorder, delay=60)
+        dispatcher.add(["game-1", "home"])
+        dispatcher.add(["game-1", "category-2", "home"])
+        dispatcher.flush()
+        self.assertEqual(recorder.calls, [["category-2", "game-1"], ["home"]])
+        dispatcher.flush()
+        self.assertEqual(len(recorder.calls), 2)
+
+    @override_settings(EDGE_CDN="")
+    def test_no_tags_without_cdn(self):
+        response = self.client.get(self.pages["detail"])
+        self.assertFalse(response.has_header("Cache-Tag"))
+        self.assertFalse(response.has_header("CDN-Cache-Control"))
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=300, PAGE_CACHE_STALE=300, PAGE_CACHE_BETA=0, PAGE_CACHE_LOCK_TIMEOUT=5)
+class StaleWhileRevalidateTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def concurrent_gets(self, view, clients=8):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        barrier = threading.Barrier(clients)
+
+        def get(_):
+            barrier.wait()
+            return view(RequestFactory().get("/swr/")).content.decode()
+
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            return list(pool.map(get, range(clients)))
+
+    def test_one_render_per_expiry_under_concurrency(self):
+        import threading
+        import time
+
+        from django.http import HttpResponse
+
+        from .cache import bump_catalog, cached_page
+
+        renders = []
+        lock = threading.Lock()
+
+        @cached_page
+        def slow(request):
+            with lock:
+                renders.append(1)
+                version = len(renders)
+            time.sleep(0.2)
+            return HttpResponse(f"v{version}")
+
+        # sin copia: las peticiones esperan a la única que renderiza
+        self.assertEqual(self.concurrent_gets(slow), ["v1"] * 8)
+        self.assertEqual(len(renders), 1)
+
+        # catálogo cambiado: una regenera y el resto recibe la copia anterior al momento
+        bump_catalog()
+        results = self.concurrent_gets(slow)
+        self.assertEqual(len(renders), 2)
+        self.assertEqual(results.count("v2"), 1)
+        self.assertEqual(results.count("v1"), 7)
+        self.assertEqual(self.concurrent_gets(slow), ["v2"] * 8)
+        self.assertEqual(len(renders), 2)
+
+    @override_settings(PAGE_CACHE_LOCK_TIMEOUT=5)
+    def test_waiters_stop_when_render_leaves_no_entry(self):
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        from django.http import HttpResponseNotFound
+
+        from .cache import cached_page
+
+        renders = []
+        lock = threading.Lock()
+
+        @cached_page
+        def missing(request):
+            with lock:
+                renders.append(1)
+                first = len(renders) == 1
+            if first:
+                time.sleep(0.2)
+                raise Http404("no existe")
+            return HttpResponseNotFound("no existe")
+
+        def get(view):
+            try:
+                return view(RequestFactory().get("/swr/")).status_code
+            except Http404:
+                return 404
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: get(missing), range(8)))
+        # las que esperaban renderizan en cuanto se suelta el cerrojo, sin agotar el timeout
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(results, [404] * 8)
+        self.assertEqual(len(renders), 8)
+
+    def test_probabilistic_early_expiration(self):
+        from unittest import mock
+
+        from .cache import should_refresh
+
+        entry = {"expires": 1000.0, "delta": 10.0}
+        with mock.patch("games.cache.random.random", return_value=0.5):
+            # -10 * ln(0.5) ≈ 6.9 s de anticipación
+            self.assertTrue(should_refresh(entry, now=995.0, beta=1.0))
+            self.assertFalse(should_refresh(entry, now=990.0, beta=1.0))
+            self.assertFalse(should_refresh(entry, now=999.0, beta=0))
+            self.assertTrue(should_refresh(entry, now=1000.0, beta=0))
@@ -1,10 +1,13 @@
 # rutas de juegos y categorias
 from django.urls import path
 from . import views
+from .instrumentation import perf_snapshot
 
 
 urlpatterns = [
     path('', views.home, name='home'),
     path('category/<int:category_id>/', views.category_games, name='category_games'),
     path('game/<int:game_id>/', views.game_detail, name='game_detail'),
+    path('csrf-token/', views.csrf_token, name='csrf_token'),
+    path('_perf/', perf_snapshot, name='perf_snapshot'),
 ]
@@ -0,0 +1,225 @@
+"""
+Vendorizar las dependencias frontend de base.html
+Bootstrap, Font Awesome y Google Fonts pasan de tres orígenes externos a un
+único bundle CSS local, con las fuentes recortadas a los glifos que usan las
+plantillas. Lo usa el comando vendor_assets.
+"""
+
+import io
+import posixpath
+import re
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+
+BOOTSTRAP_VERSION = "5.3.0"
+FONTAWESOME_VERSION = "6.4.0"
+
+BOOTSTRAP_CSS = f"https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist/css/bootstrap.min.css"
+BOOTSTRAP_JS = f"https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist/js/bootstrap.bundle.min.js"
+FONTAWESOME_BASE = f"https://cdnjs.cloudflare.com/ajax/libs/font-awesome/{FONTAWESOME_VERSION}"
+FONTAWESOME_CSS = f"{FONTAWESOME_BASE}/css/all.min.css"
+GOOGLE_FONTS_CSS = (
+    "https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700;900"
+    "&family=Rajdhani:wght@300;400;500;600;700&display=swap"
+)
+CDN_STYLESHEETS = (BOOTSTRAP_CSS, FONTAWESOME_CSS, GOOGLE_FONTS_CSS)
+CDN_ORIGINS = (
+    "https://cdn.jsdelivr.net",
+    "https://cdnjs.cloudflare.com",
+    "https://fonts.googleapis.com",
+    "https://fonts.gstatic.com",
+)
+
+# Rutas dentro del árbol de estáticos (games/static/)
+VENDOR_PREFIX = "games/vendor"
+BUNDLE_CSS = f"{VENDOR_PREFIX}/css/vendor.css"
+BUNDLE_JS = f"{VENDOR_PREFIX}/js/bootstrap.bundle.min.js"
+FONTS_DIR = f"{VENDOR_PREFIX}/fonts"
+
+# Google Fonts solo sirve woff2 a navegadores modernos
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+# Bloques de Google Fonts que se conservan (U+0000-00FF cubre el español)
+GOOGLE_FONT_SUBSETS = {"latin"}
+
+# Texto dinámico (títulos, comentarios): siempre Latin-1 imprimible
+DYNAMIC_TEXT_CODEPOINTS = set(range(0x20, 0x7F)) | set(range(0xA0, 0x100))
+
+# Estilos de Font Awesome según la clase usada en las plantillas
+FONTAWESOME_STYLES = {
+    "fa-solid-900": {"fa", "fas", "fa-solid"},
+    "fa-regular-400": {"far", "fa-regular"},
+    "fa-brands-400": {"fab", "fa-brands"},
+}
+
+SOURCE_MAP_RE = re.compile(r"^\s*(?:/\*# sourceMappingURL=.*?\*/|//# sourceMappingURL=.*)$", re.MULTILINE)
+CLASS_ATTR_RE = re.compile(r"\bclass(?:Name)?\s*=\s*[\"'`]([^\"'`]*)[\"'`]")
+ICON_RULE_RE = re.compile(r"((?:\.fa-[a-z0-9-]+:(?:before|after),?)+)\{content:\"([^\"]*)\"\}")
+FONT_FACE_RE = re.compile(r"@font-face\{[^}]*\}")
+FONTAWESOME_URL_RE = re.compile(r"url\(\.\./webfonts/([a-z0-9-]+)\.woff2\)")
+GOOGLE_BLOCK_RE = re.compile(r"/\*\s*([\w-]+)\s*\*/\s*(@font-face\s*\{[^}]*\})")
+GOOGLE_URL_RE = re.compile(r"url\((https://fonts\.gstatic\.com/[^)]+\.woff2)\)")
+FAMILY_RE = re.compile(r"font-family:\s*'([^']+)'")
+WEIGHT_RE = re.compile(r"font-weight:\s*(\d+)")
+TAG_RE = re.compile(r"\{[%{#].*?[%}#]\}|<[^>]+>", re.DOTALL)
+
+
+def fetch(url):
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def template_sources():
+    """Código fuente de las plantillas de la app games"""
+    root = Path(settings.BASE_DIR) / "games" / "templates"
+    return {path: path.read_text(encoding="utf-8") for path in sorted(root.rglob("*.html"))}
+
+
+def strip_source_maps(text):
+    """Quitar sourceMappingURL: ManifestStaticFilesStorage exigiría los .map"""
+    return SOURCE_MAP_RE.sub("", text)
+
+
+def used_classes(sources):
+    """Clases CSS que aparecen en las plantillas (HTML y JS inline)"""
+    classes = set()
+    for source in sources:
+        for value in CLASS_ATTR_RE.findall(source):
+            classes.update(value.split())
+    return classes
+
+
+def template_codepoints(sources):
+    """Caracteres del texto estático de las plantillas"""
+    codepoints = set()
+    for source in sources:
+        codepoints.update(ord(char) for char in TAG_RE.sub(" ", source) if not char.isspace())
+    return codepoints
+
+
+def _content_codepoint(value):
+    if value.startswith("\\"):
+        return int(value[1:], 16)
+    return ord(value[0])
+
+
+def subset_fontawesome_css(css, classes):
+    """
+    Conservar solo los iconos usados y las @font-face de los estilos usados.
+
+    Returns:
+        tuple: (css, {archivo de fuente: codepoints})
+    """
+    codepoints = set()
+
+    def keep_icon(match):
+        selectors = match.group(1).rstrip(",").split(",")
+        names = {selector.split(":")[0][1:] for selector in selectors}
+        if names & classes:
+            codepoints.add(_content_codepoint(match.group(2)))
+            return match.group(0)
+        return ""
+
+    css = ICON_RULE_RE.sub(keep_icon, css)
+
+    fonts = {}
+
+    def keep_font_face(match):
+        block = match.group(0)
+        url = FONTAWESOME_URL_RE.search(block)
+        if not url:
+            return block
+        name = url.group(1)
+        if not FONTAWESOME_STYLES.get(name, set()) & classes:
+            return ""
+        fonts[name] = codepoints
+        # solo woff2: todos los navegadores soportados lo aceptan
+        src = f'src:url(../fonts/{name}.woff2) format("woff2")'
+        return re.sub(r"src:[^;}]*", src, block)
+
+    css = FONT_FACE_RE.sub(keep_font_face, css)
+    return css, fonts
+
+
+def localize_google_fonts_css(css):
+    """
+    Conservar los bloques latin y apuntar sus url() a archivos locales.
+
+    Returns:
+        tuple: (css, {archivo local: url remota})
+    """
+    blocks, fonts = [], {}
+    for subset, block in GOOGLE_BLOCK_RE.findall(css):
+        if subset not in GOOGLE_FONT_SUBSETS:
+            continue
+        url = GOOGLE_URL_RE.search(block).group(1)
+        existing = next((name for name, remote in fonts.items() if remote == url), None)
+        if existing is None:
+            family = FAMILY_RE.search(block).group(1).lower().replace(" ", "-")
+            weight = WEIGHT_RE.search(block).group(1)
+            existing = f"{family}-{weight}"
+            fonts[existing] = url
+        blocks.append(f"/* {subset} */\n" + block.replace(url, f"../fonts/{existing}.woff2"))
+    return "\n".join(blocks), fonts
+
+
+def subset_font(data, codepoints):
+    """
+    Recortar una fuente woff2 a los codepoints indicados.
+    Requiere fonttools y brotli; sin ellos devuelve la fuente original.
+    """
+    if not codepoints:
+        # ningún glifo reconocido: mejor la fuente completa que una vacía
+        return data, False
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        return data, False
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]
+    try:
+        font = TTFont(io.BytesIO(data))
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        output = io.BytesIO()
+        subset.save_font(font, output, options)
+    except ImportError:
+        # falta brotli para leer/escribir woff2
+        return data, False
+    return output.getvalue(), True
+
+
+def rewrite_base_template(source):
+    """Sustituir los recursos de CDN de base.html por URLs locales con {% static %}"""
+    lines = source.splitlines(keepends=True)
+    output, inserted = [], False
+    for line in lines:
+        if any(url in line for url in CDN_STYLESHEETS):
+            # quitar también el comentario de la línea anterior
+            if output and output[-1].strip().startswith("<!--") and "http" not in output[-1]:
+                output.pop()
+            if not inserted:
+                indent = line[: len(line) - len(line.lstrip())]
+                output.append(f"{indent}<!-- Dependencias vendorizadas (python manage.py vendor_assets) -->\n")
+                output.append(f"{indent}<link href=\"{{% static '{BUNDLE_CSS}' %}}\" rel=\"stylesheet\">\n")
+                inserted = True
+            continue
+        output.append(line.replace(BOOTSTRAP_JS, f"{{% static '{BUNDLE_JS}' %}}"))
+    result = "".join(output)
+    if result != source and "{% load static %}" not in result:
+        result = "{% load static %}\n" + result
+    return result
+
+
+def static_path(name):
+    """Ruta absoluta dentro de games/static/"""
+    return Path(settings.BASE_DIR) / "games" / "static" / posixpath.join(*name.split("/"))
@@ -1,48 +1,110 @@
-from django.shortcuts import render, get_object_or_404, redirect
+import math
+from functools import partial
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.middleware.csrf import get_token
+from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.views.decorators.cache import never_cache
+from .cache import cached_page, detail_version, fragment_version, nav_categories
 from .models import Game, Category
 
 # Create your views here.
 # CREAR VISTAS Y RUTAS
 
+@cached_page
 def home(request):
-    categories = Category.objects.all()
+    categories = nav_categories()
     games = Game.objects.all().order_by('-release_date')[:6]  # últimos 6 juegos
-    return render(request, 'games/home.html', {
+    return TemplateResponse(request, 'games/home.html', {
         'categories': categories, 
         'games': games
     })
 
 # definir categorias juegos
+@cached_page
 def category_games(request, category_id):
     category = get_object_or_404(Category, id=category_id)
     games = Game.objects.filter(category=category).order_by('-release_date')
-    categories = Category.objects.all()
-    return render(request, 'games/category_games.html', {
+    categories = nav_categories()
+    return TemplateResponse(request, 'games/category_games.html', {
         'category': category, 
         'games': games,
         'categories': categories
     })
 
 # definir juego detalle
+from .credentials import HashingBusy
 from .forms import CommentForm
-from .models import Comment
+from .hints import add_preload
+from .images import cover_sources
+from .lean import is_public
+from .metrics import comment_submissions
+from .partitions import recent_comments
+from .ratelimit import limit_comment
+from .templatetags.cover_tags import DETAIL_SIZES
 
+@cached_page(version=detail_version, public_only=True)
 def game_detail(request, game_id):
     game = get_object_or_404(Game, id=game_id)
-    categories = Category.objects.all()
-    comments = game.comments.order_by('-created_at')
+    if game.cover_image:
+        # el mismo srcset/sizes que el <img>: el navegador precarga la anchura que va a usar
+        src, srcset = cover_sources(game)
+        if srcset:
+            add_preload(request, src, 'image', imagesrcset=srcset, imagesizes=DETAIL_SIZES, fetchpriority='high')
+        else:
+            add_preload(request, src, 'image', fetchpriority='high')
+    categories = nav_categories()
+    # solo publicados y recientes (índice parcial comment_published_idx, particiones
+    # de los últimos meses); la plantilla lo llama solo si el fragmento no está en cache
+    comments = partial(recent_comments, game)
+    status = 200
+    retry_after = 0
     if request.method == 'POST':
         form = CommentForm(request.POST)
-        if form.is_valid():
-            comment = form.save(commit=False)
-            comment.game = game
-            comment.save()
-            return redirect('game_detail', game_id=game.id)
+        # antes de validar y hashear: un bot no gasta CPU ni llena la tabla
+        retry_after = limit_comment(request)
+        if retry_after:
+            form.add_error(None, 'Demasiados comentarios seguidos, espera un poco antes de volver a publicar.')
+            comment_submissions.inc(result='limited')
+            status = 429
+        elif form.is_valid():
+            try:
+                comment = form.save(commit=False)
+            except HashingBusy:
+                # pool de hashing saturado: mejor un 503 rápido que encolar CPU
+                form.add_error(None, 'Servidor ocupado, vuelve a intentarlo en unos segundos.')
+                comment_submissions.inc(result='busy')
+                status = 503
+            else:
+                comment.game = game
+                comment.save()
+                comment_submissions.inc(result='accepted')
+                # aviso por query string y no con messages: la página sigue sin sesión
+                return redirect(f"{reverse('game_detail', args=[game.id])}?comentario=pendiente")
+        else:
+            comment_submissions.inc(result='invalid')
     else:
         form = CommentForm()
-    return render(request, 'games/game_detail.html', {
+    response = TemplateResponse(request, 'games/game_detail.html', {
         'game': game,
         'categories': categories,
         'comments': comments,
         'form': form,
-    })
\ No newline at end of file
+        'comment_pending': request.GET.get('comentario') == 'pendiente',
+        # página pública sin cookies: el token CSRF se pide al enviar el formulario
+        'csrf_fetch': is_public(request),
+        # fragmentos cacheados de la plantilla ({% cache %})
+        'cache_version': fragment_version(game),
+        'cache_timeout': settings.PAGE_CACHE_TIMEOUT,
+    }, status=status)
+    if retry_after:
+        response['Retry-After'] = str(math.ceil(retry_after))
+    return response
+
+# token CSRF para los formularios de páginas públicas (games.lean)
+@never_cache
+def csrf_token(request):
+    return JsonResponse({'token': get_token(request)})
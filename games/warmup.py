@@ -0,0 +1,132 @@
+"""
+Calentamiento de caches al arrancar un worker
+Abre las conexiones a la base de datos, carga la navegación y pre-renderiza
+las páginas más populares en la cache de páginas/fragmentos, sin pasar de
+WARMUP_BUDGET segundos. Se ejecuta desde wsgi.py/asgi.py (WARMUP_ON_BOOT)
+o con python manage.py warm_cache.
+
+Al arrancar corre en un hilo daemon y el worker lo espera como mucho
+WARMUP_BUDGET segundos: una base de datos que no responde o una página lenta
+no retrasan el arranque. El hilo cierra sus conexiones al terminar, así los
+workers creados con fork (gunicorn --preload) no heredan sus sockets.
+
+La lista de popularidad sale de WARMUP_SNAPSHOT (JSON con rutas) si existe;
+si no, portada, categorías y los juegos con más comentarios.
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.db.models import Count, Q
+from django.urls import Resolver404, resolve, reverse
+
+from .cache import nav_categories
+
+logger = logging.getLogger("games.perf")
+
+
+def popular_paths(top):
+    """Rutas a pre-renderizar, de más a menos popular"""
+    snapshot = Path(settings.WARMUP_SNAPSHOT)
+    if snapshot.exists():
+        try:
+            return json.loads(snapshot.read_text(encoding="utf-8"))[:top]
+        except (OSError, ValueError):
+            logger.warning("Snapshot de warm-up ilegible: %s", snapshot, exc_info=True)
+
+    from .models import Category, Comment, Game
+
+    paths = [reverse("home")]
+    games = Game.objects.annotate(
+        popularity=Count("comments", filter=Q(comments__status=Comment.Status.PUBLISHED))
+    ).order_by("-popularity", "-release_date")
+    paths += [reverse("game_detail", args=[pk]) for pk in games.values_list("pk", flat=True)[:top]]
+    paths += [reverse("category_games", args=[pk]) for pk in Category.objects.values_list("pk", flat=True)]
+    return paths[:top]
+
+
+def save_snapshot(paths):
+    snapshot = Path(settings.WARMUP_SNAPSHOT)
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    snapshot.write_text(json.dumps(paths, indent=2) + "\n", encoding="utf-8")
+
+
+def render_path(path, factory):
+    """Ejecutar la vista sin middleware para llenar la cache de páginas/fragmentos"""
+    match = resolve(path)
+    request = factory.get(path)
+    request.user = AnonymousUser()
+    request.resolver_match = match
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, "render"):
+        response.render()
+    return response.status_code
+
+
+def warm_up(budget=None, top=None):
+    """
+    Returns:
+        dict: pasos completados, páginas renderizadas y segundos usados
+    """
+    budget = settings.WARMUP_BUDGET if budget is None else budget
+    top = settings.WARMUP_TOP if top is None else top
+    start = time.monotonic()
+    deadline = start + budget
+    stats = {"connections": 0, "nav": False, "pages": 0, "skipped": 0}
+
+    for alias in connections:
+        connections[alias].ensure_connection()
+        stats["connections"] += 1
+
+    if time.monotonic() < deadline:
+        nav_categories()
+        stats["nav"] = True
+
+    # django.test solo se importa al calentar, no en cada arranque
+    from django.test.client import RequestFactory
+
+    paths = popular_paths(top) if time.monotonic() < deadline else []
+    factory = RequestFactory()
+    for index, path in enumerate(paths):
+        if time.monotonic() >= deadline:
+            stats["skipped"] = len(paths) - index
+            break
+        try:
+            render_path(path, factory)
+        except Resolver404:
+            logger.warning("Ruta de warm-up inexistente: %s", path)
+            continue
+        stats["pages"] += 1
+
+    stats["seconds"] = time.monotonic() - start
+    return stats
+
+
+def _warm_up_thread(result):
+    try:
+        result.update(warm_up())
+    except Exception:
+        logger.exception("Warm-up fallido")
+    finally:
+        # las conexiones son por hilo: solo se cierran las abiertas aquí
+        connections.close_all()
+
+
+def warm_up_on_boot():
+    """Llamado desde wsgi.py/asgi.py; nunca retrasa el arranque más de WARMUP_BUDGET"""
+    if not settings.WARMUP_ON_BOOT:
+        return
+    result = {}
+    thread = threading.Thread(target=_warm_up_thread, args=(result,), name="warmup", daemon=True)
+    thread.start()
+    thread.join(settings.WARMUP_BUDGET)
+    if thread.is_alive():
+        logger.warning(json.dumps({"event": "warmup", "timeout": settings.WARMUP_BUDGET}))
+    elif result:
+        logger.info(json.dumps({"event": "warmup", **result}))
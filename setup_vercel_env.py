@@ -38,7 +38,8 @@ def main():
         'SECRET_KEY': generate_secret_key(),
         'DEBUG': 'False',
         'ALLOWED_HOSTS': 'dave-games-jz9mac46j-davidprogramer404s-projects.vercel.app,.vercel.app',
-        'DJANGO_SETTINGS_MODULE': 'davegames_project.settings'
+        'DJANGO_SETTINGS_MODULE': 'davegames_project.settings',
+        'DEPLOY_PROVIDER': 'vercel',
     }
     
     print("📋 Variables a configurar:")